@@ -4,12 +4,14 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import datetime
 import multiprocessing
-import threading
 import os
 import sys
+import time
+from collections import deque
 
 try:
-    from Windows import WindowsAgent, AgentConfig
+    from Windows import AgentConfig
+    from Windows.worker import AgentWorker
     from phone_agent.model import ModelConfig
 except ImportError as e:
     messagebox.showerror("导入失败", f"无法导入模块：{str(e)}")
@@ -28,20 +30,20 @@ COLOR_WARNING = "#ffc107"
 COLOR_ERROR = "#dc3545"
 
 
-def execute_task_in_process(cmd, result_queue):
-    """在独立进程中执行WindowsAgent.run()"""
-    try:
-        model_config = ModelConfig(
-            base_url="https://api-inference.modelscope.cn/v1",
-            model_name="Qwen/Qwen3.5-397B-A17B",
-            api_key="",
-        )
-        agent_config = AgentConfig(max_steps=100, verbose=True)
-        agent = WindowsAgent(model_config=model_config, agent_config=agent_config)
-        result = agent.run(cmd)
-        result_queue.put(("success", result))
-    except Exception as e:
-        result_queue.put(("error", str(e)))
+# 协作式终止后等待多久仍未停止则强制重启工作进程（秒）
+STOP_GRACE_SECONDS = 5.0
+POLL_INTERVAL_MS = 50
+
+
+def create_worker():
+    """创建常驻的 Agent 工作进程（提前完成导入与模型客户端初始化）"""
+    model_config = ModelConfig(
+        base_url="https://api-inference.modelscope.cn/v1",
+        model_name="Qwen/Qwen3.5-397B-A17B",
+        api_key="",
+    )
+    agent_config = AgentConfig(max_steps=100, verbose=True)
+    return AgentWorker(model_config=model_config, agent_config=agent_config)
 
 
 class WindowsControlGUI:
@@ -51,9 +53,11 @@ class WindowsControlGUI:
         self.root.geometry("1200x650")
         self.root.resizable(True, True)
 
-        self.task_process = None
+        self.worker = create_worker()
+        self.task_queue = deque()
         self.task_running = False
-        self.result_queue = None
+        self.current_cmd = None
+        self.stop_deadline = None
 
         self.style = ttk.Style(COLOR_THEME)
         self.style.configure("Main.TFrame", background="#f8f9fa")
@@ -63,8 +67,10 @@ class WindowsControlGUI:
         self.create_widgets()
 
         self.log("📌 界面初始化完成！", "info")
-        self.log("✅ Windows Agent 已就绪", "success")
-        self.log("✅ 等待执行指令...", "success")
+        self.log("⏳ 正在预热 Windows Agent 工作进程...", "info")
+        self.worker.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(POLL_INTERVAL_MS, self._poll_worker)
 
     def create_widgets(self):
         title_frame = ttk.Frame(self.root, style="Main.TFrame", padding=(20, 15, 20, 10))
@@ -190,98 +196,108 @@ class WindowsControlGUI:
             self.log("❌ 错误：执行指令不能为空！", "warning")
             return
 
+        self.cmd_entry.delete(0, tk.END)
+        self.task_queue.append(cmd)
         if self.task_running:
-            self.log("⚠️ 警告：已有任务正在执行，请先终止", "warning")
+            self.log(f"📥 已加入队列（前方 {len(self.task_queue)} 个）：{cmd}", "info")
+        self._dispatch_next()
+        self._update_status()
+
+    def _dispatch_next(self):
+        if self.task_running or not self.task_queue:
             return
 
+        cmd = self.task_queue.popleft()
         self.task_running = True
-        self.run_btn.config(state=DISABLED)
+        self.current_cmd = cmd
         self.stop_btn.config(state=NORMAL)
-        self.status_var.set(f" 🚀 执行中 - 指令：{cmd[:20]}... ")
         self.log(f"🚀 开始执行指令：{cmd}", "info")
+        self.worker.submit(cmd)
 
-        self.result_queue = multiprocessing.Queue()
-
-        self.task_process = multiprocessing.Process(
-            target=execute_task_in_process,
-            args=(cmd, self.result_queue),
-            daemon=True
-        )
-        self.task_process.start()
-
-        monitor_thread = threading.Thread(
-            target=self._monitor_process,
-            daemon=True
-        )
-        monitor_thread.start()
-
-    def _monitor_process(self):
-        self.task_process.join()
-
+    def _poll_worker(self):
         try:
-            if not self.result_queue.empty():
-                status, result = self.result_queue.get()
-                if status == "success":
-                    self.root.after(0, lambda: self.log(f"✅ 执行成功！结果：{result}", "success"))
-                    self.root.after(0, lambda: self.status_var.set(" ✅ 执行完成 - 等待新指令 "))
-                else:
-                    self.root.after(0, lambda: self.log(f"❌ 执行失败：{result}", "error"))
-                    self.root.after(0, lambda: self.status_var.set(" ❌ 执行失败 - 请检查指令 "))
-        except Exception as e:
-            self.root.after(0, lambda: self.log(f"⚠️ 获取结果出错：{str(e)}", "warning"))
+            while True:
+                message = self.worker.poll()
+                if message is None:
+                    break
+                self._handle_message(message)
+
+            if self.stop_deadline is not None and time.monotonic() > self.stop_deadline:
+                self._restart_worker()
         finally:
-            self.root.after(0, self._cleanup_process)
+            self.root.after(POLL_INTERVAL_MS, self._poll_worker)
+
+    def _handle_message(self, message):
+        if message.kind == "ready":
+            self.log(f"✅ Windows Agent 已就绪（预热 {message.elapsed:.1f}s）", "success")
+            self.log("✅ 等待执行指令...", "success")
+        elif message.kind == "started":
+            self.log(f"⚡ 任务启动耗时 {message.elapsed * 1000:.0f} ms", "info")
+        elif message.kind == "success":
+            self.log(f"✅ 执行成功！结果：{message.payload}", "success")
+            self._task_done()
+        elif message.kind == "cancelled":
+            self.log("🛑 任务已终止", "info")
+            self._task_done()
+        else:
+            self.log(f"❌ 执行失败：{message.payload}", "error")
+            self._task_done()
+            if not self.worker.alive:
+                self.worker.restart()
+                self.log("🔄 工作进程已退出，正在重新预热...", "warning")
+
+    def _task_done(self):
+        self.task_running = False
+        self.current_cmd = None
+        self.stop_deadline = None
+        self.stop_btn.config(state=DISABLED)
+        self._dispatch_next()
+        self._update_status()
+
+    def _update_status(self):
+        queued = f"，队列中 {len(self.task_queue)} 个" if self.task_queue else ""
+        if self.task_running:
+            self.status_var.set(f" 🚀 执行中 - 指令：{self.current_cmd[:20]}...{queued} ")
+        else:
+            self.status_var.set(" ✅ 执行完成 - 等待新指令 ")
 
     def force_stop_task(self):
-        if not self.task_running or not self.task_process:
+        if not self.task_running:
             self.log("⚠️ 没有正在执行的任务", "warning")
             return
 
-        self.log("⏹️ 正在强制终止任务...", "warning")
-        self.status_var.set(" ⏹️ 正在强制终止任务... ")
+        self.log("⏹️ 正在终止任务（当前步骤结束后停止）...", "warning")
+        self.status_var.set(" ⏹️ 正在终止任务... ")
         self.stop_btn.config(state=DISABLED)
+        self.worker.cancel()
+        self.stop_deadline = time.monotonic() + STOP_GRACE_SECONDS
 
+    def _restart_worker(self):
         try:
-            self.task_process.terminate()
-            self.task_process.join(timeout=2)
-
-            if self.task_process.is_alive():
-                self.task_process.kill()
-                self.task_process.join()
-                self.log("💥 任务已被强制杀死", "info")
-            else:
-                self.log("🛑 任务已终止", "info")
-
-            self.status_var.set(" 🛑 任务已终止 - 等待新指令 ")
-
+            self.worker.restart()
+            self.log("💥 任务未能及时停止，已强制结束并重新预热工作进程", "info")
         except Exception as e:
             self.log(f"❌ 终止任务时出错：{str(e)}", "error")
         finally:
-            self.root.after(0, self._cleanup_process)
+            self._task_done()
 
-    def _cleanup_process(self):
-        if self.task_process:
-            if self.task_process.is_alive():
-                try:
-                    self.task_process.terminate()
-                    self.task_process.join(timeout=1)
-                except:
-                    pass
-
-            self.task_process.close()
-            self.task_process = None
-
-        self.task_running = False
-        self.run_btn.config(state=NORMAL)
-        self.stop_btn.config(state=DISABLED)
+    def on_close(self):
+        try:
+            self.worker.close()
+        finally:
+            self.root.destroy()
 
     def clear_all(self):
         self.cmd_entry.delete(0, tk.END)
+        dropped = len(self.task_queue)
+        self.task_queue.clear()
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
         self.status_var.set(" 📌 已清空 - 等待新指令 ")
         self.log("📌 已清空输入框和执行日志", "info")
+        if dropped:
+            self.log(f"🗑️ 已移除队列中的 {dropped} 个指令", "info")
 
 
 if __name__ == "__main__":
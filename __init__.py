@@ -1,5 +1,20 @@
 """Windows desktop automation package."""
 
-from Windows.agent import AgentConfig, StepResult, WindowsAgent
+from typing import TYPE_CHECKING
 
-__all__ = ["WindowsAgent", "AgentConfig", "StepResult"]
+from Windows._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from Windows.agent import AgentConfig, StepResult, WindowsAgent
+    from Windows.async_agent import AsyncWindowsAgent
+
+_EXPORTS = {
+    "WindowsAgent": "Windows.agent",
+    "AgentConfig": "Windows.agent",
+    "StepResult": "Windows.agent",
+    "AsyncWindowsAgent": "Windows.async_agent",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ["WindowsAgent", "AsyncWindowsAgent", "AgentConfig", "StepResult"]
@@ -0,0 +1,40 @@
+"""Deferred package exports.
+
+Package ``__init__`` modules map their public names to the submodules that
+define them; a submodule is imported the first time one of its names is
+accessed, so ``import Windows`` and ``python -m Windows.<tool>`` do not pay
+for model clients, imaging or input libraries they never touch.
+"""
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build the module ``__getattr__`` and ``__dir__`` for a package.
+
+    Args:
+        package: ``__name__`` of the package.
+        exports: Public name to the module defining it.
+
+    Returns:
+        The ``(__getattr__, __dir__)`` pair to assign in the package.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        # Later lookups hit the module dict and skip __getattr__.
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,5 +1,30 @@
 """Action handling module for Windows Agent."""
 
-from Windows.actions.handler import ActionHandler, ActionResult
+from typing import TYPE_CHECKING
 
-__all__ = ["ActionHandler", "ActionResult"]
+from Windows._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from Windows.actions.handler import ActionHandler, ActionResult
+    from Windows.actions.parser import ActionParseError, ActionParser
+    from Windows.actions.schema import Action, as_action
+
+_EXPORTS = {
+    "ActionHandler": "Windows.actions.handler",
+    "ActionResult": "Windows.actions.handler",
+    "ActionParseError": "Windows.actions.parser",
+    "ActionParser": "Windows.actions.parser",
+    "Action": "Windows.actions.schema",
+    "as_action": "Windows.actions.schema",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    "ActionHandler",
+    "ActionResult",
+    "ActionParseError",
+    "ActionParser",
+    "Action",
+    "as_action",
+]
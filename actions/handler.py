@@ -1,15 +1,42 @@
 """Action handler for processing AI model outputs on Windows desktop."""
 
-import ast
-import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any, Callable
 
+from Windows.actions.parser import (
+    ACTION_MARKER,
+    ActionParseError,
+    Clause,
+    parse_clauses,
+)
+from Windows.actions.schema import (
+    Action,
+    DoubleTap,
+    Finish,
+    Hotkey,
+    InvalidAction,
+    Launch,
+    Plan,
+    RightClick,
+    Scroll,
+    Swipe,
+    TakeOver,
+    Tap,
+    Type,
+    Wait,
+    as_action,
+    create_action,
+)
+from Windows.config.plan import PlanConfig
 from Windows.config.timing import TIMING_CONFIG
 from Windows.desktop import (
+    SettleDetector,
+    SettleResult,
     convert_relative_to_absolute,
+    frame_change_ratio,
     double_tap,
+    grab_thumbnail,
     hotkey,
     press,
     right_click,
@@ -18,6 +45,19 @@ from Windows.desktop import (
     tap,
     type_text,
 )
+from Windows.tracing import get_tracer, traced_sleep
+
+# Fixed delays (section, attribute in TIMING_CONFIG) that visual settle
+# detection replaces for actions which change the screen.
+_SETTLE_DELAYS = {
+    "Tap": ("device", "default_tap_delay"),
+    "RightClick": ("device", "default_tap_delay"),
+    "DoubleTap": ("device", "default_double_tap_delay"),
+    "Swipe": ("device", "default_swipe_delay"),
+    "Scroll": ("device", "default_scroll_delay"),
+    "Type": ("keyboard", "default_type_delay"),
+    "Hotkey": ("keyboard", "default_hotkey_delay"),
+}
 
 
 @dataclass
@@ -28,6 +68,7 @@ class ActionResult:
     should_finish: bool
     message: str | None = None
     requires_confirmation: bool = False
+    settle: SettleResult | None = None
 
 
 class ActionHandler:
@@ -38,46 +79,73 @@ class ActionHandler:
         confirmation_callback: Optional callback for sensitive action confirmation.
             Should return True to proceed, False to cancel.
         takeover_callback: Optional callback for takeover requests (login, captcha).
+        settle_detector: Optional detector used to wait for the screen to settle
+            after an action. Defaults to a SettleDetector using TIMING_CONFIG.settle.
+        plan_config: Limits and screen change check of multi-action plans.
+            Defaults to PlanConfig().
     """
 
     def __init__(
         self,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        settle_detector: SettleDetector | None = None,
+        plan_config: PlanConfig | None = None,
     ):
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
+        self.settle_detector = settle_detector or SettleDetector()
+        self.plan_config = plan_config or PlanConfig()
+        self._offset = (0, 0)
+        self._handlers: dict[type[Action], Callable[..., ActionResult]] = {
+            Tap: self._handle_tap,
+            RightClick: self._handle_right_click,
+            DoubleTap: self._handle_double_tap,
+            Type: self._handle_type,
+            Hotkey: self._handle_hotkey,
+            Swipe: self._handle_swipe,
+            Scroll: self._handle_scroll,
+            Wait: self._handle_wait,
+            TakeOver: self._handle_takeover,
+            Launch: self._handle_launch,
+            InvalidAction: self._handle_invalid,
+        }
 
     def execute(
-        self, action: dict[str, Any], screen_width: int, screen_height: int
+        self,
+        action: Action | dict[str, Any],
+        screen_width: int,
+        screen_height: int,
+        offset: tuple[int, int] = (0, 0),
     ) -> ActionResult:
         """
         Execute an action from the AI model.
 
         Args:
-            action: The action dictionary from the model.
+            action: The parsed action, or an action dictionary such as one
+                loaded from a trajectory.
             screen_width: Current screen width in pixels.
             screen_height: Current screen height in pixels.
+            offset: Logical desktop position of the captured region's top-left
+                corner, used when the screenshot was cropped to a window.
 
         Returns:
             ActionResult indicating success and whether to finish.
         """
-        action_type = action.get("_metadata")
+        self._offset = offset
+        try:
+            action = as_action(action)
+        except ValueError as e:
+            return ActionResult(success=False, should_finish=True, message=str(e))
 
-        if action_type == "finish":
-            return ActionResult(
-                success=True, should_finish=True, message=action.get("message")
-            )
+        if isinstance(action, Finish):
+            return ActionResult(success=True, should_finish=True, message=action.message)
 
-        if action_type != "do":
-            return ActionResult(
-                success=False,
-                should_finish=True,
-                message=f"Unknown action type: {action_type}",
-            )
+        if isinstance(action, Plan):
+            return self._execute_plan(action.actions, screen_width, screen_height)
 
+        handler_method = self._handlers.get(type(action))
         action_name = action.get("action")
-        handler_method = self._get_handler(action_name)
 
         if handler_method is None:
             return ActionResult(
@@ -87,29 +155,167 @@ class ActionHandler:
             )
 
         try:
-            return handler_method(action, screen_width, screen_height)
+            with get_tracer().span("action", action=action_name):
+                result = handler_method(action, screen_width, screen_height)
         except Exception as e:
             return ActionResult(
                 success=False, should_finish=False, message=f"Action failed: {e}"
             )
 
-    def _get_handler(self, action_name: str) -> Callable | None:
-        """Get the handler method for an action."""
-        handlers = {
-            "Tap": self._handle_tap,
-            "RightClick": self._handle_right_click,
-            "DoubleTap": self._handle_double_tap,
-            "Type": self._handle_type,
-            "Hotkey": self._handle_hotkey,
-            "Swipe": self._handle_swipe,
-            "Scroll": self._handle_scroll,
-            "Wait": self._handle_wait,
-            "Take_over": self._handle_takeover,
-            "Launch": self._handle_launch,
-        }
-        return handlers.get(action_name)
+        if result.success and action_name in _SETTLE_DELAYS:
+            with get_tracer().span("settle", action=action_name) as span:
+                result.settle = self._wait_for_settle(action_name)
+                span.set(settled=result.settle.settled, frames=result.settle.frames)
+        return result
+
+    def execute_plan(
+        self,
+        plan: Plan,
+        screen_width: int,
+        screen_height: int,
+        offset: tuple[int, int] = (0, 0),
+        start: int = 0,
+        previous: Any = None,
+    ) -> ActionResult:
+        """
+        Execute a plan whose first actions already ran.
+
+        Args:
+            plan: The parsed plan.
+            screen_width: Current screen width in pixels.
+            screen_height: Current screen height in pixels.
+            offset: Logical desktop position of the captured region.
+            start: Index of the first action to run, e.g. 1 when the first
+                action was dispatched while the response streamed.
+            previous: ``plan_frame()`` taken before action ``start - 1`` ran,
+                so the change it caused is checked too.
+
+        Returns:
+            ActionResult of the last action run.
+        """
+        self._offset = offset
+        return self._execute_plan(
+            plan.actions, screen_width, screen_height, start, previous
+        )
+
+    def plan_frame(self) -> Any:
+        """
+        Capture the thumbnail compared between plan actions.
+
+        Returns:
+            The thumbnail, or None when the change check is disabled or the
+            capture failed.
+        """
+        if not self.plan_config.check_changes:
+            return None
+        try:
+            return grab_thumbnail(self.plan_config.thumbnail_factor)
+        except Exception:
+            return None
+
+    def _execute_plan(
+        self,
+        actions: list[Action],
+        screen_width: int,
+        screen_height: int,
+        start: int = 0,
+        previous: Any = None,
+    ) -> ActionResult:
+        """
+        Run a multi-action plan locally.
+
+        Before each follow-up action a cheap thumbnail is compared with the
+        one taken before the previous action; if the previous action changed
+        more of the screen than ``PlanConfig.change_threshold`` the screen is
+        in a state the plan did not anticipate, so execution stops and the
+        model gets a fresh screenshot. Actions beyond
+        ``PlanConfig.max_actions`` are not run; the result message lists them
+        so the model can re-plan.
+        """
+        if not actions:
+            return ActionResult(False, False, "Empty action plan")
+
+        limit = self.plan_config.max_actions
+        if limit <= 0 or len(actions) <= limit:
+            return self._run_plan(actions, screen_width, screen_height, start, previous)
 
-    def _handle_launch(self, action: dict, width: int, height: int) -> ActionResult:
+        result = self._run_plan(
+            actions[:limit], screen_width, screen_height, start, previous
+        )
+        skipped = "; ".join(_clause_text(a) for a in actions[limit:])
+        note = f"Plan exceeds {limit} actions, skipped: {skipped}"
+        return replace(
+            result, message=f"{result.message}. {note}" if result.message else note
+        )
+
+    def _run_plan(
+        self,
+        actions: list[Action],
+        screen_width: int,
+        screen_height: int,
+        start: int,
+        previous: Any,
+    ) -> ActionResult:
+        """Run ``actions[start:]`` in order, stopping on unexpected screen changes."""
+        offset = self._offset
+        config = self.plan_config
+        result = ActionResult(True, False)
+
+        for index in range(start, len(actions)):
+            action = actions[index]
+            if isinstance(action, Plan):
+                return ActionResult(False, False, "Nested action plans are not supported")
+
+            current = self.plan_frame()
+            if previous is not None and current is not None:
+                ratio = frame_change_ratio(previous, current, config.pixel_threshold)
+                if ratio > config.change_threshold:
+                    return ActionResult(
+                        success=True,
+                        should_finish=False,
+                        message=(
+                            f"Plan stopped after {index}/{len(actions)} actions: "
+                            f"screen changed unexpectedly ({ratio:.0%})"
+                        ),
+                        settle=result.settle,
+                    )
+
+            result = self.execute(action, screen_width, screen_height, offset)
+            if not result.success or result.should_finish:
+                return result
+            previous = current
+
+        return result
+
+    def _wait_for_settle(self, action_name: str) -> SettleResult:
+        """
+        Wait for the screen to settle, falling back to the fixed delay.
+
+        Detection never waits longer than the fixed delay it replaces, and is
+        skipped for delays it cannot beat (e.g. the short keyboard delays).
+        """
+        section, attr = _SETTLE_DELAYS[action_name]
+        budget = getattr(getattr(TIMING_CONFIG, section), attr)
+
+        detector = self.settle_detector
+        if detector.config.enabled and budget > detector.minimum_wait:
+            try:
+                return detector.wait(
+                    budget=budget, timeout=min(budget, detector.config.max_timeout)
+                )
+            except Exception as e:
+                print(f"Settle detection failed, using fixed delay: {e}")
+
+        start = time.perf_counter()
+        traced_sleep(budget, source="settle_fallback")
+        return SettleResult(
+            settled=True,
+            elapsed=time.perf_counter() - start,
+            frames=0,
+            budget=budget,
+        )
+
+    def _handle_launch(self, action: Launch, width: int, height: int) -> ActionResult:
         """Handle launch action - not supported, return error."""
         return ActionResult(
             success=False,
@@ -117,119 +323,87 @@ class ActionHandler:
             message="Launch命令不支持。请使用Hotkey(win)打开开始菜单，然后搜索应用；或使用Hotkey(win+d)显示桌面后双击图标。",
         )
 
+    def _handle_invalid(
+        self, action: InvalidAction, width: int, height: int
+    ) -> ActionResult:
+        """Report an action rejected at parse time back to the model."""
+        return ActionResult(False, False, action.error)
+
     def _convert_relative_to_absolute(
         self, element: list[int], screen_width: int, screen_height: int
     ) -> tuple[int, int]:
         """Convert relative coordinates (0-999) to absolute pixels."""
-        return convert_relative_to_absolute(element, screen_width, screen_height)
+        x, y = convert_relative_to_absolute(element, screen_width, screen_height)
+        return (x + self._offset[0], y + self._offset[1])
 
-    def _handle_tap(self, action: dict, width: int, height: int) -> ActionResult:
+    def _handle_tap(self, action: Tap, width: int, height: int) -> ActionResult:
         """Handle tap action (left click)."""
-        element = action.get("element")
-        if not element:
-            return ActionResult(False, False, "No element coordinates")
-
-        x, y = self._convert_relative_to_absolute(element, width, height)
+        x, y = self._convert_relative_to_absolute(action.element, width, height)
 
-        if "message" in action:
-            if not self.confirmation_callback(action["message"]):
+        if action.message is not None:
+            if not self.confirmation_callback(action.message):
                 return ActionResult(
                     success=False,
                     should_finish=True,
                     message="User cancelled sensitive operation",
                 )
 
-        tap(x, y)
-        time.sleep(TIMING_CONFIG.device.default_tap_delay)
+        tap(x, y, delay=0)
         return ActionResult(True, False)
 
     def _handle_right_click(
-        self, action: dict, width: int, height: int
+        self, action: RightClick, width: int, height: int
     ) -> ActionResult:
         """Handle right click action."""
-        element = action.get("element")
-        if not element:
-            return ActionResult(False, False, "No element coordinates")
-
-        x, y = self._convert_relative_to_absolute(element, width, height)
-        right_click(x, y)
-        time.sleep(TIMING_CONFIG.device.default_tap_delay)
+        x, y = self._convert_relative_to_absolute(action.element, width, height)
+        right_click(x, y, delay=0)
         return ActionResult(True, False)
 
     def _handle_double_tap(
-        self, action: dict, width: int, height: int
+        self, action: DoubleTap, width: int, height: int
     ) -> ActionResult:
         """Handle double tap action (double click)."""
-        element = action.get("element")
-        if not element:
-            return ActionResult(False, False, "No element coordinates")
-
-        x, y = self._convert_relative_to_absolute(element, width, height)
-        double_tap(x, y)
-        time.sleep(TIMING_CONFIG.device.default_double_tap_delay)
+        x, y = self._convert_relative_to_absolute(action.element, width, height)
+        double_tap(x, y, delay=0)
         return ActionResult(True, False)
 
-    def _handle_type(self, action: dict, width: int, height: int) -> ActionResult:
+    def _handle_type(self, action: Type, width: int, height: int) -> ActionResult:
         """Handle text input action."""
-        text = action.get("text", "")
-        type_text(text)
-        time.sleep(TIMING_CONFIG.keyboard.default_type_delay)
+        type_text(action.text, delay=0)
         return ActionResult(True, False)
 
-    def _handle_hotkey(self, action: dict, width: int, height: int) -> ActionResult:
+    def _handle_hotkey(self, action: Hotkey, width: int, height: int) -> ActionResult:
         """Handle hotkey action."""
-        keys = action.get("keys", "")
-        if not keys:
-            return ActionResult(False, False, "No keys specified")
-
-        hotkey(keys)
-        time.sleep(TIMING_CONFIG.keyboard.default_hotkey_delay)
+        hotkey(action.keys, delay=0)
         return ActionResult(True, False)
 
-    def _handle_swipe(self, action: dict, width: int, height: int) -> ActionResult:
+    def _handle_swipe(self, action: Swipe, width: int, height: int) -> ActionResult:
         """Handle swipe action (drag)."""
-        start = action.get("start")
-        end = action.get("end")
-
-        if not start or not end:
-            return ActionResult(False, False, "Missing swipe coordinates")
-
-        start_x, start_y = self._convert_relative_to_absolute(start, width, height)
-        end_x, end_y = self._convert_relative_to_absolute(end, width, height)
+        start_x, start_y = self._convert_relative_to_absolute(action.start, width, height)
+        end_x, end_y = self._convert_relative_to_absolute(action.end, width, height)
 
-        swipe(start_x, start_y, end_x, end_y)
-        time.sleep(TIMING_CONFIG.device.default_swipe_delay)
+        swipe(start_x, start_y, end_x, end_y, delay=0)
         return ActionResult(True, False)
 
-    def _handle_scroll(self, action: dict, width: int, height: int) -> ActionResult:
+    def _handle_scroll(self, action: Scroll, width: int, height: int) -> ActionResult:
         """Handle scroll action."""
-        direction = action.get("direction", "down")
-        amount = action.get("amount", 3)
-
-        try:
-            amount = int(amount)
-        except (ValueError, TypeError):
-            amount = 3
-
-        scroll(direction, amount)
-        time.sleep(TIMING_CONFIG.device.default_scroll_delay)
+        scroll(action.direction, action.amount, delay=0)
         return ActionResult(True, False)
 
-    def _handle_wait(self, action: dict, width: int, height: int) -> ActionResult:
+    def _handle_wait(self, action: Wait, width: int, height: int) -> ActionResult:
         """Handle wait action."""
-        duration_str = action.get("duration", "1 seconds")
-        try:
-            duration = float(duration_str.replace("seconds", "").strip())
-        except ValueError:
-            duration = 1.0
-
-        time.sleep(duration)
+        traced_sleep(action.duration, source="Wait")
         return ActionResult(True, False)
 
-    def _handle_takeover(self, action: dict, width: int, height: int) -> ActionResult:
+    @staticmethod
+    def wait_duration(action: Action | dict[str, Any]) -> float:
+        """Duration of a Wait action in seconds."""
+        action = as_action(action)
+        return action.duration if isinstance(action, Wait) else 1.0
+
+    def _handle_takeover(self, action: TakeOver, width: int, height: int) -> ActionResult:
         """Handle takeover request (login, captcha, etc.)."""
-        message = action.get("message", "User intervention required")
-        self.takeover_callback(message)
+        self.takeover_callback(action.message)
         return ActionResult(True, False)
 
     @staticmethod
@@ -244,90 +418,93 @@ class ActionHandler:
         input(f"{message}\nPress Enter after completing manual operation...")
 
 
-def parse_action(response: str) -> dict[str, Any]:
+_TRAILING_TAGS = ("</answer>", "</think_tag>")
+
+
+def parse_action(response: str) -> Action:
     """
     Parse action from model response.
 
+    The thinking is the text between ``思考:`` and ``动作:``; the action is
+    read from the ``do(...)``/``finish(...)`` clauses after ``动作:`` (or
+    anywhere in the response without it). Several clauses are returned as a
+    ``Plan`` running them in order.
+
     Args:
         response: Raw response string from the model.
 
     Returns:
-        Parsed action dictionary with optional 'thinking' field.
+        The typed action, carrying the model's thinking when present. Actions
+        whose arguments fail validation are returned as ``InvalidAction``.
 
     Raises:
-        ValueError: If the response cannot be parsed.
+        ActionParseError: If the response cannot be parsed; ``position`` is
+            the offset in ``response`` where parsing failed.
     """
+    thinking = None
+    thinking_at = response.find("思考:")
+    if thinking_at >= 0:
+        end = response.find(ACTION_MARKER, thinking_at)
+        thinking = response[thinking_at + 3 : end if end >= 0 else None].strip()
+
+    start = response.find(ACTION_MARKER)
+    start = 0 if start < 0 else start + len(ACTION_MARKER)
     try:
-        response = response.strip()
-
-        thinking = None
-        thinking_match = re.search(r'思考:\s*(.+?)(?=动作:|$)', response, re.DOTALL)
-        if thinking_match:
-            thinking = thinking_match.group(1).strip()
-
-        action_match = re.search(r'动作:\s*(.+?)$', response, re.DOTALL)
-        if action_match:
-            response = action_match.group(1).strip()
-
-        response = re.sub(r'</answer>\s*$', '', response)
-        response = re.sub(r'</think_tag>\s*$', '', response)
-
-        if response.startswith("do"):
-            try:
-                response = response.replace("\n", "\\n")
-                response = response.replace("\r", "\\r")
-                response = response.replace("\t", "\\t")
-
-                if not response.endswith(")"):
-                    match = re.search(r'do\([^)]+\)', response)
-                    if match:
-                        response = match.group(0)
-
-                tree = ast.parse(response, mode="eval")
-                if not isinstance(tree.body, ast.Call):
-                    raise ValueError("Expected a function call")
-
-                call = tree.body
-                action = {"_metadata": "do"}
-                for keyword in call.keywords:
-                    key = keyword.arg
-                    value = ast.literal_eval(keyword.value)
-                    action[key] = value
-
-                if thinking:
-                    action["thinking"] = thinking
-                return action
-            except (SyntaxError, ValueError) as e:
-                raise ValueError(f"Failed to parse do() action: {e}")
-
-        elif response.startswith("finish"):
-            match = re.search(r'finish\(message="([^"]*)"\)', response)
-            if match:
-                message = match.group(1)
-            else:
-                message = response.replace("finish(message=", "")
-                if message.startswith('"') and message.endswith('"'):
-                    message = message[1:-1]
-            action = {
-                "_metadata": "finish",
-                "message": message,
-            }
-            if thinking:
-                action["thinking"] = thinking
-        else:
-            raise ValueError(f"Failed to parse action: {response}")
-        return action
-    except Exception as e:
-        raise ValueError(f"Failed to parse action: {e}")
-
-
-def do(**kwargs) -> dict[str, Any]:
+        clauses = parse_clauses(response, start)
+    except ActionParseError as e:
+        if e.clause_start is None or not response.startswith("finish(", e.clause_start):
+            raise
+        # A finish message the model did not quote properly still ends the task.
+        return Finish(_loose_finish_message(response[e.clause_start :]), thinking)
+
+    if len(clauses) > 1:
+        return Plan([_clause_action(c, None) for c in clauses], thinking)
+    return _clause_action(clauses[0], thinking)
+
+
+def _clause_text(action: Action) -> str:
+    """Render an action back in the model's ``do(...)`` syntax."""
+    args = [
+        f"{key}={value!r}"
+        for key, value in action.to_dict().items()
+        if key not in ("_metadata", "thinking")
+    ]
+    return f"do({', '.join(args)})"
+
+
+def _clause_action(clause: Clause, thinking: str | None) -> Action:
+    """Build the typed action for a parsed clause."""
+    params = dict(clause.arguments)
+    if clause.name == "finish":
+        # Fall back to the only argument when the keyword is misspelled.
+        message = params.get("message", next(iter(params.values()), None))
+        return Finish(message, thinking)
+    return create_action(params.pop("action", None), params, thinking)
+
+
+def _loose_finish_message(text: str) -> str:
+    """Message of a malformed finish(...) clause: its text up to the last ")"."""
+    text = text.rstrip()
+    while text.endswith(_TRAILING_TAGS):
+        text = text[: text.rindex("</")].rstrip()
+    text = text[len("finish(") :]
+    if text.endswith(")"):
+        text = text[:-1]
+    text = text.strip()
+    if text.startswith("message="):
+        text = text[len("message=") :].lstrip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        text = text[1:-1]
+    return text
+
+
+def do(**kwargs) -> Action:
     """Helper function for creating 'do' actions."""
-    kwargs["_metadata"] = "do"
-    return kwargs
+    name = kwargs.pop("action", None)
+    thinking = kwargs.pop("thinking", None)
+    return create_action(name, kwargs, thinking)
 
 
-def finish(**kwargs) -> dict[str, Any]:
+def finish(**kwargs) -> Finish:
     """Helper function for creating 'finish' actions."""
-    kwargs["_metadata"] = "finish"
-    return kwargs
+    return Finish(**kwargs)
@@ -0,0 +1,569 @@
+"""Incremental parser for the ``do(...)``/``finish(...)`` action grammar.
+
+The model writes its action as a call with keyword arguments whose values
+are Python-style literals::
+
+    clause := ("do" | "finish") "(" [arg ("," arg)* [","]] ")"
+    arg    := [NAME "="] value
+    value  := STRING | NUMBER | "True" | "False" | "None"
+            | "[" values "]" | "(" values ")" | "{" items "}"
+
+Strings use single or double quotes with backslash escapes and may contain
+raw line breaks, which models often emit inside ``Type`` text. Positional
+arguments are accepted and ignored.
+
+``ActionParser`` takes the response chunk by chunk: an open clause is only
+re-parsed once a closing parenthesis arrives, and each clause is reported as
+soon as it closes. Malformed clauses raise (or are collected as)
+``ActionParseError`` carrying the offset where parsing failed, so callers
+can point at, or repair, the exact spot.
+"""
+
+from dataclasses import dataclass
+from typing import Any, NoReturn
+
+# Names that start a clause; the call must follow the name directly.
+CLAUSE_NAMES = ("do", "finish")
+# Precedes the action part of a reply; clauses before it belong to the thinking.
+ACTION_MARKER = "动作:"
+
+_CONSTANTS = {"True": True, "False": False, "None": None}
+_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "\\": "\\",
+    "'": "'",
+    '"': '"',
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "\n": "",
+}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+_SPACE = " \t\r\n"
+_DIGITS = "0123456789"
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+_NUMBER_START = "0123456789+-."
+_INT_LIST = "0123456789, \t\r\n+-"
+_MAX_DEPTH = 64
+_LOOKBACK = max(len(name) for name in CLAUSE_NAMES)
+
+
+class ActionParseError(ValueError):
+    """
+    Raised when an action clause does not match the grammar.
+
+    Attributes:
+        message: What was wrong, e.g. "expected ',' or ')'".
+        position: Offset in the parsed text where parsing failed.
+        clause_start: Offset of the clause being parsed, if any.
+    """
+
+    def __init__(self, message: str, position: int, clause_start: int | None = None):
+        super().__init__(f"{message} at position {position}")
+        self.message = message
+        self.position = position
+        self.clause_start = clause_start
+
+
+class _Incomplete(Exception):
+    """The text ended inside a clause that more text may still complete."""
+
+
+@dataclass
+class Clause:
+    """
+    A parsed ``do(...)`` or ``finish(...)`` call.
+
+    Attributes:
+        name: "do" or "finish".
+        arguments: Keyword arguments with their literal values.
+        start: Offset of the clause name in the parsed text.
+        end: Offset just past the closing parenthesis.
+    """
+
+    name: str
+    arguments: dict[str, Any]
+    start: int
+    end: int
+
+
+def find_clause(text: str, pos: int = 0) -> int:
+    """
+    Find the next clause start in ``text``.
+
+    A clause starts at ``do(`` or ``finish(`` that is not the tail of a
+    longer name, so ``undo(`` is skipped.
+
+    Returns:
+        Offset of the clause name, or -1.
+    """
+    while True:
+        found = -1
+        for name in CLAUSE_NAMES:
+            i = text.find(name + "(", pos)
+            if i >= 0 and (found < 0 or i < found):
+                found = i
+        if found <= 0:
+            return found
+        ch = text[found - 1]
+        if not (ch.isalnum() or ch == "_"):
+            return found
+        pos = found + 1
+
+
+class _Reader:
+    """
+    Recursive-descent parser over one clause.
+
+    Every method reads from ``self.pos`` and leaves it just past what it
+    consumed; whitespace is skipped inline since it is usually absent.
+    """
+
+    __slots__ = ("text", "n", "pos", "final", "start", "depth")
+
+    def __init__(self, text: str, start: int, final: bool):
+        self.text = text
+        self.n = len(text)
+        self.pos = start
+        self.final = final
+        self.start = start
+        self.depth = 0
+
+    def fail(self, message: str, position: int) -> NoReturn:
+        if position >= self.n and not self.final:
+            raise _Incomplete()
+        raise ActionParseError(message, position, self.start)
+
+    def end_of_text(self, message: str, position: int) -> NoReturn:
+        """Fail at ``position`` on text that ran out before ``message`` closed."""
+        if not self.final:
+            raise _Incomplete()
+        raise ActionParseError(message, position, self.start)
+
+    def name(self) -> str:
+        text, n = self.text, self.n
+        start = pos = self.pos
+        if pos >= n or not (text[pos].isalpha() or text[pos] == "_"):
+            self.fail("expected a name", pos)
+        pos += 1
+        while pos < n and (text[pos].isalnum() or text[pos] == "_"):
+            pos += 1
+        if pos >= n and not self.final:
+            raise _Incomplete()
+        self.pos = pos
+        return text[start:pos]
+
+    def call(self) -> Clause:
+        text, n = self.text, self.n
+        start = pos = self.pos
+        paren = text.find("(", start)
+        name = text[start:paren] if paren > start else ""
+        if name in CLAUSE_NAMES:
+            pos += len(name)
+        else:
+            name = self.name()
+            pos = self.pos
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            if pos >= n or text[pos] != "(":
+                self.fail("expected '('", pos)
+        pos += 1
+
+        arguments: dict[str, Any] = {}
+        while True:
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            if pos >= n:
+                self.fail("expected ')'", pos)
+            ch = text[pos]
+            if ch == ")":
+                break
+            self.pos = arg_start = pos
+            equals = text.find("=", pos)
+            key = text[pos:equals].rstrip() if equals > 0 else ""
+            if key.isidentifier():
+                # Fast path for the usual "name=value".
+                self.pos = equals + 1
+                arguments[key] = self.value()
+            elif ch.isalpha() or ch == "_":
+                key = self.name()
+                pos = self.pos
+                while pos < n and text[pos] in _SPACE:
+                    pos += 1
+                if pos < n and text[pos] == "=":
+                    self.pos = pos + 1
+                    arguments[key] = self.value()
+                elif key not in _CONSTANTS:
+                    self.fail(f"unknown name {key!r}", arg_start)
+            else:
+                self.value()
+
+            pos = self.pos
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            if pos < n and text[pos] == ",":
+                pos += 1
+            elif pos >= n or text[pos] != ")":
+                self.fail("expected ',' or ')'", pos)
+        self.pos = pos + 1
+        return Clause(name, arguments, start, pos + 1)
+
+    def value(self) -> Any:
+        text, n = self.text, self.n
+        pos = self.pos
+        while pos < n and text[pos] in _SPACE:
+            pos += 1
+        if pos >= n:
+            self.fail("expected a value", pos)
+        self.pos = pos
+        ch = text[pos]
+        if ch == '"' or ch == "'":
+            return self.string()
+        if ch in _NUMBER_START:
+            return self.number()
+        if ch == "[":
+            return self.sequence("]")
+        if ch == "(":
+            return self.sequence(")")
+        if ch == "{":
+            return self.mapping()
+        if ch.isalpha() or ch == "_":
+            word = self.name()
+            if word not in _CONSTANTS:
+                self.fail(f"unknown name {word!r}", pos)
+            return _CONSTANTS[word]
+        self.fail("expected a value", pos)
+
+    def string(self) -> str:
+        text, n = self.text, self.n
+        start = self.pos
+        quote = text[start]
+        pos = start + 1
+        parts = []
+        while True:
+            end = text.find(quote, pos)
+            backslash = text.find("\\", pos, n if end < 0 else end)
+            if backslash < 0:
+                if end < 0:
+                    self.end_of_text("unterminated string", start)
+                parts.append(text[pos:end])
+                self.pos = end + 1
+                return "".join(parts)
+
+            parts.append(text[pos:backslash])
+            if backslash + 1 >= n:
+                self.end_of_text("unterminated string", start)
+            ch = text[backslash + 1]
+            pos = backslash + 2
+            if ch in _ESCAPES:
+                parts.append(_ESCAPES[ch])
+            elif ch in _HEX_ESCAPES:
+                size = _HEX_ESCAPES[ch]
+                digits = text[pos : pos + size]
+                if len(digits) < size and pos + len(digits) >= n:
+                    self.end_of_text("unterminated string", start)
+                if len(digits) < size or digits.strip(_HEX_DIGITS):
+                    self.fail(f"invalid \\{ch} escape", backslash)
+                code = int(digits, 16)
+                if code > 0x10FFFF:
+                    self.fail(f"invalid \\{ch} escape", backslash)
+                parts.append(chr(code))
+                pos += size
+            elif "0" <= ch <= "7":
+                end = pos
+                while end < n and end < pos + 2 and "0" <= text[end] <= "7":
+                    end += 1
+                parts.append(chr(int(text[pos - 1 : end], 8)))
+                pos = end
+            else:
+                # Unknown escapes keep their backslash, as in Python.
+                parts.append("\\" + ch)
+
+    def number(self) -> int | float:
+        text, n = self.text, self.n
+        start = pos = self.pos
+        if text[pos] in "+-":
+            pos += 1
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+        digits_start = pos
+        while pos < n and text[pos] in _DIGITS:
+            pos += 1
+        is_float = False
+        if pos < n and text[pos] == ".":
+            is_float = True
+            pos += 1
+            while pos < n and text[pos] in _DIGITS:
+                pos += 1
+        if pos - digits_start == is_float:
+            self.fail("expected a number", digits_start)
+        if pos < n and text[pos] in "eE":
+            is_float = True
+            pos += 1
+            if pos < n and text[pos] in "+-":
+                pos += 1
+            exponent = pos
+            while pos < n and text[pos] in _DIGITS:
+                pos += 1
+            if pos == exponent:
+                self.fail("expected an exponent", pos)
+        if pos >= n and not self.final:
+            raise _Incomplete()
+
+        self.pos = pos
+        literal = text[start:pos]
+        if digits_start - start > 1:
+            # Whitespace between the sign and the digits.
+            literal = literal[0] + text[digits_start:pos]
+        return float(literal) if is_float else int(literal)
+
+    def sequence(self, close: str) -> list | tuple | Any:
+        text, n = self.text, self.n
+        pos = self.pos + 1
+        if close == "]":
+            # Fast path for the common list of integers, e.g. [500, 300].
+            end = text.find("]", pos)
+            if end > pos and not text[pos:end].strip(_INT_LIST):
+                try:
+                    items = [int(item) for item in text[pos:end].split(",")]
+                except ValueError:
+                    pass
+                else:
+                    self.pos = end + 1
+                    return items
+
+        self.depth += 1
+        if self.depth > _MAX_DEPTH:
+            self.fail("nesting too deep", self.pos)
+        items = []
+        trailing_comma = False
+        while True:
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            if pos < n and text[pos] == close:
+                break
+            self.pos = pos
+            items.append(self.value())
+            pos = self.pos
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            trailing_comma = pos < n and text[pos] == ","
+            if trailing_comma:
+                pos += 1
+            elif pos >= n or text[pos] != close:
+                self.fail(f"expected ',' or {close!r}", pos)
+        self.pos = pos + 1
+        self.depth -= 1
+        if close == "]":
+            return items
+        if len(items) == 1 and not trailing_comma:
+            # "(x)" is just x.
+            return items[0]
+        return tuple(items)
+
+    def mapping(self) -> dict:
+        text, n = self.text, self.n
+        self.depth += 1
+        if self.depth > _MAX_DEPTH:
+            self.fail("nesting too deep", self.pos)
+        pos = self.pos + 1
+        items = {}
+        while True:
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            if pos < n and text[pos] == "}":
+                break
+            self.pos = key_start = pos
+            key = self.value()
+            pos = self.pos
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            if pos >= n or text[pos] != ":":
+                self.fail("expected ':'", pos)
+            self.pos = pos + 1
+            value = self.value()
+            try:
+                items[key] = value
+            except TypeError:
+                self.fail("unhashable key", key_start)
+            pos = self.pos
+            while pos < n and text[pos] in _SPACE:
+                pos += 1
+            if pos < n and text[pos] == ",":
+                pos += 1
+            elif pos >= n or text[pos] != "}":
+                self.fail("expected ',' or '}'", pos)
+        self.pos = pos + 1
+        self.depth -= 1
+        return items
+
+
+def parse_clause(text: str, start: int = 0) -> Clause:
+    """
+    Parse the clause starting at ``start``.
+
+    Args:
+        text: Text containing the clause.
+        start: Offset of the clause name.
+
+    Returns:
+        The parsed clause.
+
+    Raises:
+        ActionParseError: If the clause is malformed or incomplete.
+    """
+    return _Reader(text, start, final=True).call()
+
+
+def parse_clauses(text: str, start: int = 0) -> list[Clause]:
+    """
+    Parse every clause in ``text`` from ``start`` on.
+
+    Text between clauses is ignored.
+
+    Args:
+        text: Model output.
+        start: Offset to start searching at.
+
+    Returns:
+        The clauses in order.
+
+    Raises:
+        ActionParseError: At the first malformed clause, or if there is none.
+    """
+    clauses = []
+    i = find_clause(text, start)
+    if i < 0:
+        raise ActionParseError("expected do(...) or finish(...)", start)
+    while i >= 0:
+        clause = _Reader(text, i, final=True).call()
+        clauses.append(clause)
+        i = find_clause(text, clause.end)
+    return clauses
+
+
+class ActionParser:
+    """
+    Parses clauses from text that arrives in chunks.
+
+    Example:
+        >>> parser = ActionParser()
+        >>> parser.feed('do(action="Type", text="a)')
+        []
+        >>> parser.feed('b")')
+        [Clause(name='do', arguments={'action': 'Type', 'text': 'a)b'}, ...)]
+
+    Malformed clauses do not stop the parser: they are recorded in
+    ``errors`` and scanning resumes after the failure.
+
+    Args:
+        marker: When set, only clauses after the first occurrence of
+            ``marker`` are parsed, e.g. ``ACTION_MARKER`` so a clause quoted
+            in the thinking is not taken for the action. If the text ends
+            without the marker, ``close`` parses it from the start, like
+            ``parse_action``.
+
+    Attributes:
+        text: All text fed so far.
+        clauses: Every clause parsed so far.
+        errors: Errors of malformed clauses, in order.
+    """
+
+    def __init__(self, marker: str | None = None):
+        self.marker = marker
+        self.text = ""
+        self.clauses: list[Clause] = []
+        self.errors: list[ActionParseError] = []
+        self._search = 0
+        self._start: int | None = None
+        self._retry = 0
+        self._in_action = marker is None
+
+    @property
+    def pending(self) -> int | None:
+        """Offset of the clause still open at the end of the text, if any."""
+        return self._start
+
+    def feed(self, chunk: str) -> list[Clause]:
+        """
+        Add text and parse the clauses it completes.
+
+        Args:
+            chunk: Newly received text.
+
+        Returns:
+            Clauses that closed in this chunk.
+        """
+        self.text += chunk
+        return self._drain(final=False)
+
+    def close(self) -> list[Clause]:
+        """
+        Mark the end of the text.
+
+        A clause still open is parsed as is, which records an error in
+        ``errors`` if it does not close.
+
+        Returns:
+            Clauses that closed in the remaining text.
+        """
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> list[Clause]:
+        text = self.text
+        parsed = []
+        while True:
+            if not self._in_action:
+                found = text.find(self.marker, self._search)
+                if found < 0 and not final:
+                    # The marker may straddle the chunk boundary.
+                    self._search = max(self._search, len(text) - len(self.marker) + 1)
+                    break
+                self._in_action = True
+                self._search = 0 if found < 0 else found + len(self.marker)
+
+            if self._start is None:
+                start = find_clause(text, self._search)
+                if start < 0:
+                    # A name may straddle the chunk boundary.
+                    self._search = max(self._search, len(text) - _LOOKBACK)
+                    break
+                self._start = self._retry = start
+
+            # The clause can only close once another ")" has arrived.
+            if not final and text.find(")", self._retry) < 0:
+                self._retry = len(text)
+                break
+
+            try:
+                clause = _Reader(text, self._start, final).call()
+            except _Incomplete:
+                self._retry = len(text)
+                break
+            except ActionParseError as e:
+                self.errors.append(e)
+                self._search = max(e.position, self._start + 1)
+                self._start = None
+                continue
+
+            parsed.append(clause)
+            self._search = clause.end
+            self._start = None
+
+        self.clauses.extend(parsed)
+        return parsed
+
+
+__all__ = [
+    "ACTION_MARKER",
+    "CLAUSE_NAMES",
+    "ActionParseError",
+    "ActionParser",
+    "Clause",
+    "find_clause",
+    "parse_clause",
+    "parse_clauses",
+]
@@ -0,0 +1,401 @@
+"""Typed actions parsed from model output.
+
+Every action the model can emit has a slotted class whose constructor
+validates and normalizes its arguments once, at parse time, so the handler
+can dispatch on the class and read attributes directly. Arguments that fail
+validation produce an ``InvalidAction`` carrying the error, which the
+handler reports back to the model like any other failed action.
+
+Actions are read-only mappings with the same keys as the dictionaries the
+parser used to return (``_metadata``, ``action``, the arguments and
+``thinking``), so code that inspects actions with ``action.get(...)`` keeps
+working, and ``to_dict()`` gives a JSON-serializable copy for trajectories
+and session archives.
+"""
+
+from collections.abc import Mapping
+from typing import Any, ClassVar, Iterator
+
+
+class Action(Mapping):
+    """Base class of parsed actions."""
+
+    __slots__ = ("thinking",)
+
+    metadata: ClassVar[str] = "do"
+    name: ClassVar[str | None] = None
+    fields: ClassVar[tuple[str, ...]] = ()
+
+    def _values(self) -> Iterator[tuple[str, Any]]:
+        yield "_metadata", self.metadata
+        if self.name is not None:
+            yield "action", self.name
+        for field in self.fields:
+            value = getattr(self, field)
+            if value is not None:
+                yield field, value
+        if self.thinking:
+            yield "thinking", self.thinking
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "_metadata":
+            return self.metadata
+        if key == "action" and self.name is not None:
+            return self.name
+        if key == "thinking" and self.thinking:
+            return self.thinking
+        if key in self.fields:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self._values())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._values())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dictionary form, as stored in trajectories and sessions."""
+        return dict(self._values())
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.fields)
+        return f"{type(self).__name__}({args})"
+
+
+def _point(value: Any, missing: str) -> list[int | float]:
+    """Validate a relative [x, y] coordinate pair."""
+    if not value:
+        raise ValueError(missing)
+    if (
+        not isinstance(value, (list, tuple))
+        or len(value) != 2
+        or not all(isinstance(v, (int, float)) for v in value)
+    ):
+        raise ValueError(f"Invalid coordinates: {value!r}")
+    return list(value)
+
+
+class _PointAction(Action):
+    """An action on a single element."""
+
+    __slots__ = ("element",)
+
+    fields = ("element",)
+
+    def __init__(self, element: Any = None, thinking: str | None = None, **_: Any):
+        self.element = _point(element, "No element coordinates")
+        self.thinking = thinking
+
+
+class Tap(_PointAction):
+    """Left click; ``message`` asks for confirmation first."""
+
+    __slots__ = ("message",)
+
+    name = "Tap"
+    fields = ("element", "message")
+
+    def __init__(
+        self,
+        element: Any = None,
+        message: str | None = None,
+        thinking: str | None = None,
+        **_: Any,
+    ):
+        super().__init__(element, thinking)
+        self.message = message
+
+
+class RightClick(_PointAction):
+    """Right click."""
+
+    __slots__ = ()
+
+    name = "RightClick"
+
+
+class DoubleTap(_PointAction):
+    """Double click."""
+
+    __slots__ = ()
+
+    name = "DoubleTap"
+
+
+class Type(Action):
+    """Text input."""
+
+    __slots__ = ("text",)
+
+    name = "Type"
+    fields = ("text",)
+
+    def __init__(self, text: Any = "", thinking: str | None = None, **_: Any):
+        self.text = "" if text is None else str(text)
+        self.thinking = thinking
+
+
+class Hotkey(Action):
+    """Key combination such as "ctrl+c"."""
+
+    __slots__ = ("keys",)
+
+    name = "Hotkey"
+    fields = ("keys",)
+
+    def __init__(self, keys: Any = "", thinking: str | None = None, **_: Any):
+        if not keys:
+            raise ValueError("No keys specified")
+        self.keys = keys
+        self.thinking = thinking
+
+
+class Swipe(Action):
+    """Drag from ``start`` to ``end``."""
+
+    __slots__ = ("start", "end")
+
+    name = "Swipe"
+    fields = ("start", "end")
+
+    def __init__(
+        self,
+        start: Any = None,
+        end: Any = None,
+        thinking: str | None = None,
+        **_: Any,
+    ):
+        self.start = _point(start, "Missing swipe coordinates")
+        self.end = _point(end, "Missing swipe coordinates")
+        self.thinking = thinking
+
+
+class Scroll(Action):
+    """Mouse wheel scroll."""
+
+    __slots__ = ("direction", "amount")
+
+    name = "Scroll"
+    fields = ("direction", "amount")
+
+    def __init__(
+        self,
+        direction: Any = "down",
+        amount: Any = 3,
+        thinking: str | None = None,
+        **_: Any,
+    ):
+        self.direction = direction or "down"
+        try:
+            self.amount = int(amount)
+        except (ValueError, TypeError):
+            self.amount = 3
+        self.thinking = thinking
+
+
+class Wait(Action):
+    """Pause; ``duration`` is in seconds."""
+
+    __slots__ = ("duration",)
+
+    name = "Wait"
+    fields = ("duration",)
+
+    def __init__(
+        self, duration: Any = "1 seconds", thinking: str | None = None, **_: Any
+    ):
+        try:
+            self.duration = float(str(duration).replace("seconds", "").strip())
+        except ValueError:
+            self.duration = 1.0
+        self.thinking = thinking
+
+
+class TakeOver(Action):
+    """Hand control to the user, e.g. for a login or captcha."""
+
+    __slots__ = ("message",)
+
+    name = "Take_over"
+    fields = ("message",)
+
+    def __init__(
+        self,
+        message: Any = "User intervention required",
+        thinking: str | None = None,
+        **_: Any,
+    ):
+        self.message = message
+        self.thinking = thinking
+
+
+class Launch(Action):
+    """Launch an app by name; rejected by the handler on Windows."""
+
+    __slots__ = ("app",)
+
+    name = "Launch"
+    fields = ("app",)
+
+    def __init__(self, app: Any = None, thinking: str | None = None, **_: Any):
+        self.app = app
+        self.thinking = thinking
+
+
+class InvalidAction(Action):
+    """A do(...) action that is unknown or whose arguments failed validation."""
+
+    __slots__ = ("action_name", "params", "error")
+
+    def __init__(
+        self,
+        action_name: str | None,
+        params: dict[str, Any],
+        error: str,
+        thinking: str | None = None,
+    ):
+        self.action_name = action_name
+        self.params = params
+        self.error = error
+        self.thinking = thinking
+
+    def _values(self) -> Iterator[tuple[str, Any]]:
+        yield "_metadata", self.metadata
+        if self.action_name is not None:
+            yield "action", self.action_name
+        yield from self.params.items()
+        if self.thinking:
+            yield "thinking", self.thinking
+
+    def __getitem__(self, key: str) -> Any:
+        for k, value in self._values():
+            if k == key:
+                return value
+        raise KeyError(key)
+
+    def __repr__(self) -> str:
+        return f"InvalidAction({self.action_name!r}, error={self.error!r})"
+
+
+class Finish(Action):
+    """End of the task."""
+
+    __slots__ = ("message",)
+
+    metadata = "finish"
+    fields = ("message",)
+
+    def __init__(self, message: Any = None, thinking: str | None = None, **_: Any):
+        self.message = message
+        self.thinking = thinking
+
+
+class Plan(Action):
+    """Several do(...) actions to run in order."""
+
+    __slots__ = ("actions",)
+
+    metadata = "plan"
+    fields = ("actions",)
+
+    def __init__(self, actions: Any = (), thinking: str | None = None, **_: Any):
+        self.actions = [as_action(a) for a in actions]
+        self.thinking = thinking
+
+    def to_dict(self) -> dict[str, Any]:
+        action = super().to_dict()
+        action["actions"] = [a.to_dict() for a in self.actions]
+        return action
+
+
+ACTION_TYPES: dict[str, type[Action]] = {
+    cls.name: cls
+    for cls in (
+        Tap,
+        RightClick,
+        DoubleTap,
+        Type,
+        Hotkey,
+        Swipe,
+        Scroll,
+        Wait,
+        TakeOver,
+        Launch,
+    )
+}
+
+
+def create_action(
+    name: str | None, params: dict[str, Any], thinking: str | None = None
+) -> Action:
+    """
+    Build a validated do(...) action.
+
+    Args:
+        name: The ``action`` argument, e.g. "Tap".
+        params: The remaining keyword arguments.
+        thinking: The model's reasoning for the action.
+
+    Returns:
+        The typed action, or an InvalidAction describing why it was rejected.
+    """
+    cls = ACTION_TYPES.get(name)
+    if cls is None:
+        return InvalidAction(name, params, f"Unknown action: {name}", thinking)
+    try:
+        return cls(thinking=thinking, **params)
+    except (ValueError, TypeError) as e:
+        return InvalidAction(name, params, str(e), thinking)
+
+
+def as_action(action: Action | Mapping[str, Any]) -> Action:
+    """
+    Convert an action dictionary to a typed action.
+
+    Args:
+        action: A typed action (returned unchanged) or a dictionary in the
+            parser's format, e.g. loaded from a trajectory.
+
+    Returns:
+        The typed action.
+
+    Raises:
+        ValueError: If ``_metadata`` is not "do", "finish" or "plan".
+    """
+    if isinstance(action, Action):
+        return action
+
+    params = dict(action)
+    metadata = params.pop("_metadata", None)
+    thinking = params.pop("thinking", None)
+    if metadata == "do":
+        return create_action(params.pop("action", None), params, thinking)
+    if metadata == "finish":
+        return Finish(params.get("message"), thinking)
+    if metadata == "plan":
+        return Plan(params.get("actions", ()), thinking)
+    raise ValueError(f"Unknown action type: {metadata}")
+
+
+__all__ = [
+    "ACTION_TYPES",
+    "Action",
+    "DoubleTap",
+    "Finish",
+    "Hotkey",
+    "InvalidAction",
+    "Launch",
+    "Plan",
+    "RightClick",
+    "Scroll",
+    "Swipe",
+    "TakeOver",
+    "Tap",
+    "Type",
+    "Wait",
+    "as_action",
+    "create_action",
+]
@@ -1,17 +1,35 @@
 """Main WindowsAgent class for orchestrating Windows desktop automation."""
 
 import json
+import threading
+import time
 import traceback
-from dataclasses import dataclass
-from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
 
-from phone_agent.model import ModelClient, ModelConfig
-from phone_agent.model.client import MessageBuilder
-
-from Windows.actions import ActionHandler
+from Windows.actions import ActionHandler, ActionResult
 from Windows.actions.handler import do, finish, parse_action
-from Windows.config import get_system_prompt
-from Windows.desktop import get_active_window_title, get_screenshot
+from Windows.actions.schema import Action, as_action
+from Windows.config import PlanConfig, RouterConfig, get_system_prompt
+from Windows.context import ContextConfig, ContextManager
+from Windows.desktop import (
+    FramePrefetcher,
+    Screenshot,
+    SettleResult,
+    dhash,
+    get_active_window_title,
+    get_screenshot,
+    hamming_distance,
+)
+from Windows.frame_cache import NO_CHANGE_HINT, FrameCache, FrameCacheConfig
+from Windows.model.cascade import CascadeConfig
+from Windows.session import SessionRecorder
+from Windows.tracing import call_in_step, current_step, get_tracer, set_step
+from Windows.trajectory import Trajectory, TrajectoryStep, TrajectoryStore
+
+if TYPE_CHECKING:
+    from phone_agent.model import ModelConfig
 
 
 @dataclass
@@ -20,12 +38,22 @@ class AgentConfig:
 
     max_steps: int = 100
     lang: str = "cn"
+    # None renders the default prompt, with the current date, for each task.
     system_prompt: str | None = None
     verbose: bool = True
-
-    def __post_init__(self):
-        if self.system_prompt is None:
-            self.system_prompt = get_system_prompt(self.lang)
+    prefetch_frames: bool = False
+    stream_actions: bool = False
+    context_config: ContextConfig | None = field(default_factory=ContextConfig)
+    plan_config: PlanConfig = field(default_factory=PlanConfig)
+    trajectory_dir: str | None = None
+    replay_hash_tolerance: int = 6
+    frame_cache: FrameCacheConfig | None = None
+    step_timeout: float | None = None
+    endpoints: "list[ModelConfig] | None" = None
+    router_config: RouterConfig | None = None
+    cascade: "list[ModelConfig] | None" = None
+    cascade_config: CascadeConfig | None = None
+    session_dir: str | None = None
 
 
 @dataclass
@@ -34,9 +62,10 @@ class StepResult:
 
     success: bool
     finished: bool
-    action: dict[str, Any] | None
+    action: Action | dict[str, Any] | None
     thinking: str
     message: str | None = None
+    settle: SettleResult | None = None
 
 
 class WindowsAgent:
@@ -63,22 +92,87 @@ class WindowsAgent:
 
     def __init__(
         self,
-        model_config: ModelConfig | None = None,
+        model_config: "ModelConfig | None" = None,
         agent_config: AgentConfig | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
     ):
+        from phone_agent.model import ModelConfig
+
         self.model_config = model_config or ModelConfig()
         self.agent_config = agent_config or AgentConfig()
 
-        self.model_client = ModelClient(self.model_config)
+        self.model_client = self._create_model_client()
         self.action_handler = ActionHandler(
             confirmation_callback=confirmation_callback,
             takeover_callback=takeover_callback,
+            plan_config=self.agent_config.plan_config,
+        )
+
+        self._prefetcher = (
+            FramePrefetcher() if self.agent_config.prefetch_frames else None
+        )
+
+        self._dispatch_executor: ThreadPoolExecutor | None = None
+        self._context_manager = (
+            ContextManager(self.agent_config.context_config)
+            if self.agent_config.context_config is not None
+            else None
+        )
+
+        self._trajectory_store = (
+            TrajectoryStore(self.agent_config.trajectory_dir)
+            if self.agent_config.trajectory_dir
+            else None
+        )
+        self._recording: list[TrajectoryStep] | None = None
+
+        self._frame_cache = (
+            FrameCache(self.agent_config.frame_cache)
+            if self.agent_config.frame_cache is not None
+            else None
+        )
+        self._action_history: list[str] = []
+
+        self._session = (
+            SessionRecorder(self.agent_config.session_dir)
+            if self.agent_config.session_dir
+            else None
         )
 
         self._context: list[dict[str, Any]] = []
         self._step_count = 0
+        self._cancelled = threading.Event()
+
+    def _create_model_client(self) -> Any:
+        """Create the client used to query the model."""
+        # The clients pull in openai and httpx; load them with the agent
+        # rather than with the package.
+        from Windows.model import (
+            ModelCascade,
+            ModelRouter,
+            PooledModelClient,
+            StreamingModelClient,
+        )
+
+        if self.agent_config.endpoints:
+            client = ModelRouter(
+                [self.model_config, *self.agent_config.endpoints],
+                self.agent_config.router_config,
+            )
+        elif self.agent_config.stream_actions:
+            client = StreamingModelClient(self.model_config)
+        else:
+            client = PooledModelClient(self.model_config)
+
+        if not self.agent_config.cascade:
+            return client
+        config = self.agent_config.cascade_config or CascadeConfig()
+        tiers = [
+            (c.model_name, StreamingModelClient(c, logprobs=config.logprobs))
+            for c in self.agent_config.cascade
+        ]
+        return ModelCascade([*tiers, (self.model_config.model_name, client)], config)
 
     def run(self, task: str) -> str:
         """
@@ -90,22 +184,137 @@ class WindowsAgent:
         Returns:
             Final message from the agent.
         """
-        self._context = []
-        self._step_count = 0
+        self.reset()
+
+        if self._session is None:
+            return self._run_task(task)
+
+        self._session.start_task(task)
+        message = self._run_task(task)
+        self._session.end_task(message, self._step_count)
+        return message
+
+    def _run_task(self, task: str) -> str:
+        """Run the steps of a task until it finishes or runs out of steps."""
+        if self._trajectory_store is not None:
+            self._recording = []
+            trajectory = self._trajectory_store.get(task)
+            if trajectory is not None:
+                result = self._replay(trajectory)
+                if result is not None:
+                    return self._finish_run(task, result, replayed=trajectory)
 
         result = self._execute_step(task, is_first=True)
 
         if result.finished:
-            return result.message or "Task completed"
+            return self._finish_run(task, result)
 
         while self._step_count < self.agent_config.max_steps:
+            if self._cancelled.is_set():
+                return "Task cancelled"
             result = self._execute_step(is_first=False)
 
             if result.finished:
-                return result.message or "Task completed"
+                return self._finish_run(task, result)
 
         return "Max steps reached"
 
+    def _finish_run(
+        self, task: str, result: StepResult, replayed: Trajectory | None = None
+    ) -> str:
+        """
+        Store the trajectory of a successful run and return its message.
+
+        A run replayed to the end from ``replayed`` keeps that trajectory and
+        counts the replay; any other successful run replaces it.
+        """
+        if self._recording and result.success and self._trajectory_store is not None:
+            if replayed is not None:
+                replayed.replays += 1
+                self._trajectory_store.put(replayed)
+            else:
+                self._trajectory_store.put(Trajectory(task=task, steps=self._recording))
+        self._recording = None
+        return result.message or "Task completed"
+
+    def _replay(self, trajectory: Trajectory) -> StepResult | None:
+        """
+        Re-execute a cached trajectory without calling the model.
+
+        Returns:
+            The final StepResult if the trajectory replayed to a finish or
+            a step ended the task (e.g. a declined confirmation), or None on
+            divergence or a failed step so the caller continues with the
+            model.
+        """
+        msgs = self._get_messages()
+        for index, step in enumerate(trajectory.steps):
+            if self._step_count >= self.agent_config.max_steps:
+                return None
+            if self._cancelled.is_set():
+                return StepResult(
+                    success=False,
+                    finished=True,
+                    action=None,
+                    thinking="",
+                    message="Task cancelled",
+                )
+
+            screenshot, current_window = self._capture_frame()
+            frame_hash = dhash(screenshot.image)
+            distance = hamming_distance(frame_hash, step.frame_hash)
+            if distance > self.agent_config.replay_hash_tolerance:
+                if self.agent_config.verbose:
+                    print(
+                        f"🔀 {msgs['replay_diverged']}: "
+                        f"{index + 1}/{len(trajectory.steps)} (distance {distance})"
+                    )
+                return None
+
+            self._step_count += 1
+            set_step(self._step_count)
+            if self.agent_config.verbose:
+                print(f"⏩ {msgs['replay']} {index + 1}/{len(trajectory.steps)}: {step.action}")
+
+            result = self.action_handler.execute(
+                step.action,
+                screenshot.width,
+                screenshot.height,
+                (screenshot.offset_x, screenshot.offset_y),
+            )
+            finished = step.action.get("_metadata") == "finish" or result.should_finish
+            if not result.success and not finished:
+                # A plain failure: let the model recover from the live screen.
+                return None
+            if result.success:
+                self._record_step(step.action, frame_hash, current_window)
+
+            if finished:
+                # A declined confirmation or failed action ends the task, as
+                # it would outside of a replay.
+                return StepResult(
+                    success=result.success,
+                    finished=True,
+                    action=step.action,
+                    thinking="",
+                    message=result.message or step.action.get("message"),
+                    settle=result.settle,
+                )
+
+            if self._prefetcher is not None:
+                self._prefetcher.request()
+        return None
+
+    def _record_step(
+        self, action: Action | dict[str, Any], frame_hash: int, window_title: str
+    ) -> None:
+        """Append a successfully executed step to the trajectory being recorded."""
+        if self._recording is None:
+            return
+        action = as_action(action).to_dict()
+        action.pop("thinking", None)
+        self._recording.append(TrajectoryStep(action, frame_hash, window_title))
+
     def step(self, task: str | None = None) -> StepResult:
         """
         Execute a single step of the agent.
@@ -125,88 +334,384 @@ class WindowsAgent:
 
         return self._execute_step(task, is_first)
 
+    def cancel(self) -> None:
+        """
+        Ask the running task to stop.
+
+        Safe to call from another thread. The task returns "Task cancelled"
+        before its next step; the step in progress is not interrupted.
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called since the last reset."""
+        return self._cancelled.is_set()
+
     def reset(self) -> None:
         """Reset the agent state for a new task."""
         self._context = []
         self._step_count = 0
+        self._cancelled.clear()
+        if self._prefetcher is not None:
+            self._prefetcher.invalidate()
+        if self._context_manager is not None:
+            self._context_manager.reset()
+        if self._frame_cache is not None:
+            self._frame_cache.reset()
+        self._action_history = []
 
     def _execute_step(
         self, user_prompt: str | None = None, is_first: bool = False
     ) -> StepResult:
         """Execute a single step of the agent loop."""
         self._step_count += 1
+        set_step(self._step_count)
+        with get_tracer().span("step"):
+            return self._run_step(user_prompt, is_first)
+
+    def _run_step(self, user_prompt: str | None, is_first: bool) -> StepResult:
+        """Observe, query the model and act for the current step."""
+        deadline = self._step_deadline()
+
+        screenshot, current_window = self._capture_frame()
+        if self._session is not None:
+            self._session.record_frame(screenshot, current_window, self._step_count)
+        frame_hash = (
+            dhash(screenshot.image)
+            if self._recording is not None or self._frame_cache is not None
+            else None
+        )
 
-        screenshot = get_screenshot()
-        current_window = get_active_window_title()
-
-        if is_first:
-            self._context.append(
-                MessageBuilder.create_system_message(self.agent_config.system_prompt)
-            )
+        cached, hint = self._lookup_frame(frame_hash)
 
-            screen_info = MessageBuilder.build_screen_info(current_window)
-            text_content = f"{user_prompt}\n\n{screen_info}"
+        self._append_observation(
+            screenshot, current_window, user_prompt, is_first, hint
+        )
 
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
+        offset = (screenshot.offset_x, screenshot.offset_y)
+        dispatched: dict[str, Any] = {}
+        if self._session is not None and cached is None:
+            self._session.record_request(self._context, self._step_count)
+        try:
+            self._print_request_banner()
+            with get_tracer().span("model", cached=cached is not None) as span:
+                if cached is not None:
+                    response = cached.response
+                elif self.agent_config.stream_actions:
+                    response = self.model_client.request(
+                        self._context,
+                        on_action=lambda clause: self._dispatch_early(
+                            clause, screenshot, offset, dispatched
+                        ),
+                        deadline=deadline,
+                    )
+                else:
+                    response = self.model_client.request(
+                        self._context, deadline=deadline
+                    )
+                self._trace_response(span, response)
+        except Exception as e:
+            if "future" in dispatched:
+                # Let the already dispatched action finish before bailing out.
+                dispatched["future"].exception()
+            return self._model_error_result(e)
+
+        action, thinking = self._parse_response(response)
+        if self._session is not None:
+            self._session.record_response(
+                response, self._step_count, cached=cached is not None
             )
-        else:
-            screen_info = MessageBuilder.build_screen_info(current_window)
-            text_content = f"** Screen Info **\n\n{screen_info}"
 
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
+        if self._frame_cache is not None and cached is None:
+            self._frame_cache.add(
+                frame_hash, self._step_count, self._recent_actions(), response
             )
+        self._action_history.append(response.action)
 
         try:
-            msgs = self._get_messages()
-            print("\n" + "=" * 50)
-            print(f"💭 {msgs['thinking']}:")
-            print("-" * 50)
-            response = self.model_client.request(self._context)
+            if "future" in dispatched:
+                # Already running since the clause closed mid-stream.
+                result = dispatched["future"].result()
+                is_plan = action.get("_metadata") == "plan"
+                first = action["actions"][0] if is_plan else action
+                if not self._same_action(dispatched["action"], first):
+                    # The streamed clause already ran but is not what the
+                    # final parse asks for: record what actually happened
+                    # and let the model re-plan from the next screenshot.
+                    if self.agent_config.verbose:
+                        msgs = self._get_messages()
+                        print(f"⚠️ {msgs['dispatch_mismatch']}")
+                    action = dispatched["action"]
+                    result = ActionResult(
+                        success=False,
+                        should_finish=False,
+                        message="Streamed action differs from the parsed action",
+                    )
+                elif is_plan and result.success and not result.should_finish:
+                    result = self.action_handler.execute_plan(
+                        action,
+                        screenshot.width,
+                        screenshot.height,
+                        offset,
+                        start=1,
+                        previous=dispatched["frame"],
+                    )
+            else:
+                result = self.action_handler.execute(
+                    action, screenshot.width, screenshot.height, offset
+                )
         except Exception as e:
             if self.agent_config.verbose:
                 traceback.print_exc()
-            return StepResult(
-                success=False,
-                finished=True,
-                action=None,
-                thinking="",
-                message=f"Model error: {e}",
+            result = self.action_handler.execute(
+                finish(message=str(e)), screenshot.width, screenshot.height, offset
             )
 
+        finished = action.get("_metadata") == "finish" or result.should_finish
+        if self._session is not None:
+            self._session.record_action(action, result, self._step_count)
+
+        if frame_hash is not None and result.success:
+            self._record_step(action, frame_hash, current_window)
+
+        if self._prefetcher is not None and not finished:
+            # The action has settled: grab the next frame in the background.
+            self._prefetcher.request()
+
+        return self._complete_step(response, action, thinking, result, finished)
+
+    def _step_deadline(self) -> float | None:
+        """Monotonic deadline of the current step's latency SLO, if any."""
+        if self.agent_config.step_timeout is None:
+            return None
+        return time.monotonic() + self.agent_config.step_timeout
+
+    def _recent_actions(self) -> tuple[str, ...]:
+        """The most recent model actions compared by the frame cache."""
+        length = self._frame_cache.config.history_length
+        return tuple(self._action_history[-length:]) if length > 0 else ()
+
+    def _lookup_frame(self, frame_hash: int | None) -> tuple[Any, str | None]:
+        """
+        Check the frame cache for an already seen frame.
+
+        Returns:
+            The cache entry whose response should be reused (or None) and
+            the no-change hint to add to the observation (or None).
+        """
+        if self._frame_cache is None or frame_hash is None:
+            return None, None
+        entry = self._frame_cache.lookup(frame_hash, self._recent_actions())
+        if entry is None:
+            return None, None
+
+        config = self._frame_cache.config
+        msgs = self._get_messages()
+        if config.mode == "reuse" and entry.reuses < config.max_reuse:
+            entry.reuses += 1
+            if self.agent_config.verbose:
+                print(f"♻️ {msgs['frame_reused'].format(step=entry.step)}")
+            return entry, None
+
+        if self.agent_config.verbose:
+            print(f"🔁 {msgs['frame_unchanged'].format(step=entry.step)}")
+        return None, NO_CHANGE_HINT.format(step=entry.step)
+
+    def _capture_frame(self) -> tuple[Screenshot, str]:
+        """Capture the current screenshot and active window title."""
+        if self._prefetcher is not None:
+            frame = self._prefetcher.take()
+            return frame.screenshot, frame.window_title
+        return get_screenshot(), get_active_window_title()
+
+    def _dispatch_early(
+        self,
+        clause: str,
+        screenshot: Screenshot,
+        offset: tuple[int, int],
+        dispatched: dict[str, Any],
+    ) -> None:
+        """Start executing a streamed do(...) clause while the response drains."""
         try:
-            action = parse_action(response.action)
-            thinking = action.get("thinking") or response.thinking or ""
+            action = parse_action(clause)
         except ValueError:
+            return
+        if action.get("_metadata") != "do":
+            return
+
+        if self._dispatch_executor is None:
+            self._dispatch_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="ActionDispatch"
+            )
+        dispatched["action"] = action
+        # Should the reply turn out to be a plan, its change check must also
+        # cover this first action.
+        dispatched["frame"] = self.action_handler.plan_frame()
+        # The clause arrives on a streaming thread; tag the action with the
+        # step that is in flight on the agent thread.
+        dispatched["future"] = self._dispatch_executor.submit(
+            call_in_step,
+            self._step_count,
+            self.action_handler.execute,
+            action,
+            screenshot.width,
+            screenshot.height,
+            offset,
+        )
+
+    @staticmethod
+    def _same_action(dispatched: Action, parsed: Action) -> bool:
+        """Whether an early dispatched action matches the parsed one."""
+        first, second = dispatched.to_dict(), parsed.to_dict()
+        first.pop("thinking", None)
+        second.pop("thinking", None)
+        return first == second
+
+    def _append_observation(
+        self,
+        screenshot: Screenshot,
+        current_window: str,
+        user_prompt: str | None,
+        is_first: bool,
+        hint: str | None = None,
+    ) -> None:
+        """Append the user message carrying the current screen to the context."""
+        from phone_agent.model.client import MessageBuilder
+
+        with get_tracer().span("context"):
+            if is_first:
+                self._context.append(
+                    MessageBuilder.create_system_message(
+                        self.agent_config.system_prompt
+                        or get_system_prompt(self.agent_config.lang)
+                    )
+                )
+
+                screen_info = MessageBuilder.build_screen_info(current_window)
+                text_content = f"{user_prompt}\n\n{screen_info}"
+
+                self._context.append(
+                    self._create_user_message(text_content, screenshot)
+                )
+            else:
+                screen_info = MessageBuilder.build_screen_info(current_window)
+                text_content = f"** Screen Info **\n\n{screen_info}"
+                if hint:
+                    text_content = f"{text_content}\n\n{hint}"
+
+                self._context.append(
+                    self._create_user_message(text_content, screenshot)
+                )
+
+            if self._context_manager is not None:
+                self._context_manager.compact(self._context)
+
+        if self.agent_config.verbose:
+            msgs = self._get_messages()
+            print(
+                f"🖼️ {msgs['screenshot']}: {screenshot.image_width}x{screenshot.image_height} "
+                f"{screenshot.mime_type} {screenshot.byte_size / 1024:.1f}KB "
+                f"{screenshot.encode_time * 1000:.1f}ms"
+            )
+
+    def _print_request_banner(self) -> None:
+        """Print the banner shown while waiting for the model."""
+        msgs = self._get_messages()
+        print("\n" + "=" * 50)
+        print(f"💭 {msgs['thinking']}:")
+        print("-" * 50)
+
+    def _model_error_result(self, error: Exception) -> StepResult:
+        """Build the StepResult for a failed model request."""
+        from Windows.model import DeadlineExceeded
+
+        if isinstance(error, DeadlineExceeded):
+            msgs = self._get_messages()
+            message = f"{msgs['step_timeout']} ({self.agent_config.step_timeout}s)"
+            if self.agent_config.verbose:
+                print(f"⏰ {message}")
+        else:
             if self.agent_config.verbose:
                 traceback.print_exc()
-            action = finish(message=response.action)
-            thinking = response.thinking or ""
+            message = f"Model error: {error}"
+        return StepResult(
+            success=False,
+            finished=True,
+            action=None,
+            thinking="",
+            message=message,
+        )
+
+    @staticmethod
+    def _trace_response(span: Any, response: Any) -> None:
+        """Attach model timings to the request span and record time to first token."""
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return
+        ttft = getattr(response, "time_to_first_token", None)
+        span.set(
+            ttft=ttft,
+            total=getattr(response, "total_time", None),
+            tier=getattr(response, "tier", None),
+        )
+        if ttft is not None:
+            tracer.record("model.ttft", span.start, ttft)
+
+    def _parse_response(self, response: Any) -> tuple[Action, str]:
+        """Parse the model response into an action and strip the sent image."""
+        from phone_agent.model.client import MessageBuilder
+
+        tier = getattr(response, "tier", None)
+        if tier is not None and self.agent_config.verbose:
+            msgs = self._get_messages()
+            escalations = getattr(response, "escalations", None)
+            suffix = f" ({', '.join(escalations)})" if escalations else ""
+            print(f"🪜 {msgs['tier']}: {tier}{suffix}")
+
+        with get_tracer().span("parse"):
+            try:
+                action = parse_action(response.action)
+                thinking = action.get("thinking") or response.thinking or ""
+            except ValueError:
+                if self.agent_config.verbose:
+                    traceback.print_exc()
+                action = finish(message=response.action)
+                thinking = response.thinking or ""
+        get_tracer().annotate_step(
+            current_step(), action=action.get("action") or action.get("_metadata")
+        )
 
         if self.agent_config.verbose:
+            msgs = self._get_messages()
             if thinking:
                 print(f"\n💭 思考: {thinking}")
             print("-" * 50)
             print(f"🎯 {msgs['action']}:")
-            print(json.dumps(action, ensure_ascii=False, indent=2))
+            print(json.dumps(action.to_dict(), ensure_ascii=False, indent=2))
             print("=" * 50 + "\n")
 
         self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
+        return action, thinking
 
-        try:
-            result = self.action_handler.execute(
-                action, screenshot.width, screenshot.height
-            )
-        except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            result = self.action_handler.execute(
-                finish(message=str(e)), screenshot.width, screenshot.height
+    def _complete_step(
+        self,
+        response: Any,
+        action: Action,
+        thinking: str,
+        result: ActionResult,
+        finished: bool,
+    ) -> StepResult:
+        """Record the assistant turn and build the StepResult."""
+        from phone_agent.model.client import MessageBuilder
+
+        if result.settle is not None and self.agent_config.verbose:
+            msgs = self._get_messages()
+            print(
+                f"⏱️ {msgs['settle']}: {result.settle.elapsed:.2f}s "
+                f"({msgs['saved']} {result.settle.saved:.2f}s, "
+                f"{result.settle.frames} frames"
+                f"{'' if result.settle.settled else ', timeout'})"
             )
 
         self._context.append(
@@ -215,8 +720,6 @@ class WindowsAgent:
             )
         )
 
-        finished = action.get("_metadata") == "finish" or result.should_finish
-
         if finished and self.agent_config.verbose:
             msgs = self._get_messages()
             print("\n" + "🎉 " + "=" * 48)
@@ -231,8 +734,20 @@ class WindowsAgent:
             action=action,
             thinking=thinking,
             message=result.message or action.get("message"),
+            settle=result.settle,
         )
 
+    @staticmethod
+    def _create_user_message(text: str, screenshot: Screenshot) -> dict[str, Any]:
+        """Create a user message carrying the screenshot with its real MIME type."""
+        return {
+            "role": "user",
+            "content": [
+                {"type": "image_url", "image_url": {"url": screenshot.data_url}},
+                {"type": "text", "text": text},
+            ],
+        }
+
     def _get_messages(self) -> dict[str, str]:
         """Get localized messages for the current language."""
         messages = {
@@ -241,12 +756,32 @@ class WindowsAgent:
                 "action": "动作",
                 "task_completed": "任务完成",
                 "done": "完成",
+                "settle": "画面稳定",
+                "saved": "节省",
+                "screenshot": "截图",
+                "replay": "回放缓存步骤",
+                "replay_diverged": "画面与缓存轨迹不一致，交还模型处理",
+                "frame_reused": "画面未变化，复用第 {step} 步的决策",
+                "step_timeout": "单步耗时超出上限",
+                "tier": "应答模型",
+                "frame_unchanged": "画面与第 {step} 步相同，已提示模型",
+                "dispatch_mismatch": "提前执行的动作与最终解析结果不一致，交还模型处理",
             },
             "en": {
                 "thinking": "Thinking",
                 "action": "Action",
                 "task_completed": "Task completed",
                 "done": "Done",
+                "settle": "Screen settled",
+                "saved": "saved",
+                "screenshot": "Screenshot",
+                "replay": "Replaying cached step",
+                "replay_diverged": "Screen diverged from cached trajectory, handing back to model",
+                "frame_reused": "Screen unchanged, reusing the decision of step {step}",
+                "step_timeout": "Step latency SLO exceeded",
+                "tier": "Answered by",
+                "frame_unchanged": "Screen same as step {step}, hinting the model",
+                "dispatch_mismatch": "Streamed action differs from the final parse, handing back to model",
             },
         }
         return messages.get(self.agent_config.lang, messages["cn"])
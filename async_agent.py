@@ -0,0 +1,249 @@
+"""Asyncio-native WindowsAgent for driving many sessions from one event loop."""
+
+import asyncio
+import traceback
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable
+
+from Windows.actions import ActionResult
+from Windows.actions.handler import finish
+from Windows.actions.schema import Action
+from Windows.agent import AgentConfig, StepResult, WindowsAgent
+from Windows.desktop import (
+    Screenshot,
+    dhash,
+    get_active_window_title,
+    get_screenshot,
+)
+from Windows.tracing import get_tracer, set_step
+
+if TYPE_CHECKING:
+    from phone_agent.model import ModelConfig
+
+    from Windows.model import AsyncModelClient
+
+
+class AsyncWindowsAgent(WindowsAgent):
+    """
+    WindowsAgent variant with ``async run()``/``async step()``.
+
+    Model requests use an asyncio client, capture/encode and input run in an
+    executor, and Wait actions are awaited instead of sleeping, so a single
+    event loop can drive many agents (one per remote session) and overlap
+    their I/O. Session recording, the frame cache and trajectory
+    record/replay work as in ``WindowsAgent``; replays run in the executor.
+
+    Args:
+        model_config: Configuration for the AI model.
+        agent_config: Configuration for the agent behavior.
+        confirmation_callback: Optional callback for sensitive action confirmation.
+        takeover_callback: Optional callback for takeover requests.
+        executor: Executor for blocking capture and input work. Defaults to
+            the event loop's default executor.
+        screenshot_provider: Callable capturing the session's screen.
+            Defaults to get_screenshot.
+        window_title_provider: Callable returning the session's active window
+            title. Defaults to get_active_window_title.
+
+    Example:
+        >>> import asyncio
+        >>> from Windows.async_agent import AsyncWindowsAgent
+        >>>
+        >>> async def main():
+        ...     agents = [AsyncWindowsAgent(model_config) for _ in range(4)]
+        ...     return await asyncio.gather(*(a.run("Open Notepad") for a in agents))
+        >>> asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        model_config: "ModelConfig | None" = None,
+        agent_config: AgentConfig | None = None,
+        confirmation_callback: Callable[[str], bool] | None = None,
+        takeover_callback: Callable[[str], None] | None = None,
+        executor: Executor | None = None,
+        screenshot_provider: Callable[[], Screenshot] | None = None,
+        window_title_provider: Callable[[], str] | None = None,
+    ):
+        super().__init__(
+            model_config=model_config,
+            agent_config=agent_config,
+            confirmation_callback=confirmation_callback,
+            takeover_callback=takeover_callback,
+        )
+        # Capture overlaps with other agents through the executor instead.
+        self._prefetcher = None
+        self._executor = executor
+        self._screenshot_provider = screenshot_provider or get_screenshot
+        self._window_title_provider = window_title_provider or get_active_window_title
+
+    def _create_model_client(self) -> "AsyncModelClient":
+        from Windows.model import AsyncModelClient
+
+        return AsyncModelClient(self.model_config)
+
+    async def run(self, task: str) -> str:
+        """
+        Run the agent to complete a task.
+
+        Args:
+            task: Natural language description of the task.
+
+        Returns:
+            Final message from the agent.
+        """
+        self.reset()
+
+        if self._session is None:
+            return await self._run_task_async(task)
+
+        self._session.start_task(task)
+        message = await self._run_task_async(task)
+        self._session.end_task(message, self._step_count)
+        return message
+
+    async def _run_task_async(self, task: str) -> str:
+        """Run the steps of a task until it finishes or runs out of steps."""
+        if self._trajectory_store is not None:
+            self._recording = []
+            trajectory = await self._in_executor(self._trajectory_store.get, task)
+            if trajectory is not None:
+                result = await self._in_executor(self._replay, trajectory)
+                if result is not None:
+                    return self._finish_run(task, result, replayed=trajectory)
+
+        result = await self._execute_step_async(task, is_first=True)
+
+        if result.finished:
+            return self._finish_run(task, result)
+
+        while self._step_count < self.agent_config.max_steps:
+            if self._cancelled.is_set():
+                return "Task cancelled"
+            result = await self._execute_step_async(is_first=False)
+
+            if result.finished:
+                return self._finish_run(task, result)
+
+        return "Max steps reached"
+
+    async def step(self, task: str | None = None) -> StepResult:
+        """
+        Execute a single step of the agent.
+
+        Args:
+            task: Task description (only needed for first step).
+
+        Returns:
+            StepResult with step details.
+        """
+        is_first = len(self._context) == 0
+
+        if is_first and not task:
+            raise ValueError("Task is required for the first step")
+
+        return await self._execute_step_async(task, is_first)
+
+    async def close(self) -> None:
+        """Close the model client."""
+        await self.model_client.close()
+
+    async def _in_executor(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _execute_step_async(
+        self, user_prompt: str | None = None, is_first: bool = False
+    ) -> StepResult:
+        """Execute a single step of the agent loop without blocking the loop."""
+        self._step_count += 1
+        set_step(self._step_count)
+        deadline = self._step_deadline()
+
+        screenshot, current_window = await asyncio.gather(
+            self._in_executor(self._screenshot_provider),
+            self._in_executor(self._window_title_provider),
+        )
+
+        if self._session is not None:
+            self._session.record_frame(screenshot, current_window, self._step_count)
+        frame_hash = (
+            await self._in_executor(dhash, screenshot.image)
+            if self._recording is not None or self._frame_cache is not None
+            else None
+        )
+
+        cached, hint = self._lookup_frame(frame_hash)
+
+        self._append_observation(
+            screenshot, current_window, user_prompt, is_first, hint
+        )
+
+        if self._session is not None and cached is None:
+            self._session.record_request(self._context, self._step_count)
+        try:
+            self._print_request_banner()
+            with get_tracer().span("model", cached=cached is not None) as span:
+                if cached is not None:
+                    response = cached.response
+                else:
+                    response = await self.model_client.request(
+                        self._context, deadline=deadline
+                    )
+                self._trace_response(span, response)
+        except Exception as e:
+            return self._model_error_result(e)
+
+        action, thinking = self._parse_response(response)
+        if self._session is not None:
+            self._session.record_response(
+                response, self._step_count, cached=cached is not None
+            )
+
+        if self._frame_cache is not None and cached is None:
+            self._frame_cache.add(
+                frame_hash, self._step_count, self._recent_actions(), response
+            )
+        self._action_history.append(response.action)
+
+        offset = (screenshot.offset_x, screenshot.offset_y)
+        try:
+            result = await self._execute_action(action, screenshot, offset)
+        except Exception as e:
+            if self.agent_config.verbose:
+                traceback.print_exc()
+            result = self.action_handler.execute(
+                finish(message=str(e)), screenshot.width, screenshot.height, offset
+            )
+
+        finished = action.get("_metadata") == "finish" or result.should_finish
+        if self._session is not None:
+            self._session.record_action(action, result, self._step_count)
+
+        if frame_hash is not None and result.success:
+            self._record_step(action, frame_hash, current_window)
+
+        return self._complete_step(response, action, thinking, result, finished)
+
+    def _capture_frame(self) -> tuple[Screenshot, str]:
+        """Capture the session's screen; used by trajectory replay."""
+        return self._screenshot_provider(), self._window_title_provider()
+
+    async def _execute_action(
+        self,
+        action: Action,
+        screenshot: Screenshot,
+        offset: tuple[int, int],
+    ) -> ActionResult:
+        """Run an action, awaiting Wait instead of blocking a worker thread."""
+        if action.get("_metadata") == "do" and action.get("action") == "Wait":
+            await asyncio.sleep(self.action_handler.wait_duration(action))
+            return ActionResult(True, False)
+
+        return await self._in_executor(
+            self.action_handler.execute,
+            action,
+            screenshot.width,
+            screenshot.height,
+            offset,
+        )
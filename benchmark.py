@@ -0,0 +1,469 @@
+"""Offline, deterministic benchmark of the agent loop.
+
+Drives ``WindowsAgent.run`` end to end without a desktop or a paid API:
+frames come from the synthetic capture backend, input goes to the recording
+input backend, and the model is a local stub server replaying a scripted
+conversation with fixed latency. Each synthetic frame depends on the number
+of input events so far, so every action visibly changes the screen and the
+settle detector, frame cache and context code see realistic traffic.
+
+Reported metrics: steps per second, per-phase latency percentiles (from
+``Windows.tracing``), bytes uploaded to the model per step and peak RSS.
+Results can be saved as a JSON baseline and later runs compared against it.
+
+``--actions`` runs a micro-benchmark of action parsing and dispatch alone:
+the scripted replies are parsed and executed against the recording input
+backend with the settle wait skipped.
+
+Usage:
+    python -m Windows.benchmark
+    python -m Windows.benchmark --tasks 5 --steps 20 --latency 0.05
+    python -m Windows.benchmark --save-baseline bench.json
+    python -m Windows.benchmark --baseline bench.json --tolerance 0.2
+    python -m Windows.benchmark --actions
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+from Windows.desktop.capture import SyntheticCaptureBackend, set_capture_backend
+from Windows.desktop.input import RecordingInputBackend, set_input_backend
+from Windows.desktop.settle import SettleDetector, SettleResult
+from Windows.model.stub_server import StubModelServer
+from Windows.tracing import Tracer, get_tracer, set_tracer
+
+DEFAULT_SCRIPT = [
+    '思考: 打开开始菜单\n动作: do(action="Hotkey", keys="win")',
+    '思考: 在搜索框输入应用名称\n动作: do(action="Type", text="记事本")',
+    '思考: 双击搜索结果打开应用\n动作: do(action="DoubleTap", element=[500, 300])',
+    '思考: 点击编辑区域\n动作: do(action="Tap", element=[400, 500])',
+    '思考: 向下滚动查看内容\n动作: do(action="Scroll", direction="down", amount=5)',
+    '思考: 拖动选中文字\n动作: do(action="Swipe", start=[200, 400], end=[600, 400])',
+]
+FINISH_REPLY = '思考: 任务已完成\n动作: finish(message="完成")'
+
+# Metrics where a larger value is better; everything else should shrink.
+_HIGHER_IS_BETTER = {"steps_per_sec"}
+# Phase percentiles closer than this (ms) are treated as noise.
+_MIN_PHASE_DELTA_MS = 1.0
+
+
+@dataclass
+class BenchmarkConfig:
+    """Parameters of a benchmark run.
+
+    Attributes:
+        tasks: Number of ``agent.run`` calls.
+        steps: Steps per task; the stub model finishes on the last one.
+        latency: Seconds the stub model waits before answering.
+        chunk_delay: Seconds between streamed chunks of the stub model.
+        screen_size: Synthetic screen size in physical pixels.
+        stream_actions: Use the streaming client with early dispatch.
+        input_latency: Seconds each recorded input call blocks.
+    """
+
+    tasks: int = 3
+    steps: int = 12
+    latency: float = 0.02
+    chunk_delay: float = 0.0
+    screen_size: tuple[int, int] = (1920, 1080)
+    stream_actions: bool = True
+    input_latency: float = 0.0
+
+
+def _scripted_reply(script: list[str], steps: int):
+    """Reply callable answering with the script entry for the current turn."""
+
+    def reply(body: dict[str, Any]) -> str:
+        turn = sum(1 for m in body.get("messages", []) if m.get("role") == "assistant")
+        if turn >= steps - 1:
+            return FINISH_REPLY
+        return script[turn % len(script)]
+
+    return reply
+
+
+def _frame_factory(size: tuple[int, int], recorder: RecordingInputBackend):
+    """Frames that change with every recorded input event."""
+    width, height = size
+    variants = []
+    for i in range(8):
+        gradient = Image.linear_gradient("L")
+        img = Image.merge(
+            "RGB", (gradient, gradient.transpose(Image.Transpose.ROTATE_90), gradient)
+        ).resize(size)
+        draw = ImageDraw.Draw(img)
+        left = width // 10 + i * width // 20
+        draw.rectangle(
+            (left, height // 10, left + width // 3, height // 2), fill=(240, 240, 240)
+        )
+        draw.text((left + 10, height // 10 + 10), f"window {i}", fill=(0, 0, 0))
+        draw.rectangle((0, height - height // 20, width, height), fill=(32, 32, 48))
+        variants.append(img)
+
+    def factory(index: int) -> Image.Image:
+        return variants[len(recorder.events) % len(variants)]
+
+    return factory
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _windows_peak_rss() -> int | None:
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def _percentile(values: list[float], q: float) -> float:
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def phase_stats(tracer: Tracer) -> dict[str, dict[str, float]]:
+    """Count, mean and p50/p95/p99 in milliseconds per traced phase."""
+    durations: dict[str, list[float]] = {}
+    for record in tracer.records():
+        durations.setdefault(record.name, []).append(record.duration * 1000)
+
+    stats = {}
+    for name, values in sorted(durations.items()):
+        values.sort()
+        stats[name] = {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 3),
+            "p50": round(_percentile(values, 50), 3),
+            "p95": round(_percentile(values, 95), 3),
+            "p99": round(_percentile(values, 99), 3),
+        }
+    return stats
+
+
+def run_benchmark(
+    config: BenchmarkConfig | None = None, script: list[str] | None = None
+) -> dict[str, Any]:
+    """
+    Run the agent loop against the offline backends and collect metrics.
+
+    The global capture and input backends are replaced by the offline ones
+    and stay installed afterwards; the global tracer is restored.
+
+    Args:
+        config: Benchmark parameters.
+        script: Model replies cycled through before the final finish.
+
+    Returns:
+        JSON-ready results: parameters, environment and metrics.
+    """
+    from phone_agent.model import ModelConfig
+
+    from Windows.agent import AgentConfig, WindowsAgent
+
+    config = config or BenchmarkConfig()
+    script = script or DEFAULT_SCRIPT
+
+    previous_tracer = get_tracer()
+
+    recorder = RecordingInputBackend(latency=config.input_latency)
+    set_input_backend(recorder)
+    set_capture_backend(
+        SyntheticCaptureBackend(
+            size=config.screen_size,
+            factory=_frame_factory(config.screen_size, recorder),
+            title="Benchmark",
+        )
+    )
+    tracer = Tracer()
+    set_tracer(tracer)
+
+    server = StubModelServer(
+        reply=_scripted_reply(script, config.steps),
+        latency=config.latency,
+        chunk_delay=config.chunk_delay,
+    ).start()
+    try:
+        agent = WindowsAgent(
+            ModelConfig(base_url=server.base_url, model_name="stub"),
+            AgentConfig(
+                max_steps=config.steps,
+                verbose=False,
+                stream_actions=config.stream_actions,
+            ),
+        )
+        steps = 0
+        start = time.perf_counter()
+        for i in range(config.tasks):
+            agent.run(f"benchmark task {i}")
+            steps += agent.step_count
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+        set_tracer(previous_tracer)
+
+    rss = peak_rss_bytes()
+    return {
+        "config": {**asdict(config), "screen_size": list(config.screen_size)},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "metrics": {
+            "steps": steps,
+            "elapsed": round(elapsed, 3),
+            "steps_per_sec": round(steps / elapsed, 3) if elapsed else 0.0,
+            "model_requests": server.requests,
+            "bytes_per_step": round(server.bytes_received / steps) if steps else 0,
+            "peak_rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            "input_events": recorder.counts(),
+            "phases": phase_stats(tracer),
+        },
+    }
+
+
+def _worse(name: str, current: float, baseline: float, tolerance: float) -> bool:
+    if name in _HIGHER_IS_BETTER:
+        return current < baseline * (1 - tolerance)
+    return current > baseline * (1 + tolerance)
+
+
+def compare_results(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.2
+) -> list[str]:
+    """
+    List metrics that regressed relative to a baseline.
+
+    Args:
+        current: Result of ``run_benchmark``.
+        baseline: Earlier result loaded from a baseline file.
+        tolerance: Allowed relative change before a metric counts as a
+            regression.
+
+    Returns:
+        One description per regressed metric; empty when nothing regressed.
+    """
+    regressions = []
+    now, then = current["metrics"], baseline["metrics"]
+
+    for name in ("steps_per_sec", "bytes_per_step", "peak_rss_mb"):
+        if now.get(name) is None or then.get(name) is None:
+            continue
+        if _worse(name, now[name], then[name], tolerance):
+            regressions.append(f"{name}: {then[name]} -> {now[name]}")
+
+    for phase, stats in then.get("phases", {}).items():
+        current_stats = now.get("phases", {}).get(phase)
+        if current_stats is None:
+            continue
+        for q in ("p50", "p95"):
+            if current_stats[q] - stats[q] < _MIN_PHASE_DELTA_MS:
+                continue
+            if _worse(q, current_stats[q], stats[q], tolerance):
+                regressions.append(
+                    f"{phase} {q}: {stats[q]:.2f}ms -> {current_stats[q]:.2f}ms"
+                )
+    return regressions
+
+
+class _InstantSettle(SettleDetector):
+    """Settle detector that reports a settled screen without waiting."""
+
+    minimum_wait = 0.0
+
+    def wait(
+        self, budget: float | None = None, timeout: float | None = None
+    ) -> SettleResult:
+        return SettleResult(settled=True, elapsed=0.0, frames=0, budget=budget or 0.0)
+
+
+def run_action_benchmark(
+    iterations: int = 2000, script: list[str] | None = None
+) -> dict[str, float]:
+    """
+    Micro-benchmark of action parsing and dispatch.
+
+    Args:
+        iterations: Passes over the scripted replies.
+        script: Replies to parse and execute. Defaults to DEFAULT_SCRIPT plus
+            FINISH_REPLY.
+
+    Returns:
+        Microseconds per parse and per execute, and bytes retained by each
+        parsed action.
+    """
+    from Windows.actions.handler import ActionHandler, parse_action
+
+    replies = [*(script or DEFAULT_SCRIPT), FINISH_REPLY]
+    recorder = set_input_backend(RecordingInputBackend())
+    handler = ActionHandler(settle_detector=_InstantSettle())
+    count = iterations * len(replies)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for reply in replies:
+            parse_action(reply)
+    parse_us = (time.perf_counter() - start) / count * 1e6
+
+    actions = [parse_action(reply) for reply in replies]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for action in actions:
+            handler.execute(action, 1920, 1080)
+        recorder.clear()
+    execute_us = (time.perf_counter() - start) / count * 1e6
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [parse_action(reply) for _ in range(100) for reply in replies]
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "parse_us": round(parse_us, 2),
+        "execute_us": round(execute_us, 2),
+        "bytes_per_action": round(retained / len(kept)),
+    }
+
+
+def format_action_results(result: dict[str, float]) -> str:
+    """Human-readable summary of an action micro-benchmark."""
+    return (
+        f"parse: {result['parse_us']:.2f}us/action, "
+        f"execute: {result['execute_us']:.2f}us/action, "
+        f"retained: {result['bytes_per_action']} B/action"
+    )
+
+
+def format_results(result: dict[str, Any]) -> str:
+    """Human-readable summary of a benchmark result."""
+    metrics = result["metrics"]
+    lines = [
+        f"steps: {metrics['steps']} in {metrics['elapsed']:.2f}s "
+        f"({metrics['steps_per_sec']:.2f} steps/s)",
+        f"model requests: {metrics['model_requests']}, "
+        f"uploaded per step: {metrics['bytes_per_step'] / 1024:.1f} KiB",
+        f"peak RSS: {metrics['peak_rss_mb']} MiB",
+        f"input events: {metrics['input_events']}",
+        "",
+        f"{'phase':<16}{'count':>7}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}",
+    ]
+    for name, stats in metrics["phases"].items():
+        lines.append(
+            f"{name:<16}{stats['count']:>7}{stats['mean']:>10.2f}"
+            f"{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "BenchmarkConfig",
+    "DEFAULT_SCRIPT",
+    "compare_results",
+    "format_action_results",
+    "format_results",
+    "peak_rss_bytes",
+    "phase_stats",
+    "run_action_benchmark",
+    "run_benchmark",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline agent loop benchmark")
+    parser.add_argument("--tasks", type=int, default=BenchmarkConfig.tasks)
+    parser.add_argument("--steps", type=int, default=BenchmarkConfig.steps)
+    parser.add_argument("--latency", type=float, default=BenchmarkConfig.latency)
+    parser.add_argument("--chunk-delay", type=float, default=BenchmarkConfig.chunk_delay)
+    parser.add_argument("--width", type=int, default=BenchmarkConfig.screen_size[0])
+    parser.add_argument("--height", type=int, default=BenchmarkConfig.screen_size[1])
+    parser.add_argument(
+        "--no-stream", action="store_true", help="use the non-streaming client"
+    )
+    parser.add_argument("--output", help="write the result as JSON")
+    parser.add_argument("--save-baseline", help="write the result as a baseline")
+    parser.add_argument("--baseline", help="compare against a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--actions", action="store_true", help="micro-benchmark parse and dispatch"
+    )
+    args = parser.parse_args()
+
+    if args.actions:
+        print(format_action_results(run_action_benchmark()))
+        return
+
+    config = BenchmarkConfig(
+        tasks=args.tasks,
+        steps=args.steps,
+        latency=args.latency,
+        chunk_delay=args.chunk_delay,
+        screen_size=(args.width, args.height),
+        stream_actions=not args.no_stream,
+    )
+    result = run_benchmark(config)
+    print(format_results(result))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != result["config"]:
+            print("\n⚠️ Baseline was recorded with different parameters")
+        regressions = compare_results(result, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,24 @@
 """Configuration module for Windows desktop automation."""
 
-from Windows.config.prompts import SYSTEM_PROMPT
+from Windows.config.http import (
+    HTTP_CONFIG,
+    HttpClientConfig,
+    RouterConfig,
+    get_http_config,
+    update_http_config,
+)
+from Windows.config.plan import PlanConfig
+from Windows.config.prompts import SYSTEM_PROMPT, render_system_prompt
+from Windows.config.screenshot import (
+    SCREENSHOT_CONFIG,
+    ScreenshotConfig,
+    get_screenshot_config,
+    update_screenshot_config,
+)
 from Windows.config.timing import (
     DeviceTimingConfig,
     KeyboardTimingConfig,
+    SettleTimingConfig,
     TimingConfig,
     TIMING_CONFIG,
     get_timing_config,
@@ -13,7 +28,7 @@ from Windows.config.timing import (
 
 def get_system_prompt(lang: str = "cn") -> str:
     """
-    Get system prompt by language.
+    Get system prompt by language, dated today.
 
     Args:
         lang: Language code, 'cn' for Chinese, 'en' for English.
@@ -21,14 +36,26 @@ def get_system_prompt(lang: str = "cn") -> str:
     Returns:
         System prompt string.
     """
-    return SYSTEM_PROMPT
+    return render_system_prompt()
 
 
 __all__ = [
     "SYSTEM_PROMPT",
     "get_system_prompt",
+    "render_system_prompt",
+    "HttpClientConfig",
+    "RouterConfig",
+    "HTTP_CONFIG",
+    "get_http_config",
+    "update_http_config",
+    "PlanConfig",
+    "ScreenshotConfig",
+    "SCREENSHOT_CONFIG",
+    "get_screenshot_config",
+    "update_screenshot_config",
     "DeviceTimingConfig",
     "KeyboardTimingConfig",
+    "SettleTimingConfig",
     "TimingConfig",
     "TIMING_CONFIG",
     "get_timing_config",
@@ -0,0 +1,131 @@
+"""HTTP connection pool and retry configuration for model requests.
+
+Users can customize these values by modifying this file or by setting
+environment variables.
+"""
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class HttpClientConfig:
+    """Configuration for pooled model HTTP clients.
+
+    Attributes:
+        max_connections: Maximum concurrent connections per endpoint.
+        max_keepalive_connections: Idle connections kept open per endpoint.
+        keepalive_expiry: Seconds an idle connection is kept alive.
+        connect_timeout: Seconds allowed to establish a connection.
+        read_timeout: Seconds allowed per request (including streaming).
+        max_retries: Retries after a retryable error (429, 5xx, timeouts
+            and connection errors).
+        backoff_base: Base delay of the exponential backoff in seconds.
+        backoff_max: Maximum delay between two attempts in seconds.
+    """
+
+    max_connections: int = 8
+    max_keepalive_connections: int = 8
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 120.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.max_connections = int(
+            os.getenv("WINDOWS_HTTP_MAX_CONNECTIONS", self.max_connections)
+        )
+        self.max_keepalive_connections = int(
+            os.getenv("WINDOWS_HTTP_MAX_KEEPALIVE", self.max_keepalive_connections)
+        )
+        self.keepalive_expiry = float(
+            os.getenv("WINDOWS_HTTP_KEEPALIVE_EXPIRY", self.keepalive_expiry)
+        )
+        self.connect_timeout = float(
+            os.getenv("WINDOWS_HTTP_CONNECT_TIMEOUT", self.connect_timeout)
+        )
+        self.read_timeout = float(
+            os.getenv("WINDOWS_HTTP_READ_TIMEOUT", self.read_timeout)
+        )
+        self.max_retries = int(os.getenv("WINDOWS_HTTP_MAX_RETRIES", self.max_retries))
+        self.backoff_base = float(
+            os.getenv("WINDOWS_HTTP_BACKOFF_BASE", self.backoff_base)
+        )
+        self.backoff_max = float(
+            os.getenv("WINDOWS_HTTP_BACKOFF_MAX", self.backoff_max)
+        )
+
+
+@dataclass
+class RouterConfig:
+    """Configuration for hedged routing across model endpoints.
+
+    Attributes:
+        hedge: Send a duplicate request to another endpoint when the first
+            one is slower than its p95 latency.
+        hedge_delay: Hedge delay in seconds used until an endpoint has
+            ``min_samples`` latency samples.
+        min_samples: Samples needed before an endpoint's own p95 is used.
+        max_hedges: Maximum duplicate requests per call.
+        window: Latency samples kept per endpoint.
+    """
+
+    hedge: bool = True
+    hedge_delay: float = 3.0
+    min_samples: int = 10
+    max_hedges: int = 1
+    window: int = 200
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.hedge = os.getenv(
+            "WINDOWS_ROUTER_HEDGE", str(int(self.hedge))
+        ).lower() not in ("0", "false", "no")
+        self.hedge_delay = float(
+            os.getenv("WINDOWS_ROUTER_HEDGE_DELAY", self.hedge_delay)
+        )
+        self.max_hedges = int(os.getenv("WINDOWS_ROUTER_MAX_HEDGES", self.max_hedges))
+
+
+# Default HTTP client configuration
+HTTP_CONFIG = HttpClientConfig()
+
+
+def get_http_config() -> HttpClientConfig:
+    """
+    Get the global HTTP client configuration.
+
+    Returns:
+        The global HTTP client configuration.
+    """
+    return HTTP_CONFIG
+
+
+def update_http_config(config: HttpClientConfig) -> None:
+    """
+    Replace the global HTTP client configuration.
+
+    Clients already pooled keep their limits; call
+    ``Windows.model.pool.close_http_clients`` to rebuild them.
+
+    Args:
+        config: New HTTP client configuration.
+
+    Example:
+        >>> from Windows.config import HttpClientConfig, update_http_config
+        >>> update_http_config(HttpClientConfig(max_retries=5))
+    """
+    global HTTP_CONFIG
+    HTTP_CONFIG = config
+
+
+__all__ = [
+    "HttpClientConfig",
+    "RouterConfig",
+    "HTTP_CONFIG",
+    "get_http_config",
+    "update_http_config",
+]
@@ -0,0 +1,50 @@
+"""Multi-action plan configuration.
+
+Users can customize these values by modifying this file or by setting
+environment variables.
+"""
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class PlanConfig:
+    """Configuration for running several actions from one model reply.
+
+    Attributes:
+        max_actions: Actions of a plan that are run; the rest are skipped
+            and reported to the model. 0 for no limit.
+        change_threshold: Fraction of the screen an action may change before
+            the rest of the plan is skipped. 0 disables the check, and with
+            it the thumbnail grabbed before each action.
+        pixel_threshold: Gray level difference for a pixel to count as
+            changed.
+        thumbnail_factor: Downscale factor of the compared thumbnails.
+    """
+
+    max_actions: int = 5
+    change_threshold: float = 0.3
+    pixel_threshold: int = 16
+    thumbnail_factor: int = 8
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.max_actions = int(os.getenv("WINDOWS_PLAN_MAX_ACTIONS", self.max_actions))
+        self.change_threshold = float(
+            os.getenv("WINDOWS_PLAN_CHANGE_THRESHOLD", self.change_threshold)
+        )
+        self.pixel_threshold = int(
+            os.getenv("WINDOWS_PLAN_PIXEL_THRESHOLD", self.pixel_threshold)
+        )
+        self.thumbnail_factor = int(
+            os.getenv("WINDOWS_PLAN_THUMBNAIL_FACTOR", self.thumbnail_factor)
+        )
+
+    @property
+    def check_changes(self) -> bool:
+        """Whether screen changes between plan actions are checked."""
+        return self.change_threshold > 0
+
+
+__all__ = ["PlanConfig"]
@@ -1,14 +1,8 @@
 """System prompts for the Windows desktop agent."""
 
-from datetime import datetime
+from datetime import date
 
-today = datetime.today()
-formatted_date = today.strftime("%Y年%m月%d日")
-
-SYSTEM_PROMPT = (
-    "今天的日期是: "
-    + formatted_date
-    + """
+SYSTEM_PROMPT_BODY = """
 你是一个Windows桌面智能体，根据屏幕截图执行操作完成任务。
 
 【输出格式 - 必须严格遵守】
@@ -32,6 +26,12 @@ SYSTEM_PROMPT = (
 - do(action="Wait", duration="2 seconds") - 等待
 - do(action="Take_over", message="需要用户协助") - 用户接管
 
+【连续操作】
+- 当后续几步的界面变化完全可以预见时（如：点击搜索框、输入内容、按回车），可以在一次回复中按顺序输出多个动作，每行一个do(...)，最多5个
+- 多个动作会依次执行；如果中途画面发生意外的大幅变化，剩余动作会被跳过，并返回新的截图
+- finish(...)必须单独输出，不要与其他动作放在一起
+- 无法确定下一步界面时，只输出一个动作
+
 【坐标系统】
 - 屏幕坐标范围：左上角(0,0)到右下角(999,999)
 - 屏幕中心：(500,500)
@@ -61,7 +61,30 @@ SYSTEM_PROMPT = (
 思考: 搜索框已激活，输入搜索关键词
 动作: do(action="Type", text="飞驰人生3")
 
+思考: 需要在搜索框中搜索，界面变化可以预见，连续执行点击、输入和回车
+动作: do(action="Tap", element=[500, 200])
+do(action="Type", text="飞驰人生3")
+do(action="Hotkey", keys="enter")
+
 思考: 任务已完成，成功找到了飞驰人生3的场次信息
 动作: finish(message="已成功在淘票票搜索飞驰人生3并查看场次信息")
 """
-)
+
+
+def render_system_prompt(today: date | None = None) -> str:
+    """
+    Render the system prompt for a task.
+
+    Args:
+        today: Date stated in the prompt. Defaults to the current date.
+
+    Returns:
+        System prompt string.
+    """
+    today = today or date.today()
+    return "今天的日期是: " + today.strftime("%Y年%m月%d日") + SYSTEM_PROMPT_BODY
+
+
+# Rendered at import; long-running processes should call
+# render_system_prompt() so the date stays current.
+SYSTEM_PROMPT = render_system_prompt()
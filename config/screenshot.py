@@ -0,0 +1,97 @@
+"""Screenshot encoding configuration for Windows desktop automation.
+
+This module defines how captured frames are resized and encoded before they
+are sent to the model. Users can customize these values by modifying this
+file or by setting environment variables.
+"""
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class ScreenshotConfig:
+    """Configuration for the screenshot resize and encoding pipeline.
+
+    Attributes:
+        format: Image codec, one of "png", "jpeg" or "webp".
+        quality: Lossy quality (1-100) for JPEG and WebP.
+        resample: Resample filter name ("nearest", "box", "bilinear",
+            "hamming", "bicubic" or "lanczos").
+        max_long_edge: Maximum size of the longest image edge in pixels.
+            0 keeps the logical screen resolution.
+        png_compress_level: zlib compression level (0-9) for PNG.
+        webp_method: WebP encoder effort (0 fastest - 6 smallest).
+        capture_mode: "screen" for the full desktop or "active_window" to
+            crop to the foreground window.
+        window_margin: Extra logical pixels kept around the foreground
+            window in "active_window" mode.
+    """
+
+    format: str = "png"
+    quality: int = 85
+    resample: str = "lanczos"
+    max_long_edge: int = 0
+    png_compress_level: int = 6
+    webp_method: int = 4
+    capture_mode: str = "screen"
+    window_margin: int = 16
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.format = os.getenv("WINDOWS_SCREENSHOT_FORMAT", self.format).lower()
+        self.quality = int(os.getenv("WINDOWS_SCREENSHOT_QUALITY", self.quality))
+        self.resample = os.getenv("WINDOWS_SCREENSHOT_RESAMPLE", self.resample).lower()
+        self.max_long_edge = int(
+            os.getenv("WINDOWS_SCREENSHOT_MAX_LONG_EDGE", self.max_long_edge)
+        )
+        self.png_compress_level = int(
+            os.getenv("WINDOWS_SCREENSHOT_PNG_COMPRESS_LEVEL", self.png_compress_level)
+        )
+        self.webp_method = int(
+            os.getenv("WINDOWS_SCREENSHOT_WEBP_METHOD", self.webp_method)
+        )
+        self.capture_mode = os.getenv(
+            "WINDOWS_CAPTURE_MODE", self.capture_mode
+        ).lower()
+        self.window_margin = int(
+            os.getenv("WINDOWS_CAPTURE_MARGIN", self.window_margin)
+        )
+
+
+SCREENSHOT_CONFIG = ScreenshotConfig()
+
+
+def get_screenshot_config() -> ScreenshotConfig:
+    """
+    Get the global screenshot configuration.
+
+    Returns:
+        The global ScreenshotConfig instance.
+    """
+    return SCREENSHOT_CONFIG
+
+
+def update_screenshot_config(config: ScreenshotConfig) -> None:
+    """
+    Replace the global screenshot configuration.
+
+    Args:
+        config: New screenshot configuration.
+
+    Example:
+        >>> from Windows.config.screenshot import update_screenshot_config, ScreenshotConfig
+        >>> update_screenshot_config(
+        ...     ScreenshotConfig(format="jpeg", quality=80, max_long_edge=1280)
+        ... )
+    """
+    global SCREENSHOT_CONFIG
+    SCREENSHOT_CONFIG = config
+
+
+__all__ = [
+    "ScreenshotConfig",
+    "SCREENSHOT_CONFIG",
+    "get_screenshot_config",
+    "update_screenshot_config",
+]
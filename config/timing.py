@@ -54,17 +54,62 @@ class DeviceTimingConfig:
         )
 
 
+@dataclass
+class SettleTimingConfig:
+    """Configuration for visual settle detection after actions.
+
+    When enabled, the fixed post-action delays are replaced by sampling
+    low-resolution frames until the screen stops changing.
+    """
+
+    enabled: bool = True
+    min_delay: float = 0.05
+    sample_interval: float = 0.05
+    stable_frames: int = 3
+    max_timeout: float = 2.0
+    thumbnail_factor: int = 8
+    pixel_threshold: int = 16
+    change_threshold: float = 0.002
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.enabled = os.getenv(
+            "WINDOWS_SETTLE_ENABLED", str(int(self.enabled))
+        ).lower() not in ("0", "false", "no")
+        self.min_delay = float(os.getenv("WINDOWS_SETTLE_MIN_DELAY", self.min_delay))
+        self.sample_interval = float(
+            os.getenv("WINDOWS_SETTLE_INTERVAL", self.sample_interval)
+        )
+        self.stable_frames = int(
+            os.getenv("WINDOWS_SETTLE_STABLE_FRAMES", self.stable_frames)
+        )
+        self.max_timeout = float(
+            os.getenv("WINDOWS_SETTLE_TIMEOUT", self.max_timeout)
+        )
+        self.thumbnail_factor = int(
+            os.getenv("WINDOWS_SETTLE_THUMBNAIL_FACTOR", self.thumbnail_factor)
+        )
+        self.pixel_threshold = int(
+            os.getenv("WINDOWS_SETTLE_PIXEL_THRESHOLD", self.pixel_threshold)
+        )
+        self.change_threshold = float(
+            os.getenv("WINDOWS_SETTLE_CHANGE_THRESHOLD", self.change_threshold)
+        )
+
+
 @dataclass
 class TimingConfig:
     """Master timing configuration combining all timing settings."""
 
     keyboard: KeyboardTimingConfig
     device: DeviceTimingConfig
+    settle: SettleTimingConfig
 
     def __init__(self):
         """Initialize all timing configurations."""
         self.keyboard = KeyboardTimingConfig()
         self.device = DeviceTimingConfig()
+        self.settle = SettleTimingConfig()
 
 
 TIMING_CONFIG = TimingConfig()
@@ -83,6 +128,7 @@ def get_timing_config() -> TimingConfig:
 def update_timing_config(
     keyboard: KeyboardTimingConfig | None = None,
     device: DeviceTimingConfig | None = None,
+    settle: SettleTimingConfig | None = None,
 ) -> None:
     """
     Update the global timing configuration.
@@ -90,6 +136,7 @@ def update_timing_config(
     Args:
         keyboard: New keyboard timing configuration.
         device: New device timing configuration.
+        settle: New settle detection configuration.
 
     Example:
         >>> from Windows.config.timing import update_timing_config, KeyboardTimingConfig
@@ -104,11 +151,14 @@ def update_timing_config(
         TIMING_CONFIG.keyboard = keyboard
     if device is not None:
         TIMING_CONFIG.device = device
+    if settle is not None:
+        TIMING_CONFIG.settle = settle
 
 
 __all__ = [
     "KeyboardTimingConfig",
     "DeviceTimingConfig",
+    "SettleTimingConfig",
     "TimingConfig",
     "TIMING_CONFIG",
     "get_timing_config",
@@ -0,0 +1,225 @@
+"""Token-budgeted conversation context management for long tasks.
+
+Every step appends a screen-info user message and a full assistant message,
+so without management the prompt grows with the task length. The context
+manager compacts the conversation in place before each request:
+
+- The system prompt and the task text form a stable prefix that is never
+  rewritten, so server-side prompt caching keeps hitting. The rolling
+  summary, if any, is attached after the task text.
+- Thinking text is dropped from all but the most recent assistant turns.
+- Only the last turns are kept; older turns are evicted in batches (so the
+  cached prefix only shifts every few steps) and, optionally, folded into a
+  rolling summary of the actions taken so far.
+- If the estimated token count still exceeds the budget, further turns are
+  evicted, always keeping the latest one.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable
+
+Message = dict[str, Any]
+Summarizer = Callable[[list[Message], str], str]
+
+SUMMARY_HEADER = "** 历史操作摘要 **"
+
+_THINK_RE = re.compile(r"<think_tag>.*?</think_tag>\n?", re.DOTALL)
+_ANSWER_RE = re.compile(r"<answer>(.*?)</answer>", re.DOTALL)
+
+
+@dataclass
+class ContextConfig:
+    """Configuration for context compaction.
+
+    Attributes:
+        token_budget: Maximum estimated prompt tokens sent per request.
+        max_turns: Maximum completed turns (assistant reply + following
+            screen message) kept after the prefix.
+        evict_turns: Turns evicted at once when ``max_turns`` is exceeded.
+        keep_thinking_turns: Most recent assistant turns that keep their
+            thinking text.
+        summarize: Fold evicted turns into a rolling summary.
+        max_summary_lines: Maximum lines kept in the rolling summary.
+        image_tokens: Estimated tokens per image part.
+    """
+
+    token_budget: int = 24000
+    max_turns: int = 12
+    evict_turns: int = 4
+    keep_thinking_turns: int = 1
+    summarize: bool = True
+    max_summary_lines: int = 30
+    image_tokens: int = 1200
+
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text locally.
+
+    CJK characters count as roughly one token each and other text as roughly
+    four characters per token, which is close enough for budgeting.
+
+    Args:
+        text: Text to estimate.
+
+    Returns:
+        Estimated number of tokens.
+    """
+    wide = sum(1 for ch in text if ord(ch) > 0x2E7F)
+    return wide + (len(text) - wide + 3) // 4
+
+
+def estimate_tokens(messages: list[Message], image_tokens: int = 1200) -> int:
+    """
+    Estimate the prompt tokens of a message list.
+
+    Args:
+        messages: Messages in OpenAI chat format.
+        image_tokens: Estimated tokens per image part.
+
+    Returns:
+        Estimated number of tokens.
+    """
+    total = 0
+    for message in messages:
+        total += 4
+        content = message.get("content")
+        if isinstance(content, str):
+            total += estimate_text_tokens(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                total += estimate_text_tokens(part.get("text", ""))
+            else:
+                total += image_tokens
+    return total
+
+
+def summarize_actions(evicted: list[Message], summary: str) -> str:
+    """
+    Default local summarizer: append the evicted turns' actions.
+
+    Args:
+        evicted: Messages removed from the context, oldest first.
+        summary: Previous summary text (may be empty).
+
+    Returns:
+        Updated summary text.
+    """
+    lines = summary.splitlines() if summary else []
+    for message in evicted:
+        if message.get("role") != "assistant":
+            continue
+        content = message.get("content")
+        if not isinstance(content, str):
+            continue
+        match = _ANSWER_RE.search(content)
+        action = (match.group(1) if match else content).strip()
+        if action:
+            lines.append(f"- {action}")
+    return "\n".join(lines)
+
+
+class ContextManager:
+    """
+    Keeps the agent conversation within a token budget.
+
+    Args:
+        config: Compaction settings.
+        summarizer: Callable folding evicted messages into the rolling
+            summary. Defaults to summarize_actions (no model call).
+    """
+
+    def __init__(
+        self,
+        config: ContextConfig | None = None,
+        summarizer: Summarizer | None = None,
+    ):
+        self.config = config or ContextConfig()
+        self.summarizer = summarizer or summarize_actions
+        self.summary = ""
+
+    def reset(self) -> None:
+        """Forget the rolling summary for a new task."""
+        self.summary = ""
+
+    def compact(self, context: list[Message]) -> None:
+        """
+        Compact the context in place.
+
+        Expects ``[system, task, assistant, user, ..., user]`` as built by
+        WindowsAgent; the first two messages are the stable prefix.
+
+        Args:
+            context: Conversation messages, modified in place.
+        """
+        if len(context) < 4:
+            return
+
+        self._strip_old_thinking(context)
+
+        # Completed turns are (assistant, user) pairs after the prefix.
+        turns = (len(context) - 2) // 2
+        evict = 0
+        if turns > self.config.max_turns:
+            evict = max(turns - self.config.max_turns, self.config.evict_turns)
+        evict = min(evict, turns - 1)
+
+        budget = self.config.token_budget
+        while evict < turns - 1 and self._estimate(context, evict) > budget:
+            evict += 1
+
+        if evict <= 0:
+            return
+
+        evicted = context[2 : 2 + 2 * evict]
+        del context[2 : 2 + 2 * evict]
+
+        if self.config.summarize:
+            self.summary = self.summarizer(evicted, self.summary)
+            lines = self.summary.splitlines()
+            if len(lines) > self.config.max_summary_lines:
+                self.summary = "\n".join(lines[-self.config.max_summary_lines :])
+            context[1] = self._with_summary(context[1])
+
+    def _estimate(self, context: list[Message], evict: int) -> int:
+        kept = context[:2] + context[2 + 2 * evict :]
+        return estimate_tokens(kept, self.config.image_tokens)
+
+    def _strip_old_thinking(self, context: list[Message]) -> None:
+        assistant_indices = [
+            i for i, m in enumerate(context) if m.get("role") == "assistant"
+        ]
+        keep = self.config.keep_thinking_turns
+        older = assistant_indices[:-keep] if keep > 0 else assistant_indices
+        for i in older:
+            content = context[i].get("content")
+            if isinstance(content, str) and "<think_tag>" in content:
+                context[i] = {**context[i], "content": _THINK_RE.sub("", content)}
+
+    def _with_summary(self, message: Message) -> Message:
+        """Attach the rolling summary as the last text part of the task message."""
+        content = message.get("content")
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        parts = [
+            part
+            for part in content
+            if not (
+                part.get("type") == "text"
+                and part.get("text", "").startswith(SUMMARY_HEADER)
+            )
+        ]
+        if self.summary:
+            parts.append({"type": "text", "text": f"{SUMMARY_HEADER}\n{self.summary}"})
+        return {**message, "content": parts}
+
+
+__all__ = [
+    "ContextConfig",
+    "ContextManager",
+    "estimate_tokens",
+    "estimate_text_tokens",
+    "summarize_actions",
+]
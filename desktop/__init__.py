@@ -1,23 +1,119 @@
 """Desktop automation module for Windows."""
 
-from Windows.desktop.keyboard import (
-    hotkey,
-    press,
-    type_text,
-)
-from Windows.desktop.mouse import (
-    convert_relative_to_absolute,
-    double_tap,
-    right_click,
-    scroll,
-    swipe,
-    tap,
-)
-from Windows.desktop.screenshot import (
-    Screenshot,
-    get_active_window_title,
-    get_screenshot,
-)
+from typing import TYPE_CHECKING
+
+from Windows._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from Windows.desktop.capture import (
+        CaptureBackend,
+        FileCaptureBackend,
+        ImageGrabBackend,
+        PersistentGDIBackend,
+        SyntheticCaptureBackend,
+        get_capture_backend,
+        set_capture_backend,
+    )
+    from Windows.desktop.display import (
+        DisplayGeometry,
+        Monitor,
+        enable_dpi_awareness,
+        get_display_geometry,
+        get_dpi_scale,
+        invalidate_display_geometry,
+        set_display_geometry,
+    )
+    from Windows.desktop.imagehash import dhash, hamming_distance, hamming_distances
+    from Windows.desktop.input import (
+        InputBackend,
+        PyAutoGUIInputBackend,
+        RecordingInputBackend,
+        get_input_backend,
+        set_input_backend,
+    )
+    from Windows.desktop.keyboard import (
+        hotkey,
+        press,
+        type_text,
+    )
+    from Windows.desktop.mouse import (
+        convert_relative_to_absolute,
+        double_tap,
+        right_click,
+        scroll,
+        swipe,
+        tap,
+    )
+    from Windows.desktop.prefetch import (
+        Frame,
+        FramePrefetcher,
+    )
+    from Windows.desktop.screenshot import (
+        Screenshot,
+        get_active_window_rect,
+        get_active_window_title,
+        get_screenshot,
+        register_encoder,
+    )
+    from Windows.desktop.settle import (
+        SettleDetector,
+        SettleResult,
+        frame_change_ratio,
+        grab_thumbnail,
+    )
+    from Windows.desktop.sendinput import SendInputBackend
+    from Windows.desktop.x11 import X11CaptureBackend, X11InputBackend, XvfbDisplay
+
+_EXPORTS = {
+    "CaptureBackend": "Windows.desktop.capture",
+    "FileCaptureBackend": "Windows.desktop.capture",
+    "ImageGrabBackend": "Windows.desktop.capture",
+    "PersistentGDIBackend": "Windows.desktop.capture",
+    "SyntheticCaptureBackend": "Windows.desktop.capture",
+    "get_capture_backend": "Windows.desktop.capture",
+    "set_capture_backend": "Windows.desktop.capture",
+    "DisplayGeometry": "Windows.desktop.display",
+    "Monitor": "Windows.desktop.display",
+    "get_display_geometry": "Windows.desktop.display",
+    "get_dpi_scale": "Windows.desktop.display",
+    "invalidate_display_geometry": "Windows.desktop.display",
+    "enable_dpi_awareness": "Windows.desktop.display",
+    "set_display_geometry": "Windows.desktop.display",
+    "dhash": "Windows.desktop.imagehash",
+    "hamming_distance": "Windows.desktop.imagehash",
+    "hamming_distances": "Windows.desktop.imagehash",
+    "InputBackend": "Windows.desktop.input",
+    "PyAutoGUIInputBackend": "Windows.desktop.input",
+    "RecordingInputBackend": "Windows.desktop.input",
+    "get_input_backend": "Windows.desktop.input",
+    "set_input_backend": "Windows.desktop.input",
+    "hotkey": "Windows.desktop.keyboard",
+    "press": "Windows.desktop.keyboard",
+    "type_text": "Windows.desktop.keyboard",
+    "convert_relative_to_absolute": "Windows.desktop.mouse",
+    "double_tap": "Windows.desktop.mouse",
+    "right_click": "Windows.desktop.mouse",
+    "scroll": "Windows.desktop.mouse",
+    "swipe": "Windows.desktop.mouse",
+    "tap": "Windows.desktop.mouse",
+    "Frame": "Windows.desktop.prefetch",
+    "FramePrefetcher": "Windows.desktop.prefetch",
+    "Screenshot": "Windows.desktop.screenshot",
+    "get_active_window_rect": "Windows.desktop.screenshot",
+    "get_active_window_title": "Windows.desktop.screenshot",
+    "get_screenshot": "Windows.desktop.screenshot",
+    "register_encoder": "Windows.desktop.screenshot",
+    "SettleDetector": "Windows.desktop.settle",
+    "SettleResult": "Windows.desktop.settle",
+    "frame_change_ratio": "Windows.desktop.settle",
+    "grab_thumbnail": "Windows.desktop.settle",
+    "SendInputBackend": "Windows.desktop.sendinput",
+    "X11CaptureBackend": "Windows.desktop.x11",
+    "X11InputBackend": "Windows.desktop.x11",
+    "XvfbDisplay": "Windows.desktop.x11",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "type_text",
@@ -32,4 +128,38 @@ __all__ = [
     "Screenshot",
     "get_screenshot",
     "get_active_window_title",
+    "get_active_window_rect",
+    "register_encoder",
+    "SettleDetector",
+    "SettleResult",
+    "frame_change_ratio",
+    "grab_thumbnail",
+    "CaptureBackend",
+    "ImageGrabBackend",
+    "PersistentGDIBackend",
+    "FileCaptureBackend",
+    "SyntheticCaptureBackend",
+    "get_capture_backend",
+    "set_capture_backend",
+    "InputBackend",
+    "PyAutoGUIInputBackend",
+    "RecordingInputBackend",
+    "SendInputBackend",
+    "get_input_backend",
+    "set_input_backend",
+    "X11CaptureBackend",
+    "X11InputBackend",
+    "XvfbDisplay",
+    "Frame",
+    "FramePrefetcher",
+    "DisplayGeometry",
+    "Monitor",
+    "get_display_geometry",
+    "get_dpi_scale",
+    "invalidate_display_geometry",
+    "enable_dpi_awareness",
+    "set_display_geometry",
+    "dhash",
+    "hamming_distance",
+    "hamming_distances",
 ]
@@ -0,0 +1,546 @@
+"""Screen capture backends for Windows desktop automation.
+
+``get_screenshot`` and the settle detector grab frames through a
+``CaptureBackend`` so the capture strategy can be swapped without touching
+the encoding pipeline:
+
+- ``ImageGrabBackend``: ``PIL.ImageGrab.grab()``, the original behavior.
+- ``PersistentGDIBackend``: keeps a screen DC, memory DC and DIB section
+  alive between grabs and only BitBlts into the reused buffer.
+- ``FileCaptureBackend``: replays image files, for headless runs.
+- ``SyntheticCaptureBackend``: generates frames in memory, for headless runs.
+- ``X11CaptureBackend`` (``desktop/x11.py``): MIT-SHM grabs of an X display
+  such as Xvfb, for Linux workers.
+"""
+
+import ctypes
+import itertools
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+from PIL import Image, ImageDraw, ImageGrab
+
+from Windows.desktop.display import enable_dpi_awareness, invalidate_display_geometry
+
+BBox = tuple[int, int, int, int]
+
+
+class CaptureBackend(ABC):
+    """Interface for objects that capture desktop frames."""
+
+    name: str = "base"
+
+    @abstractmethod
+    def grab(self, bbox: BBox | None = None) -> Image.Image:
+        """
+        Capture a frame in physical pixels.
+
+        Args:
+            bbox: Optional (left, top, right, bottom) region to capture.
+
+        Returns:
+            RGB PIL image of the captured region.
+        """
+
+    def window_title(self) -> str:
+        """
+        Title of the foreground window on the captured desktop.
+
+        Returns:
+            The window title, or an empty string if it cannot be read.
+        """
+        return _win32_window_title()
+
+    def window_rect(self) -> BBox | None:
+        """
+        Rectangle of the foreground window on the captured desktop.
+
+        Returns:
+            (left, top, right, bottom) in physical pixels, or None.
+        """
+        return _win32_window_rect()
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+    def __enter__(self) -> "CaptureBackend":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _win32_window_title() -> str:
+    try:
+        import win32gui
+
+        hwnd = win32gui.GetForegroundWindow()
+        if hwnd:
+            return win32gui.GetWindowText(hwnd)
+    except ImportError:
+        print("Note: pywin32 not installed. Install: pip install pywin32")
+    except Exception as e:
+        print(f"Error getting active window title: {e}")
+
+    return ""
+
+
+def _win32_window_rect() -> BBox | None:
+    try:
+        import win32gui
+
+        hwnd = win32gui.GetForegroundWindow()
+        if hwnd and not win32gui.IsIconic(hwnd):
+            return win32gui.GetWindowRect(hwnd)
+    except ImportError:
+        print("Note: pywin32 not installed. Install: pip install pywin32")
+    except Exception as e:
+        print(f"Error getting active window rect: {e}")
+
+    return None
+
+
+class ImageGrabBackend(CaptureBackend):
+    """Capture backend using PIL.ImageGrab, one device context per grab."""
+
+    name = "imagegrab"
+
+    def grab(self, bbox: BBox | None = None) -> Image.Image:
+        return ImageGrab.grab(bbox=bbox)
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.c_uint32),
+        ("biWidth", ctypes.c_int32),
+        ("biHeight", ctypes.c_int32),
+        ("biPlanes", ctypes.c_uint16),
+        ("biBitCount", ctypes.c_uint16),
+        ("biCompression", ctypes.c_uint32),
+        ("biSizeImage", ctypes.c_uint32),
+        ("biXPelsPerMeter", ctypes.c_int32),
+        ("biYPelsPerMeter", ctypes.c_int32),
+        ("biClrUsed", ctypes.c_uint32),
+        ("biClrImportant", ctypes.c_uint32),
+    ]
+
+
+class PersistentGDIBackend(CaptureBackend):
+    """
+    Capture backend reusing GDI handles and the pixel buffer between grabs.
+
+    The screen DC, memory DC and a top-down 32-bit DIB section are created on
+    first use and kept until the screen size changes or ``close`` is called,
+    so each grab costs a single BitBlt plus one conversion into a PIL image.
+    """
+
+    name = "gdi"
+
+    _SRCCOPY = 0x00CC0020
+    _CAPTUREBLT = 0x40000000
+    _SM_CXSCREEN = 0
+    _SM_CYSCREEN = 1
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._gdi32 = ctypes.windll.gdi32
+        # Match ImageGrab and pyautogui: work in physical pixels.
+        if enable_dpi_awareness():
+            invalidate_display_geometry()
+        self._gdi32.CreateDIBSection.restype = ctypes.c_void_p
+        self._gdi32.SelectObject.restype = ctypes.c_void_p
+        self._gdi32.CreateCompatibleDC.restype = ctypes.c_void_p
+        self._user32.GetDC.restype = ctypes.c_void_p
+        self._lock = threading.Lock()
+        self._screen_dc = None
+        self._mem_dc = None
+        self._bitmap = None
+        self._old_bitmap = None
+        self._bits = None
+        self._size = (0, 0)
+
+    def _screen_size(self) -> tuple[int, int]:
+        return (
+            self._user32.GetSystemMetrics(self._SM_CXSCREEN),
+            self._user32.GetSystemMetrics(self._SM_CYSCREEN),
+        )
+
+    def _ensure_buffers(self, size: tuple[int, int]) -> None:
+        if self._bitmap is not None and size == self._size:
+            return
+
+        self._release()
+        width, height = size
+
+        self._screen_dc = self._user32.GetDC(None)
+        self._mem_dc = self._gdi32.CreateCompatibleDC(ctypes.c_void_p(self._screen_dc))
+
+        header = _BITMAPINFOHEADER()
+        header.biSize = ctypes.sizeof(_BITMAPINFOHEADER)
+        header.biWidth = width
+        header.biHeight = -height  # negative height selects a top-down DIB
+        header.biPlanes = 1
+        header.biBitCount = 32
+        header.biCompression = 0  # BI_RGB
+
+        bits = ctypes.c_void_p()
+        self._bitmap = self._gdi32.CreateDIBSection(
+            ctypes.c_void_p(self._mem_dc),
+            ctypes.byref(header),
+            0,
+            ctypes.byref(bits),
+            None,
+            0,
+        )
+        if not self._bitmap:
+            self._release()
+            raise OSError("CreateDIBSection failed")
+
+        self._old_bitmap = self._gdi32.SelectObject(
+            ctypes.c_void_p(self._mem_dc), ctypes.c_void_p(self._bitmap)
+        )
+        self._bits = (ctypes.c_char * (width * height * 4)).from_address(bits.value)
+        self._size = size
+
+    def grab(self, bbox: BBox | None = None) -> Image.Image:
+        with self._lock:
+            size = self._screen_size()
+            self._ensure_buffers(size)
+            width, height = size
+
+            ok = self._gdi32.BitBlt(
+                ctypes.c_void_p(self._mem_dc),
+                0,
+                0,
+                width,
+                height,
+                ctypes.c_void_p(self._screen_dc),
+                0,
+                0,
+                self._SRCCOPY | self._CAPTUREBLT,
+            )
+            if not ok:
+                raise OSError("BitBlt failed")
+
+            # RGB from BGRX cannot share memory, so this copies out of the
+            # reused DIB buffer before the next BitBlt overwrites it.
+            img = Image.frombuffer("RGB", size, self._bits, "raw", "BGRX", 0, 1)
+
+        return img.crop(bbox) if bbox else img
+
+    def _release(self) -> None:
+        if self._mem_dc:
+            if self._old_bitmap:
+                self._gdi32.SelectObject(
+                    ctypes.c_void_p(self._mem_dc), ctypes.c_void_p(self._old_bitmap)
+                )
+            self._gdi32.DeleteDC(ctypes.c_void_p(self._mem_dc))
+        if self._bitmap:
+            self._gdi32.DeleteObject(ctypes.c_void_p(self._bitmap))
+        if self._screen_dc:
+            self._user32.ReleaseDC(None, ctypes.c_void_p(self._screen_dc))
+        self._screen_dc = self._mem_dc = self._bitmap = self._old_bitmap = None
+        self._bits = None
+        self._size = (0, 0)
+
+    def close(self) -> None:
+        with self._lock:
+            self._release()
+
+
+class FileCaptureBackend(CaptureBackend):
+    """
+    Capture backend replaying frames from image files.
+
+    Args:
+        source: An image file, a directory of images, or a list of paths.
+        loop: Restart from the first frame after the last one. When False the
+            last frame is repeated.
+        title: Foreground window title to report instead of the real one.
+    """
+
+    name = "file"
+
+    _EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+
+    def __init__(
+        self,
+        source: str | Path | list[str | Path],
+        loop: bool = True,
+        title: str | None = None,
+    ):
+        if isinstance(source, (str, Path)) and Path(source).is_dir():
+            paths = sorted(
+                p for p in Path(source).iterdir() if p.suffix.lower() in self._EXTENSIONS
+            )
+        elif isinstance(source, (str, Path)):
+            paths = [Path(source)]
+        else:
+            paths = [Path(p) for p in source]
+
+        if not paths:
+            raise ValueError(f"No frames found in {source}")
+
+        self._frames = [self._load(p) for p in paths]
+        self._loop = loop
+        self._index = 0
+        self._title = title
+
+    @staticmethod
+    def _load(path: Path) -> Image.Image:
+        with Image.open(path) as img:
+            return img.convert("RGB")
+
+    def grab(self, bbox: BBox | None = None) -> Image.Image:
+        frame = self._frames[self._index]
+        if self._index + 1 < len(self._frames):
+            self._index += 1
+        elif self._loop:
+            self._index = 0
+        return frame.crop(bbox) if bbox else frame.copy()
+
+    def window_title(self) -> str:
+        return self._title if self._title is not None else super().window_title()
+
+    def window_rect(self) -> BBox | None:
+        return None
+
+
+class SyntheticCaptureBackend(CaptureBackend):
+    """
+    Capture backend generating frames in memory.
+
+    Args:
+        size: Frame size in physical pixels.
+        factory: Optional callable building the frame for a given grab index.
+            Defaults to a static gradient with a few window-like blocks.
+        title: Foreground window title to report instead of the real one.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        size: tuple[int, int] = (1920, 1080),
+        factory: Callable[[int], Image.Image] | None = None,
+        title: str | None = None,
+    ):
+        self.size = size
+        self._factory = factory
+        self._title = title
+        self._counter = itertools.count()
+        self._static: Image.Image | None = None
+
+    def _default_frame(self) -> Image.Image:
+        if self._static is None:
+            width, height = self.size
+            gradient = Image.linear_gradient("L")
+            img = Image.merge(
+                "RGB",
+                (gradient, gradient.transpose(Image.Transpose.ROTATE_90), gradient),
+            ).resize(self.size)
+            draw = ImageDraw.Draw(img)
+            draw.rectangle(
+                (width // 10, height // 10, width // 2, height // 2),
+                fill=(240, 240, 240),
+            )
+            draw.rectangle(
+                (0, height - height // 20, width, height), fill=(32, 32, 48)
+            )
+            self._static = img
+        return self._static
+
+    def grab(self, bbox: BBox | None = None) -> Image.Image:
+        index = next(self._counter)
+        frame = self._factory(index) if self._factory else self._default_frame()
+        return frame.crop(bbox) if bbox else frame.copy()
+
+    def window_title(self) -> str:
+        return self._title if self._title is not None else super().window_title()
+
+    def window_rect(self) -> BBox | None:
+        return None
+
+
+_BACKENDS: dict[str, Callable[..., CaptureBackend]] = {
+    ImageGrabBackend.name: ImageGrabBackend,
+    PersistentGDIBackend.name: PersistentGDIBackend,
+    FileCaptureBackend.name: FileCaptureBackend,
+    SyntheticCaptureBackend.name: SyntheticCaptureBackend,
+}
+
+
+def _x11_capture_backend(**kwargs) -> CaptureBackend:
+    # Imported on demand: desktop/x11.py builds on this module.
+    from Windows.desktop.x11 import X11CaptureBackend
+
+    return X11CaptureBackend(**kwargs)
+
+
+_BACKENDS["x11"] = _x11_capture_backend
+
+_capture_backend: CaptureBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def register_capture_backend(name: str, factory: Callable[..., CaptureBackend]) -> None:
+    """
+    Register a capture backend factory by name.
+
+    Args:
+        name: Name used with create_capture_backend and WINDOWS_CAPTURE_BACKEND.
+        factory: Callable returning a CaptureBackend instance.
+    """
+    _BACKENDS[name.lower()] = factory
+
+
+def create_capture_backend(name: str, **kwargs) -> CaptureBackend:
+    """
+    Create a capture backend by name.
+
+    Args:
+        name: One of "imagegrab", "gdi", "file", "synthetic", "x11" or a
+            registered name.
+        **kwargs: Arguments forwarded to the backend constructor.
+
+    Returns:
+        A new CaptureBackend instance.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    factory = _BACKENDS.get(name.lower())
+    if factory is None:
+        raise ValueError(f"Unknown capture backend: {name}")
+    return factory(**kwargs)
+
+
+def _uses_x11() -> bool:
+    """Whether this is a Linux process with an X display to drive."""
+    return sys.platform.startswith("linux") and bool(os.getenv("DISPLAY"))
+
+
+def _default_capture_backend() -> CaptureBackend:
+    """Create the backend selected by environment variables."""
+    default = "x11" if _uses_x11() else ImageGrabBackend.name
+    name = os.getenv("WINDOWS_CAPTURE_BACKEND", default)
+    if name == FileCaptureBackend.name:
+        source = os.getenv("WINDOWS_CAPTURE_SOURCE")
+        if not source:
+            raise ValueError("WINDOWS_CAPTURE_SOURCE is required for the file backend")
+        return FileCaptureBackend(source)
+    return create_capture_backend(name)
+
+
+def get_capture_backend() -> CaptureBackend:
+    """
+    Get the global capture backend, creating it on first use.
+
+    The default is selected by the WINDOWS_CAPTURE_BACKEND environment
+    variable ("imagegrab" when unset, "x11" on Linux when DISPLAY is set);
+    the file backend reads its frames
+    from WINDOWS_CAPTURE_SOURCE.
+
+    Returns:
+        The active CaptureBackend.
+    """
+    global _capture_backend
+    if _capture_backend is None:
+        with _backend_lock:
+            if _capture_backend is None:
+                _capture_backend = _default_capture_backend()
+    return _capture_backend
+
+
+def set_capture_backend(backend: CaptureBackend | str, **kwargs) -> CaptureBackend:
+    """
+    Replace the global capture backend.
+
+    Args:
+        backend: A CaptureBackend instance or a registered backend name.
+        **kwargs: Constructor arguments when ``backend`` is a name.
+
+    Returns:
+        The newly active CaptureBackend.
+
+    Example:
+        >>> from Windows.desktop.capture import set_capture_backend
+        >>> set_capture_backend("synthetic", size=(1280, 720))
+    """
+    global _capture_backend
+    if isinstance(backend, str):
+        backend = create_capture_backend(backend, **kwargs)
+
+    with _backend_lock:
+        previous, _capture_backend = _capture_backend, backend
+
+    if previous is not None and previous is not backend:
+        previous.close()
+    return backend
+
+
+def benchmark_capture(
+    backend: CaptureBackend | None = None, frames: int = 30
+) -> dict[str, float]:
+    """
+    Measure capture throughput of a backend.
+
+    Args:
+        backend: Backend to measure. Defaults to the global backend.
+        frames: Number of frames to grab after one warm-up grab.
+
+    Returns:
+        Dictionary with frames per second and mean/max grab latency in ms.
+    """
+    backend = backend or get_capture_backend()
+    backend.grab()
+
+    latencies = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        backend.grab()
+        latencies.append(time.perf_counter() - start)
+
+    total = sum(latencies)
+    return {
+        "fps": frames / total if total else float("inf"),
+        "mean_ms": total / frames * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+__all__ = [
+    "CaptureBackend",
+    "ImageGrabBackend",
+    "PersistentGDIBackend",
+    "FileCaptureBackend",
+    "SyntheticCaptureBackend",
+    "register_capture_backend",
+    "create_capture_backend",
+    "get_capture_backend",
+    "set_capture_backend",
+    "benchmark_capture",
+]
+
+
+if __name__ == "__main__":
+    for backend_name in (
+        ImageGrabBackend.name,
+        PersistentGDIBackend.name,
+        SyntheticCaptureBackend.name,
+    ):
+        try:
+            with create_capture_backend(backend_name) as capture:
+                stats = benchmark_capture(capture)
+        except Exception as e:
+            print(f"{backend_name:>10}: unavailable ({e})")
+            continue
+        print(
+            f"{backend_name:>10}: {stats['fps']:.1f} fps, "
+            f"mean {stats['mean_ms']:.1f}ms, max {stats['max_ms']:.1f}ms"
+        )
@@ -0,0 +1,291 @@
+"""Cached display geometry for Windows desktop automation.
+
+DPI scale, monitor layout and screen sizes are probed once and cached, so
+coordinate conversion on the input hot path makes no per-event system calls.
+The cache is refreshed periodically and can be invalidated explicitly (for
+example after a resolution or scaling change), and tests can pin a fake
+geometry with ``set_display_geometry``.
+"""
+
+import ctypes
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Monitor:
+    """A monitor rectangle in physical desktop pixels."""
+
+    left: int
+    top: int
+    right: int
+    bottom: int
+    primary: bool = False
+
+    @property
+    def width(self) -> int:
+        return self.right - self.left
+
+    @property
+    def height(self) -> int:
+        return self.bottom - self.top
+
+
+@dataclass(frozen=True)
+class DisplayGeometry:
+    """Snapshot of the display configuration."""
+
+    dpi_scale: float = 1.0
+    physical_size: tuple[int, int] = (0, 0)
+    monitors: tuple[Monitor, ...] = ()
+
+    @property
+    def logical_size(self) -> tuple[int, int]:
+        """Primary screen size in logical pixels."""
+        return (
+            int(self.physical_size[0] / self.dpi_scale),
+            int(self.physical_size[1] / self.dpi_scale),
+        )
+
+    def to_physical(self, x: int, y: int) -> tuple[int, int]:
+        """Scale logical coordinates to physical coordinates."""
+        return (int(x * self.dpi_scale), int(y * self.dpi_scale))
+
+    def to_logical(self, x: int, y: int) -> tuple[int, int]:
+        """Scale physical coordinates to logical coordinates."""
+        return (int(x / self.dpi_scale), int(y / self.dpi_scale))
+
+
+def _probe_monitors(user32) -> tuple[Monitor, ...]:
+    """Enumerate monitors through EnumDisplayMonitors."""
+
+    class RECT(ctypes.Structure):
+        _fields_ = [
+            ("left", ctypes.c_long),
+            ("top", ctypes.c_long),
+            ("right", ctypes.c_long),
+            ("bottom", ctypes.c_long),
+        ]
+
+    monitors: list[Monitor] = []
+    callback_type = ctypes.WINFUNCTYPE(
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.POINTER(RECT),
+        ctypes.c_void_p,
+    )
+
+    def callback(hmonitor, hdc, rect_ptr, data):
+        rect = rect_ptr.contents
+        monitors.append(
+            Monitor(
+                rect.left,
+                rect.top,
+                rect.right,
+                rect.bottom,
+                primary=rect.left == 0 and rect.top == 0,
+            )
+        )
+        return 1
+
+    user32.EnumDisplayMonitors(None, None, callback_type(callback), 0)
+    return tuple(monitors)
+
+
+_dpi_aware = False
+
+
+def enable_dpi_awareness() -> bool:
+    """
+    Make the process per-monitor DPI aware, once.
+
+    Without it Windows virtualizes coordinates under display scaling: the
+    DPI probe reports 1.0 and monitor rectangles come back in logical
+    pixels, while screenshots and injected input use physical ones.
+
+    Returns:
+        True if awareness was requested by this call, False if it already
+        was or the Windows APIs are unavailable.
+    """
+    global _dpi_aware
+    if _dpi_aware:
+        return False
+    try:
+        user32 = ctypes.windll.user32
+    except AttributeError:
+        return False
+    _dpi_aware = True
+
+    PROCESS_PER_MONITOR_DPI_AWARE = 2
+    try:
+        # Windows 8.1+; fails harmlessly if awareness is already set.
+        ctypes.windll.shcore.SetProcessDpiAwareness(PROCESS_PER_MONITOR_DPI_AWARE)
+    except (AttributeError, OSError):
+        user32.SetProcessDPIAware()
+    return True
+
+
+def probe_display_geometry() -> DisplayGeometry:
+    """
+    Query the current display configuration from the system.
+
+    Returns:
+        DisplayGeometry for the current desktop, or a neutral geometry
+        (scale 1.0, unknown size) when the Windows APIs are unavailable.
+    """
+    try:
+        user32 = ctypes.windll.user32
+        gdi32 = ctypes.windll.gdi32
+    except AttributeError:
+        return DisplayGeometry()
+    enable_dpi_awareness()
+
+    dpi_scale = 1.0
+    try:
+        hdc = user32.GetDC(0)
+        LOGPIXELSX = 88
+        dpi_scale = gdi32.GetDeviceCaps(hdc, LOGPIXELSX) / 96.0
+        user32.ReleaseDC(0, hdc)
+    except Exception:
+        pass
+
+    SM_CXSCREEN, SM_CYSCREEN = 0, 1
+    physical_size = (
+        user32.GetSystemMetrics(SM_CXSCREEN),
+        user32.GetSystemMetrics(SM_CYSCREEN),
+    )
+
+    try:
+        monitors = _probe_monitors(user32)
+    except Exception:
+        monitors = ()
+
+    return DisplayGeometry(
+        dpi_scale=dpi_scale or 1.0,
+        physical_size=physical_size,
+        monitors=monitors,
+    )
+
+
+class DisplayGeometryService:
+    """
+    Caches the display geometry and refreshes it periodically.
+
+    Args:
+        probe: Callable returning the current DisplayGeometry.
+        refresh_interval: Seconds after which the cache is re-probed on the
+            next access. 0 disables periodic refresh.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], DisplayGeometry] = probe_display_geometry,
+        refresh_interval: float = 30.0,
+    ):
+        self._probe = probe
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._geometry: DisplayGeometry | None = None
+        self._probed_at = 0.0
+        self._pinned = False
+
+    def get(self) -> DisplayGeometry:
+        """Return the cached geometry, probing only when stale or invalidated."""
+        geometry = self._geometry
+        if geometry is not None and (
+            self._pinned
+            or self.refresh_interval <= 0
+            or time.monotonic() - self._probed_at < self.refresh_interval
+        ):
+            return geometry
+
+        with self._lock:
+            if self._geometry is geometry:
+                self._geometry = self._probe()
+                self._probed_at = time.monotonic()
+            return self._geometry
+
+    def invalidate(self) -> None:
+        """Drop the cached geometry so the next access probes again."""
+        with self._lock:
+            if not self._pinned:
+                self._geometry = None
+
+    def set(self, geometry: DisplayGeometry | None) -> None:
+        """
+        Pin a fixed geometry, or pass None to resume probing.
+
+        Args:
+            geometry: Geometry to return from ``get`` until unpinned.
+        """
+        with self._lock:
+            self._geometry = geometry
+            self._pinned = geometry is not None
+            self._probed_at = time.monotonic()
+
+
+_service = DisplayGeometryService(
+    refresh_interval=float(os.getenv("WINDOWS_DISPLAY_REFRESH_INTERVAL", 30.0))
+)
+
+
+def get_display_service() -> DisplayGeometryService:
+    """Get the global display geometry service."""
+    return _service
+
+
+def get_display_geometry() -> DisplayGeometry:
+    """
+    Get the cached display geometry.
+
+    Returns:
+        The current DisplayGeometry.
+    """
+    return _service.get()
+
+
+def invalidate_display_geometry() -> None:
+    """Force the display geometry to be probed again on next use."""
+    _service.invalidate()
+
+
+def set_display_geometry(geometry: DisplayGeometry | None) -> None:
+    """
+    Pin a fixed display geometry, e.g. a fake one in tests.
+
+    Args:
+        geometry: Geometry to use, or None to resume probing the system.
+
+    Example:
+        >>> from Windows.desktop.display import DisplayGeometry, set_display_geometry
+        >>> set_display_geometry(DisplayGeometry(dpi_scale=1.5, physical_size=(2880, 1620)))
+    """
+    _service.set(geometry)
+
+
+def get_dpi_scale() -> float:
+    """
+    Get the Windows DPI scale factor from the cached geometry.
+
+    Returns:
+        DPI scale factor (e.g., 1.25 for 125% scaling, 1.5 for 150%).
+    """
+    return _service.get().dpi_scale
+
+
+__all__ = [
+    "Monitor",
+    "DisplayGeometry",
+    "DisplayGeometryService",
+    "enable_dpi_awareness",
+    "probe_display_geometry",
+    "get_display_service",
+    "get_display_geometry",
+    "invalidate_display_geometry",
+    "set_display_geometry",
+    "get_dpi_scale",
+]
@@ -0,0 +1,55 @@
+"""Perceptual frame hashing for cheap screen comparison."""
+
+import numpy as np
+from PIL import Image
+
+
+def dhash(img: Image.Image, hash_size: int = 8) -> int:
+    """
+    Compute a difference hash of an image.
+
+    The image is reduced to a (hash_size + 1) x hash_size grayscale grid and
+    each bit records whether a pixel is brighter than its right neighbour, so
+    the hash is stable under re-encoding and small rendering differences.
+
+    Args:
+        img: Image to hash.
+        hash_size: Grid size; the hash has hash_size * hash_size bits.
+
+    Returns:
+        The hash as an integer.
+    """
+    small = img.convert("L").resize(
+        (hash_size + 1, hash_size), Image.Resampling.BILINEAR
+    )
+    grid = np.asarray(small, dtype=np.int16)
+    bits = (grid[:, :-1] > grid[:, 1:]).ravel()
+    # packbits pads the last byte with zeros; shift them back out.
+    return int.from_bytes(np.packbits(bits).tobytes(), "big") >> (-bits.size % 8)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def hamming_distances(hashes: np.ndarray, value: int) -> np.ndarray:
+    """
+    Hamming distances from one 64-bit hash to an array of 64-bit hashes.
+
+    Args:
+        hashes: 1-D uint64 array of hashes.
+        value: Hash to compare against (at most 64 bits).
+
+    Returns:
+        1-D array with the distance to each element of ``hashes``.
+    """
+    diff = np.ascontiguousarray(np.bitwise_xor(hashes, np.uint64(value)))
+    return np.unpackbits(diff.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+__all__ = [
+    "dhash",
+    "hamming_distance",
+    "hamming_distances",
+]
@@ -0,0 +1,338 @@
+"""Input backends for Windows desktop automation.
+
+``desktop/mouse.py`` and ``desktop/keyboard.py`` inject input through an
+``InputBackend`` so the injection strategy can be swapped without touching
+the action handlers:
+
+- ``PyAutoGUIInputBackend``: pyautogui and the clipboard, the original
+  behavior, without pyautogui's per-call ``PAUSE``.
+- ``SendInputBackend`` (``desktop/sendinput.py``): one batched
+  ``SendInput`` call per action, the default on Windows.
+- ``RecordingInputBackend``: records events without touching the desktop,
+  for headless runs, benchmarks and tests.
+- ``X11InputBackend`` (``desktop/x11.py``): XTest events on an X display
+  such as Xvfb, for Linux workers.
+
+Coordinates are physical pixels; DPI scaling happens in ``desktop/mouse.py``.
+"""
+
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+def split_hotkey(*keys: str) -> list[str]:
+    """
+    Split hotkey chords into key names.
+
+    Accepts ``("ctrl", "c")`` as well as ``"ctrl+c"``. A lone ``"+"`` or a
+    chord ending in ``"++"`` (``"ctrl++"``) names the plus key itself.
+
+    Args:
+        *keys: Key names or ``+``-joined chords.
+
+    Returns:
+        The key names in pressing order.
+    """
+    names: list[str] = []
+    for key in keys:
+        if key == "+" or key.endswith("++"):
+            names += [part for part in key[:-2].split("+") if part]
+            names.append("+")
+        else:
+            names += [part for part in key.split("+") if part]
+    return names
+
+
+class InputBackend(ABC):
+    """Interface for objects that inject mouse and keyboard input."""
+
+    name: str = "base"
+
+    @abstractmethod
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1) -> None:
+        """
+        Click at a position.
+
+        Args:
+            x: X coordinate in physical pixels.
+            y: Y coordinate in physical pixels.
+            button: "left" or "right".
+            clicks: Number of clicks, 2 for a double click.
+        """
+
+    @abstractmethod
+    def drag(
+        self, start: tuple[int, int], end: tuple[int, int], duration: float
+    ) -> None:
+        """
+        Drag with the left button held from ``start`` to ``end``.
+
+        Args:
+            start: Start position in physical pixels.
+            end: End position in physical pixels.
+            duration: Seconds the movement should take.
+        """
+
+    @abstractmethod
+    def scroll(self, amount: int) -> None:
+        """Scroll the wheel by ``amount`` clicks; positive scrolls up."""
+
+    @abstractmethod
+    def hotkey(self, *keys: str) -> None:
+        """Press keys together, releasing them in reverse order."""
+
+    @abstractmethod
+    def press(self, key: str) -> None:
+        """Press and release a single key."""
+
+    @abstractmethod
+    def paste_text(self, text: str) -> None:
+        """Insert text into the focused control, e.g. through the clipboard."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+    def __enter__(self) -> "InputBackend":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PyAutoGUIInputBackend(InputBackend):
+    """
+    Input backend using pyautogui, with text pasted through pyperclip.
+
+    Calls pass ``_pause=False``: pyautogui would otherwise sleep
+    ``pyautogui.PAUSE`` after each of them, on top of the TIMING_CONFIG
+    delays applied by the callers.
+    """
+
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        import pyperclip
+
+        self._pyautogui = pyautogui
+        self._pyperclip = pyperclip
+
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1) -> None:
+        if button == "right":
+            self._pyautogui.rightClick(x, y, _pause=False)
+        elif clicks == 2:
+            self._pyautogui.doubleClick(x, y, _pause=False)
+        else:
+            self._pyautogui.click(x, y, clicks=clicks, button=button, _pause=False)
+
+    def drag(
+        self, start: tuple[int, int], end: tuple[int, int], duration: float
+    ) -> None:
+        self._pyautogui.moveTo(*start, _pause=False)
+        self._pyautogui.drag(
+            end[0] - start[0], end[1] - start[1], duration=duration, _pause=False
+        )
+
+    def scroll(self, amount: int) -> None:
+        self._pyautogui.scroll(amount, _pause=False)
+
+    def hotkey(self, *keys: str) -> None:
+        self._pyautogui.hotkey(*keys, _pause=False)
+
+    def press(self, key: str) -> None:
+        self._pyautogui.press(key, _pause=False)
+
+    def paste_text(self, text: str) -> None:
+        self._pyperclip.copy(text)
+        self._pyautogui.hotkey("ctrl", "v", _pause=False)
+
+
+@dataclass
+class InputEvent:
+    """An input call recorded by RecordingInputBackend."""
+
+    kind: str
+    args: tuple[Any, ...]
+    timestamp: float
+
+
+class RecordingInputBackend(InputBackend):
+    """
+    Input backend recording calls instead of injecting them.
+
+    Args:
+        latency: Seconds each call blocks, to model the cost of real input.
+    """
+
+    name = "recording"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.events: list[InputEvent] = []
+        self._lock = threading.Lock()
+
+    def _record(self, kind: str, *args: Any) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        with self._lock:
+            self.events.append(InputEvent(kind, args, time.perf_counter()))
+
+    def counts(self) -> dict[str, int]:
+        """Number of recorded calls per kind."""
+        with self._lock:
+            return dict(Counter(e.kind for e in self.events))
+
+    def clear(self) -> None:
+        """Forget the recorded events."""
+        with self._lock:
+            self.events.clear()
+
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1) -> None:
+        self._record("click", x, y, button, clicks)
+
+    def drag(
+        self, start: tuple[int, int], end: tuple[int, int], duration: float
+    ) -> None:
+        self._record("drag", start, end, duration)
+
+    def scroll(self, amount: int) -> None:
+        self._record("scroll", amount)
+
+    def hotkey(self, *keys: str) -> None:
+        self._record("hotkey", *keys)
+
+    def press(self, key: str) -> None:
+        self._record("press", key)
+
+    def paste_text(self, text: str) -> None:
+        self._record("paste_text", text)
+
+
+_BACKENDS: dict[str, Callable[..., InputBackend]] = {
+    PyAutoGUIInputBackend.name: PyAutoGUIInputBackend,
+    RecordingInputBackend.name: RecordingInputBackend,
+}
+
+
+def _x11_input_backend(**kwargs) -> InputBackend:
+    # Imported on demand: desktop/x11.py builds on this module.
+    from Windows.desktop.x11 import X11InputBackend
+
+    return X11InputBackend(**kwargs)
+
+
+def _sendinput_backend(**kwargs) -> InputBackend:
+    from Windows.desktop.sendinput import SendInputBackend
+
+    return SendInputBackend(**kwargs)
+
+
+_BACKENDS["x11"] = _x11_input_backend
+_BACKENDS["sendinput"] = _sendinput_backend
+
+_input_backend: InputBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def register_input_backend(name: str, factory: Callable[..., InputBackend]) -> None:
+    """
+    Register an input backend factory by name.
+
+    Args:
+        name: Name used with create_input_backend and WINDOWS_INPUT_BACKEND.
+        factory: Callable returning an InputBackend instance.
+    """
+    _BACKENDS[name.lower()] = factory
+
+
+def create_input_backend(name: str, **kwargs) -> InputBackend:
+    """
+    Create an input backend by name.
+
+    Args:
+        name: One of "pyautogui", "sendinput", "recording", "x11" or a
+            registered name.
+        **kwargs: Arguments forwarded to the backend constructor.
+
+    Returns:
+        A new InputBackend instance.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    factory = _BACKENDS.get(name.lower())
+    if factory is None:
+        raise ValueError(f"Unknown input backend: {name}")
+    return factory(**kwargs)
+
+
+def get_input_backend() -> InputBackend:
+    """
+    Get the global input backend, creating it on first use.
+
+    The default is selected by the WINDOWS_INPUT_BACKEND environment
+    variable ("sendinput" on Windows and "x11" on Linux when DISPLAY is set
+    if unset, "pyautogui" otherwise).
+
+    Returns:
+        The active InputBackend.
+    """
+    global _input_backend
+    if _input_backend is None:
+        with _backend_lock:
+            if _input_backend is None:
+                default = PyAutoGUIInputBackend.name
+                if sys.platform == "win32":
+                    default = "sendinput"
+                elif sys.platform.startswith("linux") and os.getenv("DISPLAY"):
+                    default = "x11"
+                _input_backend = create_input_backend(
+                    os.getenv("WINDOWS_INPUT_BACKEND", default)
+                )
+    return _input_backend
+
+
+def set_input_backend(backend: InputBackend | str, **kwargs) -> InputBackend:
+    """
+    Replace the global input backend.
+
+    Args:
+        backend: An InputBackend instance or a registered backend name.
+        **kwargs: Constructor arguments when ``backend`` is a name.
+
+    Returns:
+        The newly active InputBackend.
+
+    Example:
+        >>> from Windows.desktop.input import set_input_backend
+        >>> recorder = set_input_backend("recording")
+    """
+    global _input_backend
+    if isinstance(backend, str):
+        backend = create_input_backend(backend, **kwargs)
+
+    with _backend_lock:
+        previous, _input_backend = _input_backend, backend
+
+    if previous is not None and previous is not backend:
+        previous.close()
+    return backend
+
+
+__all__ = [
+    "InputBackend",
+    "InputEvent",
+    "PyAutoGUIInputBackend",
+    "RecordingInputBackend",
+    "create_input_backend",
+    "get_input_backend",
+    "register_input_backend",
+    "set_input_backend",
+    "split_hotkey",
+]
@@ -1,12 +1,10 @@
-"""Keyboard utilities for Windows desktop automation using pyautogui."""
+"""Keyboard utilities for Windows desktop automation."""
 
-import time
 from typing import Optional
 
-import pyautogui
-import pyperclip
-
 from Windows.config.timing import TIMING_CONFIG
+from Windows.desktop.input import get_input_backend
+from Windows.tracing import traced_sleep
 
 
 def type_text(text: str, delay: Optional[float] = None) -> None:
@@ -29,9 +27,8 @@ def type_text(text: str, delay: Optional[float] = None) -> None:
     if delay is None:
         delay = TIMING_CONFIG.keyboard.default_type_delay
 
-    pyperclip.copy(text)
-    pyautogui.hotkey('ctrl', 'v')
-    time.sleep(delay)
+    get_input_backend().paste_text(text)
+    traced_sleep(delay, source="type_text")
 
 
 def hotkey(*keys: str, delay: Optional[float] = None) -> None:
@@ -52,8 +49,8 @@ def hotkey(*keys: str, delay: Optional[float] = None) -> None:
     if delay is None:
         delay = TIMING_CONFIG.keyboard.default_hotkey_delay
 
-    pyautogui.hotkey(*keys)
-    time.sleep(delay)
+    get_input_backend().hotkey(*keys)
+    traced_sleep(delay, source="hotkey")
 
 
 def press(key: str, delay: Optional[float] = None) -> None:
@@ -72,8 +69,8 @@ def press(key: str, delay: Optional[float] = None) -> None:
     if delay is None:
         delay = TIMING_CONFIG.keyboard.default_press_delay
 
-    pyautogui.press(key)
-    time.sleep(delay)
+    get_input_backend().press(key)
+    traced_sleep(delay, source="press")
 
 
 __all__ = [
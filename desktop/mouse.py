@@ -1,30 +1,11 @@
 """Mouse utilities for Windows desktop operations."""
 
-import ctypes
-import time
 from typing import Literal
 
-import pyautogui
-
 from Windows.config.timing import TIMING_CONFIG
-
-
-def get_dpi_scale() -> float:
-    """
-    Get the Windows DPI scale factor.
-
-    Returns:
-        DPI scale factor (e.g., 1.25 for 125% scaling, 1.5 for 150%).
-    """
-    try:
-        user32 = ctypes.windll.user32
-        hdc = user32.GetDC(0)
-        LOGPIXELSX = 88
-        scale = ctypes.windll.gdi32.GetDeviceCaps(hdc, LOGPIXELSX) / 96.0
-        user32.ReleaseDC(0, hdc)
-        return scale
-    except Exception:
-        return 1.0
+from Windows.desktop.display import get_display_geometry, get_dpi_scale
+from Windows.desktop.input import get_input_backend
+from Windows.tracing import traced_sleep
 
 
 def _scale_coordinates(x: int, y: int) -> tuple[int, int]:
@@ -38,10 +19,7 @@ def _scale_coordinates(x: int, y: int) -> tuple[int, int]:
     Returns:
         Tuple of (physical_x, physical_y) coordinates.
     """
-    dpi_scale = get_dpi_scale()
-    physical_x = int(x * dpi_scale)
-    physical_y = int(y * dpi_scale)
-    return (physical_x, physical_y)
+    return get_display_geometry().to_physical(x, y)
 
 
 def tap(x: int, y: int, delay: float | None = None) -> None:
@@ -54,8 +32,11 @@ def tap(x: int, y: int, delay: float | None = None) -> None:
         delay: Optional delay in seconds after the click. Defaults to TIMING_CONFIG.device.default_tap_delay.
     """
     phys_x, phys_y = _scale_coordinates(x, y)
-    pyautogui.click(phys_x, phys_y)
-    time.sleep(delay if delay is not None else TIMING_CONFIG.device.default_tap_delay)
+    get_input_backend().click(phys_x, phys_y)
+    traced_sleep(
+        delay if delay is not None else TIMING_CONFIG.device.default_tap_delay,
+        source="tap",
+    )
 
 
 def right_click(x: int, y: int, delay: float | None = None) -> None:
@@ -68,8 +49,11 @@ def right_click(x: int, y: int, delay: float | None = None) -> None:
         delay: Optional delay in seconds after the click. Defaults to TIMING_CONFIG.device.default_tap_delay.
     """
     phys_x, phys_y = _scale_coordinates(x, y)
-    pyautogui.rightClick(phys_x, phys_y)
-    time.sleep(delay if delay is not None else TIMING_CONFIG.device.default_tap_delay)
+    get_input_backend().click(phys_x, phys_y, button="right")
+    traced_sleep(
+        delay if delay is not None else TIMING_CONFIG.device.default_tap_delay,
+        source="right_click",
+    )
 
 
 def double_tap(x: int, y: int, delay: float | None = None) -> None:
@@ -82,8 +66,11 @@ def double_tap(x: int, y: int, delay: float | None = None) -> None:
         delay: Optional delay in seconds after the double click. Defaults to TIMING_CONFIG.device.default_double_tap_delay.
     """
     phys_x, phys_y = _scale_coordinates(x, y)
-    pyautogui.doubleClick(phys_x, phys_y)
-    time.sleep(delay if delay is not None else TIMING_CONFIG.device.default_double_tap_delay)
+    get_input_backend().click(phys_x, phys_y, clicks=2)
+    traced_sleep(
+        delay if delay is not None else TIMING_CONFIG.device.default_double_tap_delay,
+        source="double_tap",
+    )
 
 
 def swipe(
@@ -105,13 +92,18 @@ def swipe(
         duration_ms: Optional duration of the drag in milliseconds. Defaults to 300ms.
         delay: Optional delay in seconds after the swipe. Defaults to TIMING_CONFIG.device.default_swipe_delay.
     """
-    phys_start_x, phys_start_y = _scale_coordinates(start_x, start_y)
-    phys_end_x, phys_end_y = _scale_coordinates(end_x, end_y)
+    geometry = get_display_geometry()
+    phys_start_x, phys_start_y = geometry.to_physical(start_x, start_y)
+    phys_end_x, phys_end_y = geometry.to_physical(end_x, end_y)
 
     duration = (duration_ms if duration_ms is not None else 300) / 1000.0
-    pyautogui.moveTo(phys_start_x, phys_start_y)
-    pyautogui.drag(phys_end_x - phys_start_x, phys_end_y - phys_start_y, duration=duration)
-    time.sleep(delay if delay is not None else TIMING_CONFIG.device.default_swipe_delay)
+    get_input_backend().drag(
+        (phys_start_x, phys_start_y), (phys_end_x, phys_end_y), duration
+    )
+    traced_sleep(
+        delay if delay is not None else TIMING_CONFIG.device.default_swipe_delay,
+        source="swipe",
+    )
 
 
 def scroll(
@@ -128,8 +120,11 @@ def scroll(
         delay: Optional delay in seconds after the scroll. Defaults to TIMING_CONFIG.device.default_scroll_delay.
     """
     scroll_amount = amount if direction == "up" else -amount
-    pyautogui.scroll(scroll_amount)
-    time.sleep(delay if delay is not None else TIMING_CONFIG.device.default_scroll_delay)
+    get_input_backend().scroll(scroll_amount)
+    traced_sleep(
+        delay if delay is not None else TIMING_CONFIG.device.default_scroll_delay,
+        source="scroll",
+    )
 
 
 def convert_relative_to_absolute(
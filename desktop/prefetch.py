@@ -0,0 +1,175 @@
+"""Background frame prefetching for the agent loop.
+
+The prefetcher captures and encodes the next screenshot on a worker thread as
+soon as the previous action has settled, so the next step picks up a ready
+payload instead of paying capture and encode on the critical path.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from Windows.desktop.screenshot import (
+    Screenshot,
+    get_active_window_title,
+    get_screenshot,
+)
+from Windows.tracing import get_tracer
+
+
+@dataclass
+class Frame:
+    """A captured, encoded frame together with its window context."""
+
+    screenshot: Screenshot
+    window_title: str
+    captured_at: float
+    generation: int
+
+
+class FramePrefetcher:
+    """
+    Double-buffered background capture of the latest settled frame.
+
+    The worker thread writes into a back buffer and swaps it to the front once
+    capture and encoding have finished; ``take`` only ever reads the front
+    buffer, so a consumer never sees a half-built frame.
+
+    Args:
+        capture: Callable capturing an encoded screenshot.
+        window_title: Callable returning the active window title.
+
+    Example:
+        >>> prefetcher = FramePrefetcher()
+        >>> prefetcher.request()  # screen has settled, start grabbing
+        >>> frame = prefetcher.take()
+    """
+
+    def __init__(
+        self,
+        capture: Callable[[], Screenshot] = get_screenshot,
+        window_title: Callable[[], str] = get_active_window_title,
+    ):
+        self._capture = capture
+        self._window_title = window_title
+        self._condition = threading.Condition()
+        self._buffers: list[Frame | None] = [None, None]
+        self._front = 0
+        self._requested = 0
+        self._consumed = 0
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running."""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="FramePrefetcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """Stop the worker thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def request(self) -> None:
+        """Signal that the screen has settled and a new frame should be grabbed."""
+        self.start()
+        with self._condition:
+            self._requested += 1
+            self._condition.notify_all()
+
+    def invalidate(self) -> None:
+        """Discard any prefetched frame so the next take captures afresh."""
+        with self._condition:
+            self._consumed = self._requested
+
+    def take(self, timeout: float | None = None) -> Frame:
+        """
+        Return the frame captured for the latest request.
+
+        If no request is pending, one is issued first, so the call degrades to
+        a synchronous capture.
+
+        Args:
+            timeout: Maximum time to wait for the frame.
+
+        Returns:
+            The most recent Frame.
+
+        Raises:
+            TimeoutError: If no frame became ready within ``timeout``.
+        """
+        self.start()
+        with self._condition:
+            if self._requested <= self._consumed:
+                self._requested += 1
+                self._condition.notify_all()
+
+            with get_tracer().span("prefetch_wait"):
+                ready = self._condition.wait_for(self._ready, timeout)
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            if not ready:
+                raise TimeoutError("Timed out waiting for prefetched frame")
+
+            frame = self._buffers[self._front]
+            self._consumed = frame.generation
+            return frame
+
+    def _ready(self) -> bool:
+        if self._error is not None:
+            return True
+        front = self._buffers[self._front]
+        return front is not None and front.generation >= self._requested
+
+    def _run(self) -> None:
+        produced = 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopped or self._requested > produced
+                )
+                if self._stopped:
+                    return
+                generation = self._requested
+
+            try:
+                screenshot = self._capture()
+                title = self._window_title()
+            except BaseException as e:
+                with self._condition:
+                    self._error = e
+                    produced = generation
+                    self._condition.notify_all()
+                continue
+
+            back = 1 - self._front
+            self._buffers[back] = Frame(
+                screenshot=screenshot,
+                window_title=title,
+                captured_at=time.monotonic(),
+                generation=generation,
+            )
+            with self._condition:
+                self._front = back
+                produced = generation
+                self._condition.notify_all()
+
+
+__all__ = [
+    "Frame",
+    "FramePrefetcher",
+]
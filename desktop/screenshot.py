@@ -1,69 +1,273 @@
 """Screenshot utilities for capturing Windows desktop screen."""
 
 import base64
-import ctypes
-from dataclasses import dataclass
+import time
 from io import BytesIO
+from typing import Callable
 
-from PIL import Image, ImageGrab
+from PIL import Image
+
+from Windows.config.screenshot import ScreenshotConfig, get_screenshot_config
+from Windows.desktop.capture import CaptureBackend, get_capture_backend
+from Windows.desktop.display import get_dpi_scale
+from Windows.tracing import get_tracer
 
 
-@dataclass
 class Screenshot:
-    """Represents a captured screenshot."""
+    """Represents a captured screenshot.
+
+    The encoded image is kept once as ``data`` bytes. The base64 text needed
+    for model messages is produced lazily on first access and cached, and the
+    raw pixels of the encoded-size frame are exposed through ``pixels`` so
+    local consumers (diffing, hashing, UI) never decode the image again.
+
+    ``width``/``height`` are the logical size of the captured region used
+    for coordinate conversion and ``offset_x``/``offset_y`` its logical
+    origin on the desktop (non-zero when cropped to the active window);
+    ``image_width``/``image_height`` are the encoded image size, which may be
+    smaller when a long-edge limit is configured.
+    """
+
+    __slots__ = (
+        "data",
+        "width",
+        "height",
+        "offset_x",
+        "offset_y",
+        "mime_type",
+        "image_width",
+        "image_height",
+        "encode_time",
+        "_image",
+        "_base64",
+        "_pixels",
+    )
+
+    def __init__(
+        self,
+        data: bytes,
+        width: int,
+        height: int,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        mime_type: str = "image/png",
+        image_width: int = 0,
+        image_height: int = 0,
+        encode_time: float = 0.0,
+        image: Image.Image | None = None,
+    ):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.mime_type = mime_type
+        self.image_width = image_width
+        self.image_height = image_height
+        self.encode_time = encode_time
+        self._image = image
+        self._base64: str | None = None
+        self._pixels: memoryview | None = None
+
+    @property
+    def byte_size(self) -> int:
+        """Size of the encoded image in bytes."""
+        return len(self.data)
+
+    @property
+    def base64_data(self) -> str:
+        """Base64 text of the encoded image, computed once on first access."""
+        if self._base64 is None:
+            with get_tracer().span("base64", bytes=len(self.data)):
+                self._base64 = base64.b64encode(self.data).decode("ascii")
+        return self._base64
+
+    @property
+    def data_url(self) -> str:
+        """The screenshot as a data URL for multimodal messages."""
+        return f"data:{self.mime_type};base64,{self.base64_data}"
+
+    @property
+    def image(self) -> Image.Image:
+        """The encoded-size frame, decoded from ``data`` only if it was not kept."""
+        if self._image is None:
+            with Image.open(BytesIO(self.data)) as img:
+                self._image = img.convert("RGB")
+        return self._image
+
+    @property
+    def pixels(self) -> memoryview:
+        """Read-only raw pixel buffer (row-major, ``image.mode`` layout)."""
+        if self._pixels is None:
+            self._pixels = memoryview(self.image.tobytes()).toreadonly()
+        return self._pixels
+
+    def __repr__(self) -> str:
+        return (
+            f"Screenshot({self.image_width}x{self.image_height} {self.mime_type}, "
+            f"{self.byte_size} bytes, logical {self.width}x{self.height}"
+            f"+{self.offset_x}+{self.offset_y})"
+        )
+
+
+RESAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "hamming": Image.Resampling.HAMMING,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+
+def _encode_png(img: Image.Image, buffer: BytesIO, config: ScreenshotConfig) -> None:
+    img.save(buffer, format="PNG", compress_level=config.png_compress_level)
+
+
+def _encode_jpeg(img: Image.Image, buffer: BytesIO, config: ScreenshotConfig) -> None:
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.save(buffer, format="JPEG", quality=config.quality)
+
+
+def _encode_webp(img: Image.Image, buffer: BytesIO, config: ScreenshotConfig) -> None:
+    img.save(buffer, format="WEBP", quality=config.quality, method=config.webp_method)
+
+
+ImageEncoder = Callable[[Image.Image, BytesIO, ScreenshotConfig], None]
 
-    base64_data: str
-    width: int
-    height: int
+_ENCODERS: dict[str, tuple[ImageEncoder, str]] = {
+    "png": (_encode_png, "image/png"),
+    "jpeg": (_encode_jpeg, "image/jpeg"),
+    "jpg": (_encode_jpeg, "image/jpeg"),
+    "webp": (_encode_webp, "image/webp"),
+}
 
 
-def get_dpi_scale() -> float:
+def register_encoder(name: str, encoder: ImageEncoder, mime_type: str) -> None:
     """
-    Get the Windows DPI scale factor.
+    Register an image encoder for use by get_screenshot.
 
-    Returns:
-        DPI scale factor (e.g., 1.25 for 125% scaling, 1.5 for 150%).
+    Args:
+        name: Format name referenced by ScreenshotConfig.format.
+        encoder: Callable writing the encoded image into the given buffer.
+        mime_type: MIME type of the encoded output.
     """
-    try:
-        user32 = ctypes.windll.user32
-        hdc = user32.GetDC(0)
-        LOGPIXELSX = 88
-        scale = ctypes.windll.gdi32.GetDeviceCaps(hdc, LOGPIXELSX) / 96.0
-        user32.ReleaseDC(0, hdc)
-        return scale
-    except Exception:
-        return 1.0
-
-
-def get_screenshot() -> Screenshot:
+    _ENCODERS[name.lower()] = (encoder, mime_type)
+
+
+def _target_size(
+    logical_width: int, logical_height: int, max_long_edge: int
+) -> tuple[int, int]:
+    """Compute the encoded image size honoring the long-edge limit."""
+    long_edge = max(logical_width, logical_height)
+    if max_long_edge <= 0 or long_edge <= max_long_edge:
+        return logical_width, logical_height
+
+    ratio = max_long_edge / long_edge
+    return (
+        max(1, round(logical_width * ratio)),
+        max(1, round(logical_height * ratio)),
+    )
+
+
+def get_screenshot(
+    config: ScreenshotConfig | None = None,
+    backend: CaptureBackend | None = None,
+) -> Screenshot:
     """
     Capture a screenshot of the Windows desktop.
     Automatically handles DPI scaling.
 
+    Args:
+        config: Resize and encoding settings. Defaults to the global
+            ScreenshotConfig.
+        backend: Capture backend to grab from. Defaults to the global
+            backend returned by get_capture_backend().
+
     Returns:
-        Screenshot object containing base64 data and dimensions.
+        Screenshot object containing encoded data, dimensions and encode stats.
     """
+    config = config or get_screenshot_config()
+    encoder, mime_type = _ENCODERS.get(config.format, _ENCODERS["png"])
+    resample = RESAMPLE_FILTERS.get(config.resample, Image.Resampling.LANCZOS)
+
     dpi_scale = get_dpi_scale()
+    tracer = get_tracer()
+
+    with tracer.span("capture"):
+        img = (backend or get_capture_backend()).grab()
+
+    offset_x = offset_y = 0
+    if config.capture_mode == "active_window":
+        region = _active_window_region(img.size, dpi_scale, config.window_margin)
+        if region is not None:
+            img = img.crop(region)
+            offset_x = int(region[0] / dpi_scale)
+            offset_y = int(region[1] / dpi_scale)
 
-    img = ImageGrab.grab()
     physical_width, physical_height = img.size
 
     logical_width = int(physical_width / dpi_scale)
     logical_height = int(physical_height / dpi_scale)
 
-    img = img.resize((logical_width, logical_height), Image.Resampling.LANCZOS)
+    start = time.perf_counter()
+
+    # Resize straight from physical pixels to the final size in one pass.
+    target_size = _target_size(logical_width, logical_height, config.max_long_edge)
+    if target_size != img.size:
+        with tracer.span("resize", size=target_size):
+            img = img.resize(target_size, resample)
 
     buffered = BytesIO()
-    img.save(buffered, format="PNG")
-    base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    with tracer.span("encode", format=config.format) as span:
+        encoder(img, buffered, config)
+        span.set(bytes=buffered.tell())
 
     return Screenshot(
-        base64_data=base64_data,
+        data=buffered.getvalue(),
         width=logical_width,
         height=logical_height,
+        offset_x=offset_x,
+        offset_y=offset_y,
+        mime_type=mime_type,
+        image_width=target_size[0],
+        image_height=target_size[1],
+        encode_time=time.perf_counter() - start,
+        image=img,
     )
 
 
+def _active_window_region(
+    screen_size: tuple[int, int], dpi_scale: float, margin: int
+) -> tuple[int, int, int, int] | None:
+    """Physical crop box of the foreground window plus margin, clamped to the screen."""
+    rect = get_active_window_rect()
+    if rect is None:
+        return None
+
+    pad = int(margin * dpi_scale)
+    left = max(0, rect[0] - pad)
+    top = max(0, rect[1] - pad)
+    right = min(screen_size[0], rect[2] + pad)
+    bottom = min(screen_size[1], rect[3] + pad)
+
+    # Minimized or off-screen windows leave nothing useful to crop to.
+    if right - left < 2 or bottom - top < 2:
+        return None
+    return (left, top, right, bottom)
+
+
+def get_active_window_rect() -> tuple[int, int, int, int] | None:
+    """
+    Get the rectangle of the currently active window.
+
+    Returns:
+        (left, top, right, bottom) in physical pixels, or None if failed.
+    """
+    return get_capture_backend().window_rect()
+
+
 def get_active_window_title() -> str:
     """
     Get the title of the currently active window.
@@ -71,15 +275,5 @@ def get_active_window_title() -> str:
     Returns:
         The window title string, or empty string if failed.
     """
-    try:
-        import win32gui
-
-        hwnd = win32gui.GetForegroundWindow()
-        if hwnd:
-            return win32gui.GetWindowText(hwnd)
-    except ImportError:
-        print("Note: pywin32 not installed. Install: pip install pywin32")
-    except Exception as e:
-        print(f"Error getting active window title: {e}")
-
-    return ""
+    with get_tracer().span("window_title"):
+        return get_capture_backend().window_title()
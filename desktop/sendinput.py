@@ -0,0 +1,405 @@
+"""Batched ``SendInput`` backend for Windows.
+
+pyautogui sleeps ``pyautogui.PAUSE`` (0.1 s by default) after every public
+call, on top of the TIMING_CONFIG delays in ``desktop/mouse.py`` and
+``desktop/keyboard.py``, and sends each key and button as its own call.
+``SendInputBackend`` builds the ``INPUT`` records of a whole click, chord,
+scroll or text and injects them with a single ``SendInput`` call, so events
+of one action cannot interleave with real input and nothing sleeps.
+
+Drags with a duration are paced at ``drag_rate`` motion steps per second,
+one ``SendInput`` call per step, since applications need the pointer to move
+over time to recognize drag-and-drop; a zero-duration drag is one call.
+
+Text is typed as ``KEYEVENTF_UNICODE`` events, which handle Chinese and
+other non-ASCII characters without going through the clipboard.
+
+The ``send`` argument replaces the system call, so the batches a backend
+produces can be counted on any platform::
+
+    >>> batches = []
+    >>> backend = SendInputBackend(
+    ...     send=lambda n, inputs, size: batches.append(inputs) or n,
+    ...     virtual_screen=(0, 0, 1920, 1080),
+    ... )
+    >>> backend.hotkey("ctrl", "c")
+    >>> len(batches), len(batches[0])
+    (1, 4)
+"""
+
+import ctypes
+import threading
+import time
+from typing import Callable
+
+from Windows.desktop.display import (
+    enable_dpi_awareness,
+    get_display_geometry,
+    invalidate_display_geometry,
+)
+from Windows.desktop.input import InputBackend, split_hotkey
+
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+
+_MOUSEEVENTF_MOVE = 0x0001
+_MOUSEEVENTF_WHEEL = 0x0800
+_MOUSEEVENTF_VIRTUALDESK = 0x4000
+_MOUSEEVENTF_ABSOLUTE = 0x8000
+_WHEEL_DELTA = 120
+
+_KEYEVENTF_EXTENDEDKEY = 0x0001
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_UNICODE = 0x0004
+
+_SM_XVIRTUALSCREEN = 76
+_SM_YVIRTUALSCREEN = 77
+_SM_CXVIRTUALSCREEN = 78
+_SM_CYVIRTUALSCREEN = 79
+_MAPVK_VK_TO_VSC = 0
+
+# (down, up) flags per button.
+_BUTTONS = {
+    "left": (0x0002, 0x0004),
+    "right": (0x0008, 0x0010),
+    "middle": (0x0020, 0x0040),
+}
+
+_VK_SHIFT = 0x10
+_VK_CONTROL = 0x11
+_VK_MENU = 0x12
+_VK_RETURN = 0x0D
+_VK_TAB = 0x09
+
+# pyautogui key names to virtual-key codes.
+_VIRTUAL_KEYS = {
+    "backspace": 0x08,
+    "tab": _VK_TAB,
+    "enter": _VK_RETURN,
+    "return": _VK_RETURN,
+    "shift": _VK_SHIFT,
+    "ctrl": _VK_CONTROL,
+    "control": _VK_CONTROL,
+    "alt": _VK_MENU,
+    "menu": _VK_MENU,
+    "pause": 0x13,
+    "capslock": 0x14,
+    "esc": 0x1B,
+    "escape": 0x1B,
+    "space": 0x20,
+    "pageup": 0x21,
+    "pgup": 0x21,
+    "pagedown": 0x22,
+    "pgdn": 0x22,
+    "end": 0x23,
+    "home": 0x24,
+    "left": 0x25,
+    "up": 0x26,
+    "right": 0x27,
+    "down": 0x28,
+    "printscreen": 0x2C,
+    "insert": 0x2D,
+    "delete": 0x2E,
+    "del": 0x2E,
+    "win": 0x5B,
+    "winleft": 0x5B,
+    "winright": 0x5C,
+    "super": 0x5B,
+    "cmd": 0x5B,
+    "apps": 0x5D,
+    "numlock": 0x90,
+    "scrolllock": 0x91,
+    "shiftleft": 0xA0,
+    "shiftright": 0xA1,
+    "ctrlleft": 0xA2,
+    "ctrlright": 0xA3,
+    "altleft": 0xA4,
+    "altright": 0xA5,
+    "volumemute": 0xAD,
+    "volumedown": 0xAE,
+    "volumeup": 0xAF,
+    "playpause": 0xB3,
+    **{f"f{n}": 0x6F + n for n in range(1, 25)},
+}
+
+# Keys on the extended part of the keyboard, which need KEYEVENTF_EXTENDEDKEY
+# to be told apart from their numeric keypad twins.
+_EXTENDED_KEYS = frozenset(
+    {0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2C, 0x2D, 0x2E}
+    | {0x5B, 0x5C, 0x5D, 0x6F, 0x90, 0xA3, 0xA5}
+)
+
+# Modifier bits returned in the high byte of VkKeyScanW.
+_SCAN_MODIFIERS = ((1, _VK_SHIFT), (2, _VK_CONTROL), (4, _VK_MENU))
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.c_int32),
+        ("dy", ctypes.c_int32),
+        ("mouseData", ctypes.c_uint32),
+        ("dwFlags", ctypes.c_uint32),
+        ("time", ctypes.c_uint32),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.c_uint16),
+        ("wScan", ctypes.c_uint16),
+        ("dwFlags", ctypes.c_uint32),
+        ("time", ctypes.c_uint32),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", ctypes.c_uint32),
+        ("wParamL", ctypes.c_uint16),
+        ("wParamH", ctypes.c_uint16),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT), ("hi", _HARDWAREINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("u", _INPUTUNION)]
+
+
+SendFunction = Callable[[int, ctypes.Array, int], int]
+
+
+class SendInputBackend(InputBackend):
+    """
+    Input backend injecting batched events with ``SendInput``.
+
+    Args:
+        drag_rate: Motion steps per second during drags.
+        send: Replacement for ``user32.SendInput`` taking the event count,
+            the ``INPUT`` array and the record size and returning the number
+            of events injected. Key layout lookups are skipped when set.
+        virtual_screen: ``(left, top, width, height)`` of the virtual
+            desktop in physical pixels. Defaults to the cached display
+            geometry.
+
+    Attributes:
+        batches: Number of SendInput calls made.
+        events: Number of events injected.
+    """
+
+    name = "sendinput"
+
+    def __init__(
+        self,
+        drag_rate: int = 60,
+        send: SendFunction | None = None,
+        virtual_screen: tuple[int, int, int, int] | None = None,
+    ):
+        self._user32 = None
+        if send is None:
+            try:
+                self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+            except (AttributeError, OSError) as e:
+                raise OSError("SendInput is only available on Windows") from e
+            self._user32.SendInput.argtypes = [
+                ctypes.c_uint,
+                ctypes.POINTER(_INPUT),
+                ctypes.c_int,
+            ]
+            self._user32.SendInput.restype = ctypes.c_uint
+            self._user32.VkKeyScanW.restype = ctypes.c_short
+            send = self._user32.SendInput
+            # Absolute coordinates are normalized against physical monitor
+            # rectangles; geometry probed before awareness was logical.
+            if enable_dpi_awareness():
+                invalidate_display_geometry()
+        self._send = send
+        self.drag_rate = drag_rate
+        self.virtual_screen = virtual_screen
+        self.batches = 0
+        self.events = 0
+        # One action's batch must not interleave with another thread's.
+        self._lock = threading.Lock()
+
+    def _submit(self, inputs: list[_INPUT]) -> None:
+        """Inject ``inputs`` with one SendInput call."""
+        if not inputs:
+            return
+        array = (_INPUT * len(inputs))(*inputs)
+        with self._lock:
+            sent = self._send(len(inputs), array, ctypes.sizeof(_INPUT))
+            self.batches += 1
+            self.events += sent
+        if sent != len(inputs):
+            # Blocked by UIPI, e.g. when the foreground window runs elevated.
+            error = ctypes.get_last_error() if self._user32 is not None else 0
+            raise OSError(error, f"SendInput injected {sent} of {len(inputs)} events")
+
+    def _screen(self) -> tuple[int, int, int, int]:
+        if self.virtual_screen is not None:
+            return self.virtual_screen
+        monitors = get_display_geometry().monitors
+        if monitors:
+            left = min(m.left for m in monitors)
+            top = min(m.top for m in monitors)
+            right = max(m.right for m in monitors)
+            bottom = max(m.bottom for m in monitors)
+            return left, top, right - left, bottom - top
+        if self._user32 is None:
+            return (0, 0, *get_display_geometry().physical_size)
+        metrics = self._user32.GetSystemMetrics
+        return (
+            metrics(_SM_XVIRTUALSCREEN),
+            metrics(_SM_YVIRTUALSCREEN),
+            metrics(_SM_CXVIRTUALSCREEN),
+            metrics(_SM_CYVIRTUALSCREEN),
+        )
+
+    @staticmethod
+    def _mouse(flags: int, dx: int = 0, dy: int = 0, data: int = 0) -> _INPUT:
+        event = _INPUT(type=_INPUT_MOUSE)
+        event.u.mi = _MOUSEINPUT(dx, dy, data & 0xFFFFFFFF, flags, 0, 0)
+        return event
+
+    def _move(self, x: int, y: int) -> _INPUT:
+        """Absolute move to physical ``(x, y)`` on the virtual desktop."""
+        left, top, width, height = self._screen()
+        # Normalized coordinates map 0..65535 onto the first..last pixel.
+        dx = round((x - left) * 65535 / max(1, width - 1))
+        dy = round((y - top) * 65535 / max(1, height - 1))
+        flags = _MOUSEEVENTF_MOVE | _MOUSEEVENTF_ABSOLUTE | _MOUSEEVENTF_VIRTUALDESK
+        return self._mouse(flags, dx, dy)
+
+    def _key(self, vk: int, up: bool = False) -> _INPUT:
+        flags = _KEYEVENTF_KEYUP if up else 0
+        if vk in _EXTENDED_KEYS:
+            flags |= _KEYEVENTF_EXTENDEDKEY
+        scan = 0
+        if self._user32 is not None:
+            scan = self._user32.MapVirtualKeyW(vk, _MAPVK_VK_TO_VSC)
+        event = _INPUT(type=_INPUT_KEYBOARD)
+        event.u.ki = _KEYBDINPUT(vk, scan, flags, 0, 0)
+        return event
+
+    @staticmethod
+    def _unicode(unit: int, up: bool = False) -> _INPUT:
+        flags = _KEYEVENTF_UNICODE | (_KEYEVENTF_KEYUP if up else 0)
+        event = _INPUT(type=_INPUT_KEYBOARD)
+        event.u.ki = _KEYBDINPUT(0, unit, flags, 0, 0)
+        return event
+
+    def _virtual_keys(self, key: str) -> list[int]:
+        """Virtual keys to hold for ``key``, modifiers first."""
+        vk = _VIRTUAL_KEYS.get(key.lower())
+        if vk is not None:
+            return [vk]
+        if len(key) != 1:
+            raise ValueError(f"Unknown key: {key}")
+        if key.isascii() and key.isalnum():
+            return [ord(key.upper())]
+        if self._user32 is None:
+            return []
+        scan = self._user32.VkKeyScanW(ord(key))
+        if scan == -1:
+            return []
+        shift_state = (scan >> 8) & 0xFF
+        modifiers = [vk for bit, vk in _SCAN_MODIFIERS if shift_state & bit]
+        return [*modifiers, scan & 0xFF]
+
+    def _text_events(self, text: str) -> list[_INPUT]:
+        inputs = []
+        for char in text.replace("\r\n", "\n"):
+            if char == "\n" or char == "\t":
+                vk = _VK_RETURN if char == "\n" else _VK_TAB
+                inputs += (self._key(vk), self._key(vk, up=True))
+                continue
+            # Characters outside the BMP are sent as two UTF-16 units.
+            encoded = char.encode("utf-16-le")
+            for i in range(0, len(encoded), 2):
+                unit = int.from_bytes(encoded[i : i + 2], "little")
+                inputs += (self._unicode(unit), self._unicode(unit, up=True))
+        return inputs
+
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1) -> None:
+        down, up = _BUTTONS.get(button, _BUTTONS["left"])
+        inputs = [self._move(x, y)]
+        for _ in range(clicks):
+            inputs += (self._mouse(down), self._mouse(up))
+        self._submit(inputs)
+
+    def drag(
+        self, start: tuple[int, int], end: tuple[int, int], duration: float
+    ) -> None:
+        down, up = _BUTTONS["left"]
+        steps = max(1, int(duration * self.drag_rate))
+        points = [
+            (
+                start[0] + (end[0] - start[0]) * k // steps,
+                start[1] + (end[1] - start[1]) * k // steps,
+            )
+            for k in range(1, steps + 1)
+        ]
+        if duration <= 0:
+            self._submit(
+                [
+                    self._move(*start),
+                    self._mouse(down),
+                    *(self._move(*p) for p in points),
+                    self._mouse(up),
+                ]
+            )
+            return
+
+        interval = duration / steps
+        self._submit([self._move(*start), self._mouse(down)])
+        began = time.perf_counter()
+        released = False
+        try:
+            for k, point in enumerate(points, 1):
+                # Sleep to an absolute deadline so the drag does not drift.
+                remaining = began + k * interval - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+                if k == steps:
+                    self._submit([self._move(*point), self._mouse(up)])
+                    released = True
+                else:
+                    self._submit([self._move(*point)])
+        finally:
+            if not released:
+                # Never leave the button held down.
+                self._submit([self._mouse(up)])
+
+    def scroll(self, amount: int) -> None:
+        self._submit([self._mouse(_MOUSEEVENTF_WHEEL, data=amount * _WHEEL_DELTA)])
+
+    def hotkey(self, *keys: str) -> None:
+        names = split_hotkey(*keys)
+        held: list[int] = []
+        typed: list[_INPUT] = []
+        for name in names:
+            codes = self._virtual_keys(name)
+            if not codes:
+                # No key on the current layout: type the character instead.
+                typed += self._text_events(name)
+            for code in codes:
+                if code not in held:
+                    held.append(code)
+        self._submit(
+            [self._key(code) for code in held]
+            + typed
+            + [self._key(code, up=True) for code in reversed(held)]
+        )
+
+    def press(self, key: str) -> None:
+        self.hotkey(key)
+
+    def paste_text(self, text: str) -> None:
+        self._submit(self._text_events(text))
+
+
+__all__ = ["SendInputBackend"]
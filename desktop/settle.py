@@ -0,0 +1,163 @@
+"""Visual settle detection for Windows desktop actions.
+
+Instead of sleeping a fixed amount of time after every action, the settle
+detector samples cheap low-resolution frames and returns as soon as the
+screen has stopped changing for a few consecutive samples.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from PIL import Image, ImageChops
+
+from Windows.config.timing import TIMING_CONFIG, SettleTimingConfig
+from Windows.desktop.capture import get_capture_backend
+
+
+@dataclass
+class SettleResult:
+    """Outcome of waiting for the screen to settle."""
+
+    settled: bool
+    elapsed: float
+    frames: int
+    budget: float = 0.0
+
+    @property
+    def saved(self) -> float:
+        """Wall-clock time saved compared to the fixed delay budget."""
+        return self.budget - self.elapsed
+
+
+def grab_thumbnail(factor: int = 8) -> Image.Image:
+    """
+    Capture a low-resolution grayscale frame of the desktop.
+
+    Args:
+        factor: Integer downscale factor applied to the full-screen grab.
+
+    Returns:
+        Grayscale PIL image suitable for cheap frame comparison.
+    """
+    img = get_capture_backend().grab()
+    if factor > 1:
+        img = img.reduce(factor)
+    return img.convert("L")
+
+
+def frame_change_ratio(
+    previous: Image.Image, current: Image.Image, pixel_threshold: int = 16
+) -> float:
+    """
+    Compute the fraction of pixels that changed between two thumbnails.
+
+    Args:
+        previous: Earlier grayscale thumbnail.
+        current: Later grayscale thumbnail.
+        pixel_threshold: Minimum per-pixel difference counted as a change.
+
+    Returns:
+        Ratio of changed pixels in the range 0.0-1.0.
+    """
+    if previous.size != current.size:
+        return 1.0
+
+    diff = ImageChops.difference(previous, current)
+    histogram = diff.histogram()
+    changed = sum(histogram[pixel_threshold:])
+    total = current.size[0] * current.size[1]
+    return changed / total if total else 0.0
+
+
+class SettleDetector:
+    """
+    Waits until the screen is visually stable after an action.
+
+    Args:
+        config: Settle configuration. Defaults to TIMING_CONFIG.settle.
+        grab: Optional frame source returning grayscale thumbnails.
+    """
+
+    def __init__(
+        self,
+        config: SettleTimingConfig | None = None,
+        grab: Callable[[], Image.Image] | None = None,
+    ):
+        self._config = config
+        self._grab = grab
+
+    @property
+    def config(self) -> SettleTimingConfig:
+        """Active settle configuration."""
+        return self._config or TIMING_CONFIG.settle
+
+    @property
+    def minimum_wait(self) -> float:
+        """Shortest possible wait: the initial delay plus the stable samples."""
+        config = self.config
+        return config.min_delay + config.stable_frames * config.sample_interval
+
+    def grab(self) -> Image.Image:
+        """Capture one comparison frame."""
+        if self._grab is not None:
+            return self._grab()
+        return grab_thumbnail(self.config.thumbnail_factor)
+
+    def wait(self, budget: float = 0.0, timeout: float | None = None) -> SettleResult:
+        """
+        Block until the screen has been stable for the configured frames.
+
+        Args:
+            budget: Fixed delay this wait replaces, used for reporting savings.
+            timeout: Maximum time to wait. Defaults to config.max_timeout.
+
+        Returns:
+            SettleResult describing how long the wait took.
+        """
+        config = self.config
+        timeout = config.max_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+
+        if config.min_delay > 0:
+            time.sleep(config.min_delay)
+
+        previous = self.grab()
+        frames = 1
+        stable = 0
+
+        while stable < config.stable_frames:
+            if time.perf_counter() >= deadline:
+                return SettleResult(
+                    settled=False,
+                    elapsed=time.perf_counter() - start,
+                    frames=frames,
+                    budget=budget,
+                )
+
+            time.sleep(config.sample_interval)
+            current = self.grab()
+            frames += 1
+
+            ratio = frame_change_ratio(previous, current, config.pixel_threshold)
+            if ratio <= config.change_threshold:
+                stable += 1
+            else:
+                stable = 0
+            previous = current
+
+        return SettleResult(
+            settled=True,
+            elapsed=time.perf_counter() - start,
+            frames=frames,
+            budget=budget,
+        )
+
+
+__all__ = [
+    "SettleDetector",
+    "SettleResult",
+    "frame_change_ratio",
+    "grab_thumbnail",
+]
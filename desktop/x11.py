@@ -0,0 +1,839 @@
+"""X11 desktop backends for headless Linux workers.
+
+Implements capture, input and foreground-window lookup against an X server
+(typically one Xvfb display per agent), through ctypes bindings to libX11,
+libXext and libXtst, so the functions exported by ``Windows.desktop`` work
+unchanged on Linux:
+
+- ``X11CaptureBackend``: grabs the root window with MIT-SHM into a reused
+  shared-memory image (``XGetImage`` when SHM is unavailable) and reads the
+  active window title and rectangle through EWMH.
+- ``X11InputBackend``: injects mouse and keyboard events with XTest. Text is
+  typed key by key, temporarily binding a spare keycode for characters the
+  keyboard map lacks, so no clipboard owner is needed.
+- ``XvfbDisplay``: starts and stops an Xvfb server.
+
+Agents select these backends through ``WINDOWS_CAPTURE_BACKEND=x11`` and
+``WINDOWS_INPUT_BACKEND=x11`` (the default on Linux when ``DISPLAY`` is set)
+and connect to ``DISPLAY``. Backends are process-wide, so a node hosts one
+agent process per display.
+
+Usage:
+    python -m Windows.desktop.x11 --displays 4 --size 1920x1080
+"""
+
+import ctypes
+import ctypes.util
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from Windows.desktop.capture import BBox, CaptureBackend
+from Windows.desktop.input import InputBackend, split_hotkey
+
+_ZPIXMAP = 2
+_ALL_PLANES = ctypes.c_ulong(-1).value
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+_IS_VIEWABLE = 2
+_XA_STRING = 31
+_ANY_PROPERTY_TYPE = 0
+
+# pyautogui key names that differ from X keysym names.
+_KEYSYMS = {
+    "ctrl": "Control_L",
+    "ctrlleft": "Control_L",
+    "ctrlright": "Control_R",
+    "control": "Control_L",
+    "shift": "Shift_L",
+    "shiftleft": "Shift_L",
+    "shiftright": "Shift_R",
+    "alt": "Alt_L",
+    "altleft": "Alt_L",
+    "altright": "Alt_R",
+    "win": "Super_L",
+    "winleft": "Super_L",
+    "winright": "Super_R",
+    "super": "Super_L",
+    "cmd": "Super_L",
+    "enter": "Return",
+    "return": "Return",
+    "esc": "Escape",
+    "escape": "Escape",
+    "tab": "Tab",
+    "space": "space",
+    "backspace": "BackSpace",
+    "delete": "Delete",
+    "del": "Delete",
+    "insert": "Insert",
+    "home": "Home",
+    "end": "End",
+    "pageup": "Prior",
+    "pgup": "Prior",
+    "pagedown": "Next",
+    "pgdn": "Next",
+    "up": "Up",
+    "down": "Down",
+    "left": "Left",
+    "right": "Right",
+    "capslock": "Caps_Lock",
+    "printscreen": "Print",
+    "menu": "Menu",
+    "apps": "Menu",
+}
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("funcs", ctypes.c_void_p * 6),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class _XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ("x", ctypes.c_int),
+        ("y", ctypes.c_int),
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("border_width", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("visual", ctypes.c_void_p),
+        ("root", ctypes.c_ulong),
+        ("class", ctypes.c_int),
+        ("bit_gravity", ctypes.c_int),
+        ("win_gravity", ctypes.c_int),
+        ("backing_store", ctypes.c_int),
+        ("backing_planes", ctypes.c_ulong),
+        ("backing_pixel", ctypes.c_ulong),
+        ("save_under", ctypes.c_int),
+        ("colormap", ctypes.c_ulong),
+        ("map_installed", ctypes.c_int),
+        ("map_state", ctypes.c_int),
+        ("all_event_masks", ctypes.c_long),
+        ("your_event_mask", ctypes.c_long),
+        ("do_not_propagate_mask", ctypes.c_long),
+        ("override_redirect", ctypes.c_int),
+        ("screen", ctypes.c_void_p),
+    ]
+
+
+_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+def _load(name: str, required: bool = True) -> ctypes.CDLL | None:
+    path = ctypes.util.find_library(name)
+    if path is None:
+        if required:
+            raise OSError(f"lib{name} not found")
+        return None
+    return ctypes.CDLL(path)
+
+
+def _declare(lib: ctypes.CDLL, name: str, restype, *argtypes) -> None:
+    func = getattr(lib, name)
+    func.restype = restype
+    func.argtypes = argtypes
+
+
+class _Xlib:
+    """ctypes bindings, loaded once per process."""
+
+    _instance: "_Xlib | None" = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "_Xlib":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        vp, ul, i, u = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_uint
+        x = self.x = _load("X11")
+        _declare(x, "XInitThreads", i)
+        _declare(x, "XOpenDisplay", vp, ctypes.c_char_p)
+        _declare(x, "XCloseDisplay", i, vp)
+        _declare(x, "XSetErrorHandler", vp, _ERROR_HANDLER)
+        _declare(x, "XDefaultScreen", i, vp)
+        _declare(x, "XRootWindow", ul, vp, i)
+        _declare(x, "XDefaultVisual", vp, vp, i)
+        _declare(x, "XDefaultDepth", i, vp, i)
+        _declare(x, "XDisplayWidth", i, vp, i)
+        _declare(x, "XDisplayHeight", i, vp, i)
+        _declare(x, "XGetImage", ctypes.POINTER(_XImage), vp, ul, i, i, u, u, ul, i)
+        _declare(x, "XDestroyImage", i, ctypes.POINTER(_XImage))
+        _declare(x, "XSync", i, vp, i)
+        _declare(x, "XFlush", i, vp)
+        _declare(x, "XFree", i, vp)
+        _declare(x, "XInternAtom", ul, vp, ctypes.c_char_p, i)
+        _declare(
+            x,
+            "XGetWindowProperty",
+            i,
+            vp,
+            ul,
+            ul,
+            ctypes.c_long,
+            ctypes.c_long,
+            i,
+            ul,
+            ctypes.POINTER(ul),
+            ctypes.POINTER(i),
+            ctypes.POINTER(ul),
+            ctypes.POINTER(ul),
+            ctypes.POINTER(vp),
+        )
+        _declare(
+            x, "XGetWindowAttributes", i, vp, ul, ctypes.POINTER(_XWindowAttributes)
+        )
+        _declare(
+            x,
+            "XTranslateCoordinates",
+            i,
+            vp,
+            ul,
+            ul,
+            i,
+            i,
+            ctypes.POINTER(i),
+            ctypes.POINTER(i),
+            ctypes.POINTER(ul),
+        )
+        _declare(x, "XStringToKeysym", ul, ctypes.c_char_p)
+        _declare(x, "XKeysymToKeycode", ctypes.c_ubyte, vp, ul)
+        _declare(x, "XkbKeycodeToKeysym", ul, vp, ctypes.c_ubyte, i, i)
+        _declare(x, "XDisplayKeycodes", i, vp, ctypes.POINTER(i), ctypes.POINTER(i))
+        _declare(
+            x, "XGetKeyboardMapping", ctypes.POINTER(ul), vp, ctypes.c_ubyte, i,
+            ctypes.POINTER(i),
+        )
+        _declare(x, "XChangeKeyboardMapping", i, vp, i, i, ctypes.POINTER(ul), i)
+        x.XInitThreads()
+
+        self.ext = _load("Xext", required=False)
+        if self.ext is not None:
+            e = self.ext
+            _declare(e, "XShmQueryExtension", i, vp)
+            _declare(
+                e,
+                "XShmCreateImage",
+                ctypes.POINTER(_XImage),
+                vp,
+                vp,
+                u,
+                i,
+                vp,
+                ctypes.POINTER(_XShmSegmentInfo),
+                u,
+                u,
+            )
+            _declare(e, "XShmAttach", i, vp, ctypes.POINTER(_XShmSegmentInfo))
+            _declare(e, "XShmDetach", i, vp, ctypes.POINTER(_XShmSegmentInfo))
+            _declare(e, "XShmGetImage", i, vp, ul, ctypes.POINTER(_XImage), i, i, ul)
+
+        self.libc = _load("c")
+        _declare(self.libc, "shmget", i, i, ctypes.c_size_t, i)
+        _declare(self.libc, "shmat", vp, i, vp, i)
+        _declare(self.libc, "shmdt", i, vp)
+        _declare(self.libc, "shmctl", i, i, i, vp)
+
+        self.xtst = _load("Xtst", required=False)
+        if self.xtst is not None:
+            t = self.xtst
+            _declare(t, "XTestFakeMotionEvent", i, vp, i, i, i, ul)
+            _declare(t, "XTestFakeButtonEvent", i, vp, u, i, ul)
+            _declare(t, "XTestFakeKeyEvent", i, vp, u, i, ul)
+
+        # The default handler exits the process; record errors instead.
+        self.last_error = 0
+        self._handler = _ERROR_HANDLER(self._on_error)
+        x.XSetErrorHandler(self._handler)
+
+    def _on_error(self, display, event) -> int:
+        # XErrorEvent.error_code is the byte after type, display, resourceid
+        # and serial.
+        offset = ctypes.sizeof(ctypes.c_int) + 3 * ctypes.sizeof(ctypes.c_void_p)
+        self.last_error = ctypes.c_ubyte.from_address(event + offset).value or -1
+        return 0
+
+
+class _Connection:
+    """A display connection shared by the calls of one backend."""
+
+    def __init__(self, display: str | None):
+        self.lib = _Xlib.get()
+        self.name = display or os.environ.get("DISPLAY")
+        if not self.name:
+            raise OSError("No X display: pass display= or set DISPLAY")
+        self.display = self.lib.x.XOpenDisplay(self.name.encode())
+        if not self.display:
+            raise OSError(f"Cannot open X display {self.name}")
+        self.screen = self.lib.x.XDefaultScreen(self.display)
+        self.root = self.lib.x.XRootWindow(self.display, self.screen)
+        self.lock = threading.Lock()
+        self._atoms: dict[str, int] = {}
+
+    def close(self) -> None:
+        if self.display:
+            self.lib.x.XCloseDisplay(self.display)
+            self.display = None
+
+    def atom(self, name: str) -> int:
+        if name not in self._atoms:
+            self._atoms[name] = self.lib.x.XInternAtom(self.display, name.encode(), 0)
+        return self._atoms[name]
+
+    def screen_size(self) -> tuple[int, int]:
+        return (
+            self.lib.x.XDisplayWidth(self.display, self.screen),
+            self.lib.x.XDisplayHeight(self.display, self.screen),
+        )
+
+    def property(self, window: int, name: str, type_name: str | None = None):
+        """Raw bytes and format of a window property, or None."""
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        count = ctypes.c_ulong()
+        remaining = ctypes.c_ulong()
+        data = ctypes.c_void_p()
+        req_type = self.atom(type_name) if type_name else _ANY_PROPERTY_TYPE
+        status = self.lib.x.XGetWindowProperty(
+            self.display,
+            window,
+            self.atom(name),
+            0,
+            1024,
+            0,
+            req_type,
+            ctypes.byref(actual_type),
+            ctypes.byref(actual_format),
+            ctypes.byref(count),
+            ctypes.byref(remaining),
+            ctypes.byref(data),
+        )
+        if status != 0 or not data.value:
+            return None
+        try:
+            if actual_format.value == 32:
+                # Format-32 items are returned as C longs.
+                values = ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))
+                return [values[k] for k in range(count.value)], 32
+            size = count.value * actual_format.value // 8
+            return ctypes.string_at(data, size), actual_format.value
+        finally:
+            self.lib.x.XFree(data)
+
+    def active_window(self) -> int | None:
+        """The window named by the root's ``_NET_ACTIVE_WINDOW``, if any."""
+        result = self.property(self.root, "_NET_ACTIVE_WINDOW")
+        if result is None or result[1] != 32 or not result[0]:
+            return None
+        return result[0][0] or None
+
+
+class X11CaptureBackend(CaptureBackend):
+    """
+    Capture backend reading the root window of an X display.
+
+    The shared-memory image is created on first use and kept until the
+    screen size changes or ``close`` is called, so each grab costs a single
+    ``XShmGetImage`` plus one conversion into a PIL image.
+
+    Args:
+        display: Display name such as ":1". Defaults to ``DISPLAY``.
+        use_shm: Use MIT-SHM when the server supports it.
+    """
+
+    name = "x11"
+
+    def __init__(self, display: str | None = None, use_shm: bool = True):
+        self._conn = _Connection(display)
+        self._lib = self._conn.lib
+        self._use_shm = (
+            use_shm
+            and self._lib.ext is not None
+            and bool(self._lib.ext.XShmQueryExtension(self._conn.display))
+        )
+        self._image = None
+        self._shm: _XShmSegmentInfo | None = None
+        self._size = (0, 0)
+
+    @property
+    def display(self) -> str:
+        return self._conn.name
+
+    def _ensure_shm(self, size: tuple[int, int]) -> bool:
+        if self._image is not None and size == self._size:
+            return True
+        self._release()
+
+        conn, ext, libc = self._conn, self._lib.ext, self._lib.libc
+        shm = _XShmSegmentInfo()
+        image = ext.XShmCreateImage(
+            conn.display,
+            self._lib.x.XDefaultVisual(conn.display, conn.screen),
+            self._lib.x.XDefaultDepth(conn.display, conn.screen),
+            _ZPIXMAP,
+            None,
+            ctypes.byref(shm),
+            size[0],
+            size[1],
+        )
+        if not image:
+            return False
+
+        length = image.contents.bytes_per_line * image.contents.height
+        shm.shmid = libc.shmget(_IPC_PRIVATE, length, _IPC_CREAT | 0o600)
+        if shm.shmid < 0:
+            self._lib.x.XDestroyImage(image)
+            return False
+        shm.shmaddr = libc.shmat(shm.shmid, None, 0)
+        shm.readOnly = 0
+        image.contents.data = shm.shmaddr
+
+        self._lib.last_error = 0
+        attached = ext.XShmAttach(conn.display, ctypes.byref(shm))
+        self._lib.x.XSync(conn.display, 0)
+        # The segment is freed once both sides detach.
+        libc.shmctl(shm.shmid, _IPC_RMID, None)
+        self._image, self._shm, self._size = image, shm, size
+        if not attached or self._lib.last_error:
+            # Typically a server on another host: fall back to XGetImage.
+            self._release()
+            return False
+        return True
+
+    def grab(self, bbox: BBox | None = None) -> Image.Image:
+        with self._conn.lock:
+            size = self._conn.screen_size()
+            if self._use_shm and self._ensure_shm(size):
+                ok = self._lib.ext.XShmGetImage(
+                    self._conn.display, self._conn.root, self._image, 0, 0, _ALL_PLANES
+                )
+                if not ok:
+                    raise OSError("XShmGetImage failed")
+                img = self._to_pil(self._image.contents)
+            else:
+                self._use_shm = False
+                image = self._lib.x.XGetImage(
+                    self._conn.display,
+                    self._conn.root,
+                    0,
+                    0,
+                    size[0],
+                    size[1],
+                    _ALL_PLANES,
+                    _ZPIXMAP,
+                )
+                if not image:
+                    raise OSError("XGetImage failed")
+                try:
+                    img = self._to_pil(image.contents)
+                finally:
+                    self._lib.x.XDestroyImage(image)
+
+        return img.crop(bbox) if bbox else img
+
+    @staticmethod
+    def _to_pil(image: _XImage) -> Image.Image:
+        if image.bits_per_pixel != 32:
+            raise OSError(f"Unsupported X image depth: {image.bits_per_pixel} bpp")
+        length = image.bytes_per_line * image.height
+        buffer = (ctypes.c_char * length).from_address(image.data)
+        # RGB from BGRX cannot share memory, so this copies out of the
+        # reused buffer before the next grab overwrites it.
+        return Image.frombuffer(
+            "RGB",
+            (image.width, image.height),
+            buffer,
+            "raw",
+            "BGRX",
+            image.bytes_per_line,
+            1,
+        )
+
+    def window_title(self) -> str:
+        with self._conn.lock:
+            window = self._conn.active_window()
+            if window is None:
+                return ""
+            result = self._conn.property(window, "_NET_WM_NAME", "UTF8_STRING")
+            if result is not None:
+                return result[0].decode("utf-8", "replace")
+            result = self._conn.property(window, "WM_NAME")
+            if result is not None and result[1] == 8:
+                return result[0].decode("latin-1")
+        return ""
+
+    def window_rect(self) -> BBox | None:
+        with self._conn.lock:
+            window = self._conn.active_window()
+            if window is None:
+                return None
+            attrs = _XWindowAttributes()
+            if not self._lib.x.XGetWindowAttributes(
+                self._conn.display, window, ctypes.byref(attrs)
+            ):
+                return None
+            if attrs.map_state != _IS_VIEWABLE:
+                return None
+            x, y, child = ctypes.c_int(), ctypes.c_int(), ctypes.c_ulong()
+            self._lib.x.XTranslateCoordinates(
+                self._conn.display,
+                window,
+                self._conn.root,
+                0,
+                0,
+                ctypes.byref(x),
+                ctypes.byref(y),
+                ctypes.byref(child),
+            )
+        return (x.value, y.value, x.value + attrs.width, y.value + attrs.height)
+
+    def _release(self) -> None:
+        if self._image is not None:
+            if self._shm is not None:
+                self._lib.ext.XShmDetach(self._conn.display, ctypes.byref(self._shm))
+                self._lib.x.XSync(self._conn.display, 0)
+                self._lib.libc.shmdt(self._shm.shmaddr)
+            # The pixels live in the segment; keep XDestroyImage off them.
+            self._image.contents.data = None
+            self._lib.x.XDestroyImage(self._image)
+        self._image = self._shm = None
+        self._size = (0, 0)
+
+    def close(self) -> None:
+        with self._conn.lock:
+            self._release()
+            self._conn.close()
+
+
+class X11InputBackend(InputBackend):
+    """
+    Input backend injecting events into an X display with XTest.
+
+    Args:
+        display: Display name such as ":1". Defaults to ``DISPLAY``.
+        drag_rate: Motion events per second generated during drags.
+    """
+
+    name = "x11"
+
+    _BUTTONS = {"left": 1, "middle": 2, "right": 3}
+    _SCROLL_UP, _SCROLL_DOWN = 4, 5
+
+    def __init__(self, display: str | None = None, drag_rate: int = 60):
+        self._conn = _Connection(display)
+        self._lib = self._conn.lib
+        if self._lib.xtst is None:
+            self._conn.close()
+            raise OSError("libXtst not found; install the XTest client library")
+        self._xtst = self._lib.xtst
+        self.drag_rate = drag_rate
+        self._scratch_keycode: int | None = None
+
+    @property
+    def display(self) -> str:
+        return self._conn.name
+
+    def _move(self, x: int, y: int, delay_ms: int = 0) -> None:
+        self._xtst.XTestFakeMotionEvent(self._conn.display, -1, x, y, delay_ms)
+
+    def _button(self, button: int, pressed: bool, delay_ms: int = 0) -> None:
+        self._xtst.XTestFakeButtonEvent(
+            self._conn.display, button, int(pressed), delay_ms
+        )
+
+    def _key(self, keycode: int, pressed: bool) -> None:
+        self._xtst.XTestFakeKeyEvent(self._conn.display, keycode, int(pressed), 0)
+
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1) -> None:
+        code = self._BUTTONS.get(button, 1)
+        with self._conn.lock:
+            self._move(x, y)
+            for _ in range(clicks):
+                self._button(code, True)
+                self._button(code, False)
+            self._lib.x.XFlush(self._conn.display)
+
+    def drag(
+        self, start: tuple[int, int], end: tuple[int, int], duration: float
+    ) -> None:
+        steps = max(1, int(duration * self.drag_rate))
+        # The server spaces the events out itself: one round trip per drag.
+        delay_ms = int(duration * 1000 / steps)
+        with self._conn.lock:
+            self._move(*start)
+            self._button(1, True)
+            for k in range(1, steps + 1):
+                x = start[0] + (end[0] - start[0]) * k // steps
+                y = start[1] + (end[1] - start[1]) * k // steps
+                self._move(x, y, delay_ms)
+            self._button(1, False)
+            self._lib.x.XSync(self._conn.display, 0)
+
+    def scroll(self, amount: int) -> None:
+        button = self._SCROLL_UP if amount > 0 else self._SCROLL_DOWN
+        with self._conn.lock:
+            for _ in range(abs(amount)):
+                self._button(button, True)
+                self._button(button, False)
+            self._lib.x.XFlush(self._conn.display)
+
+    def _keycode(self, key: str) -> int:
+        name = _KEYSYMS.get(key.lower(), key)
+        if len(name) > 1 and name[0] == "f" and name[1:].isdigit():
+            name = name.upper()
+        keysym = self._lib.x.XStringToKeysym(name.encode())
+        keycode = self._lib.x.XKeysymToKeycode(self._conn.display, keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"Unknown key: {key}")
+        return keycode
+
+    def _key_codes(self, key: str) -> list[int]:
+        """Keycodes to hold for ``key``, with shift for characters such as "+"."""
+        if len(key) == 1 and not key.isalnum() and key.lower() not in _KEYSYMS:
+            x, display = self._lib.x, self._conn.display
+            keysym = ord(key) if ord(key) <= 0xFF else 0x01000000 | ord(key)
+            keycode = x.XKeysymToKeycode(display, keysym)
+            if keycode:
+                if x.XkbKeycodeToKeysym(display, keycode, 0, 0) == keysym:
+                    return [keycode]
+                if x.XkbKeycodeToKeysym(display, keycode, 0, 1) == keysym:
+                    return [self._keycode("shift"), keycode]
+        return [self._keycode(key)]
+
+    def hotkey(self, *keys: str) -> None:
+        names = split_hotkey(*keys)
+        with self._conn.lock:
+            codes: list[int] = []
+            for name in names:
+                codes += [c for c in self._key_codes(name) if c not in codes]
+            for code in codes:
+                self._key(code, True)
+            for code in reversed(codes):
+                self._key(code, False)
+            self._lib.x.XFlush(self._conn.display)
+
+    def press(self, key: str) -> None:
+        self.hotkey(key)
+
+    def paste_text(self, text: str) -> None:
+        with self._conn.lock:
+            try:
+                for char in text:
+                    self._type_char(char)
+            finally:
+                if self._scratch_keycode is not None:
+                    self._bind_scratch(0)
+                self._lib.x.XSync(self._conn.display, 0)
+
+    def _type_char(self, char: str) -> None:
+        if char == "\n":
+            keysym = self._lib.x.XStringToKeysym(b"Return")
+        elif char == "\t":
+            keysym = self._lib.x.XStringToKeysym(b"Tab")
+        elif 0x20 <= ord(char) <= 0xFF:
+            keysym = ord(char)
+        else:
+            keysym = 0x01000000 | ord(char)
+
+        x, display = self._lib.x, self._conn.display
+        keycode = x.XKeysymToKeycode(display, keysym)
+        shift = 0
+        if keycode and x.XkbKeycodeToKeysym(display, keycode, 0, 0) != keysym:
+            shift = self._keycode("shift")
+            if x.XkbKeycodeToKeysym(display, keycode, 0, 1) != keysym:
+                keycode = shift = 0
+        if not keycode:
+            keycode = self._bind_scratch(keysym)
+
+        if shift:
+            self._key(shift, True)
+        self._key(keycode, True)
+        self._key(keycode, False)
+        if shift:
+            self._key(shift, False)
+
+    def _bind_scratch(self, keysym: int) -> int:
+        """Map ``keysym`` on an unused keycode and return that keycode."""
+        if self._scratch_keycode is None:
+            self._scratch_keycode = self._find_unused_keycode()
+        symbols = (ctypes.c_ulong * 2)(keysym, keysym)
+        self._lib.x.XChangeKeyboardMapping(
+            self._conn.display, self._scratch_keycode, 2, symbols, 1
+        )
+        # The new mapping must reach the server before the key event.
+        self._lib.x.XSync(self._conn.display, 0)
+        return self._scratch_keycode
+
+    def _find_unused_keycode(self) -> int:
+        x, display = self._lib.x, self._conn.display
+        low, high = ctypes.c_int(), ctypes.c_int()
+        x.XDisplayKeycodes(display, ctypes.byref(low), ctypes.byref(high))
+        per_code = ctypes.c_int()
+        count = high.value - low.value + 1
+        mapping = x.XGetKeyboardMapping(display, low.value, count, ctypes.byref(per_code))
+        try:
+            for index in range(count - 1, -1, -1):
+                row = mapping[index * per_code.value : (index + 1) * per_code.value]
+                if not any(row):
+                    return low.value + index
+        finally:
+            x.XFree(mapping)
+        raise OSError("No unused keycode available for typing text")
+
+    def close(self) -> None:
+        with self._conn.lock:
+            self._conn.close()
+
+
+class XvfbDisplay:
+    """
+    An Xvfb virtual display running as a child process.
+
+    Args:
+        number: Display number; the first free one from 99 when None.
+        size: Screen size in pixels.
+        depth: Color depth in bits.
+
+    Example:
+        >>> with XvfbDisplay(size=(1280, 720)) as display:
+        ...     subprocess.run(["python", "worker.py"], env=display.env())
+    """
+
+    def __init__(
+        self,
+        number: int | None = None,
+        size: tuple[int, int] = (1920, 1080),
+        depth: int = 24,
+    ):
+        self.number = number
+        self.size = size
+        self.depth = depth
+        self.process: subprocess.Popen | None = None
+
+    @property
+    def name(self) -> str:
+        return f":{self.number}"
+
+    @staticmethod
+    def _in_use(number: int) -> bool:
+        return (
+            Path(f"/tmp/.X{number}-lock").exists()
+            or Path(f"/tmp/.X11-unix/X{number}").exists()
+        )
+
+    def start(self, timeout: float = 10.0) -> "XvfbDisplay":
+        """Start Xvfb and wait until it accepts connections."""
+        executable = shutil.which("Xvfb")
+        if executable is None:
+            raise OSError("Xvfb not found; install xvfb")
+        if self.number is None:
+            self.number = next(n for n in range(99, 1000) if not self._in_use(n))
+
+        screen = f"{self.size[0]}x{self.size[1]}x{self.depth}"
+        self.process = subprocess.Popen(
+            [executable, self.name, "-screen", "0", screen, "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        socket = Path(f"/tmp/.X11-unix/X{self.number}")
+        deadline = time.monotonic() + timeout
+        while not socket.exists():
+            if self.process.poll() is not None:
+                raise OSError(f"Xvfb exited with code {self.process.returncode}")
+            if time.monotonic() > deadline:
+                self.stop()
+                raise TimeoutError(f"Xvfb {self.name} did not start")
+            time.sleep(0.05)
+        return self
+
+    def stop(self) -> None:
+        """Terminate the Xvfb process."""
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+    def env(self, base: dict[str, str] | None = None) -> dict[str, str]:
+        """Environment for an agent process bound to this display."""
+        env = dict(os.environ if base is None else base)
+        env["DISPLAY"] = self.name
+        env["WINDOWS_CAPTURE_BACKEND"] = "x11"
+        env["WINDOWS_INPUT_BACKEND"] = "x11"
+        return env
+
+    def __enter__(self) -> "XvfbDisplay":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+__all__ = [
+    "X11CaptureBackend",
+    "X11InputBackend",
+    "XvfbDisplay",
+]
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Start Xvfb displays for agents")
+    parser.add_argument("--displays", type=int, default=1)
+    parser.add_argument("--size", default="1920x1080")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    displays = [XvfbDisplay(size=(width, height)).start() for _ in range(args.displays)]
+    for display in displays:
+        print(f"DISPLAY={display.name} WINDOWS_CAPTURE_BACKEND=x11 WINDOWS_INPUT_BACKEND=x11")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for display in displays:
+            display.stop()
+
+
+if __name__ == "__main__":
+    main()
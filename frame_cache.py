@@ -0,0 +1,126 @@
+"""Per-run perceptual-hash cache of frames the model has already reasoned about.
+
+Agents often loop on Wait or Scroll and get back a frame that is effectively
+identical to one they already saw. Each step's pre-action frame hash is kept
+with the model response and the recent action history. When a new frame
+matches an earlier one within a Hamming threshold and the recent actions are
+the same, the agent either reuses the earlier response without a model call
+or tells the model that the screen did not change.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from Windows.desktop.imagehash import hamming_distances
+
+NO_CHANGE_HINT = (
+    "** 画面未变化 **\n"
+    "当前画面与第 {step} 步时几乎相同，且此后执行的操作也相同，"
+    "之前的操作可能没有生效，请换一种方式。"
+)
+
+
+@dataclass
+class FrameCacheConfig:
+    """Configuration for the per-run frame cache.
+
+    Attributes:
+        threshold: Maximum Hamming distance between 64-bit frame hashes
+            treated as the same frame.
+        history_length: Number of most recent actions that must also match.
+        mode: ``"hint"`` always calls the model but adds a no-change hint;
+            ``"reuse"`` replays the cached response without a model call.
+        max_reuse: Times one cached response may be reused before falling
+            back to the hint, so a repeated frame cannot loop forever.
+    """
+
+    threshold: int = 4
+    history_length: int = 2
+    mode: str = "hint"
+    max_reuse: int = 1
+
+    def __post_init__(self):
+        if self.mode not in ("hint", "reuse"):
+            raise ValueError(f"Unknown frame cache mode: {self.mode}")
+
+
+@dataclass
+class FrameCacheEntry:
+    """A previously seen frame and the model's decision for it."""
+
+    step: int
+    history: tuple[str, ...]
+    response: Any
+    reuses: int = 0
+
+
+class FrameCache:
+    """
+    Frame hashes of the current run, searched with one vectorized comparison.
+
+    Args:
+        config: Cache settings.
+    """
+
+    def __init__(self, config: FrameCacheConfig | None = None):
+        self.config = config or FrameCacheConfig()
+        self._hashes = np.empty(16, dtype=np.uint64)
+        self._entries: list[FrameCacheEntry] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def reset(self) -> None:
+        """Forget all frames for a new task."""
+        self._entries.clear()
+
+    def lookup(
+        self, frame_hash: int, history: tuple[str, ...]
+    ) -> FrameCacheEntry | None:
+        """
+        Find the most recent matching frame with the same action history.
+
+        Args:
+            frame_hash: 64-bit hash of the current frame.
+            history: Most recent actions, oldest first.
+
+        Returns:
+            The matching entry, or None.
+        """
+        count = len(self._entries)
+        if count == 0:
+            return None
+        distances = hamming_distances(self._hashes[:count], frame_hash)
+        for index in np.flatnonzero(distances <= self.config.threshold)[::-1]:
+            entry = self._entries[index]
+            if entry.history == history:
+                return entry
+        return None
+
+    def add(
+        self, frame_hash: int, step: int, history: tuple[str, ...], response: Any
+    ) -> None:
+        """
+        Remember the model response given for a frame.
+
+        Args:
+            frame_hash: 64-bit hash of the pre-action frame.
+            step: Step number the frame was seen at.
+            history: Most recent actions before the frame, oldest first.
+            response: Model response chosen on the frame.
+        """
+        count = len(self._entries)
+        if count == len(self._hashes):
+            self._hashes = np.resize(self._hashes, count * 2)
+        self._hashes[count] = frame_hash
+        self._entries.append(FrameCacheEntry(step, history, response))
+
+
+__all__ = [
+    "FrameCache",
+    "FrameCacheConfig",
+    "FrameCacheEntry",
+    "NO_CHANGE_HINT",
+]
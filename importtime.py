@@ -0,0 +1,177 @@
+"""Cold-import budget for the package's entry points.
+
+Each check imports one entry point in a fresh interpreter under
+``python -X importtime`` and fails when the import takes longer than its
+budget or loads a module that is supposed to be deferred until first use
+(model clients, input libraries, imaging). Import time is the sum of the
+per-module self times reported by the interpreter, excluding modules an
+empty interpreter already imports at start-up, best of ``--repeat`` runs.
+
+Usage:
+    python -m Windows.importtime
+    python -m Windows.importtime --repeat 5 --top 15
+    python -m Windows.importtime --scale 2.0   # slower machine / CI
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Deferred by every entry point: only loaded once a model client or input
+# backend is created.
+DEFERRED = ("openai", "httpx", "phone_agent", "pyautogui", "pyperclip")
+# Additionally deferred by lightweight entry points.
+IMAGING = ("numpy", "PIL")
+
+
+@dataclass
+class ImportCheck:
+    """
+    An entry point and its cold-import budget.
+
+    Attributes:
+        statement: Python statement performing the import.
+        budget: Maximum import time in seconds.
+        forbidden: Top-level packages that must not be imported.
+    """
+
+    statement: str
+    budget: float
+    forbidden: tuple[str, ...] = field(default_factory=tuple)
+
+
+DEFAULT_CHECKS = [
+    ImportCheck("import Windows", 0.04, DEFERRED + IMAGING),
+    ImportCheck("import Windows.config", 0.08, DEFERRED + IMAGING),
+    ImportCheck("from Windows.worker import AgentWorker", 0.12, DEFERRED + IMAGING),
+    ImportCheck("from Windows import WindowsAgent", 0.5, DEFERRED),
+    ImportCheck("from Windows import AsyncWindowsAgent", 0.5, DEFERRED),
+]
+
+
+def _package_root() -> str:
+    """Directory containing the ``Windows`` package."""
+    return str(Path(os.path.abspath(__file__)).parent.parent)
+
+
+def measure_import(statement: str) -> dict[str, int]:
+    """
+    Run ``statement`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        Self time in microseconds per imported module.
+
+    Raises:
+        RuntimeError: If the statement fails.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (_package_root(), env.get("PYTHONPATH")) if p
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{proc.stderr.strip()}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            modules[name.strip()] = int(self_us)
+    return modules
+
+
+def run_check(check: ImportCheck, repeat: int = 3, scale: float = 1.0) -> dict:
+    """
+    Measure an import check.
+
+    Args:
+        check: The entry point and its budget.
+        repeat: Runs to take the fastest of.
+        scale: Multiplier applied to the budget.
+
+    Returns:
+        Dict with the statement, seconds, budget, the forbidden modules that
+        were imported and the self time per module of the fastest run.
+    """
+    startup = set(measure_import("pass"))
+    best: dict[str, int] | None = None
+    for _ in range(max(1, repeat)):
+        modules = {
+            name: us
+            for name, us in measure_import(check.statement).items()
+            if name not in startup
+        }
+        if best is None or sum(modules.values()) < sum(best.values()):
+            best = modules
+
+    loaded = {name.split(".")[0] for name in best}
+    return {
+        "statement": check.statement,
+        "seconds": sum(best.values()) / 1e6,
+        "budget": check.budget * scale,
+        "violations": sorted(loaded & set(check.forbidden)),
+        "modules": best,
+    }
+
+
+def format_check(result: dict, top: int = 10) -> str:
+    """Human-readable summary of a check, with its slowest top-level packages."""
+    ok = result["seconds"] <= result["budget"] and not result["violations"]
+    lines = [
+        f"{'✅' if ok else '❌'} {result['statement']}: "
+        f"{result['seconds'] * 1000:.1f}ms (budget {result['budget'] * 1000:.0f}ms)"
+    ]
+    if result["violations"]:
+        lines.append(f"   deferred modules imported: {', '.join(result['violations'])}")
+
+    packages: dict[str, int] = {}
+    for name, us in result["modules"].items():
+        key = name.split(".")[0]
+        if key == "Windows":
+            key = ".".join(name.split(".")[:2])
+        packages[key] = packages.get(key, 0) + us
+    for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"   {us / 1000:>8.1f}ms  {name}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "DEFAULT_CHECKS",
+    "DEFERRED",
+    "IMAGING",
+    "ImportCheck",
+    "format_check",
+    "measure_import",
+    "run_check",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-import time budget")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="budget multiplier")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    failed = False
+    for check in DEFAULT_CHECKS:
+        result = run_check(check, args.repeat, args.scale)
+        print(format_check(result, args.top))
+        failed |= result["seconds"] > result["budget"] or bool(result["violations"])
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
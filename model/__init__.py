@@ -0,0 +1,59 @@
+"""Model client utilities for Windows Agent."""
+
+from typing import TYPE_CHECKING
+
+from Windows._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from Windows.model.async_client import AsyncModelClient
+    from Windows.model.cascade import CascadeConfig, ModelCascade
+    from Windows.model.pool import (
+        DeadlineExceeded,
+        PooledModelClient,
+        close_http_clients,
+        get_http_client,
+    )
+    from Windows.model.response import split_response
+    from Windows.model.router import EndpointStats, ModelRouter
+    from Windows.model.streaming import (
+        ActionStreamDetector,
+        CancelToken,
+        RequestCancelled,
+        StreamingModelClient,
+    )
+
+_EXPORTS = {
+    "AsyncModelClient": "Windows.model.async_client",
+    "CascadeConfig": "Windows.model.cascade",
+    "ModelCascade": "Windows.model.cascade",
+    "DeadlineExceeded": "Windows.model.pool",
+    "PooledModelClient": "Windows.model.pool",
+    "close_http_clients": "Windows.model.pool",
+    "get_http_client": "Windows.model.pool",
+    "split_response": "Windows.model.response",
+    "EndpointStats": "Windows.model.router",
+    "ModelRouter": "Windows.model.router",
+    "ActionStreamDetector": "Windows.model.streaming",
+    "CancelToken": "Windows.model.streaming",
+    "RequestCancelled": "Windows.model.streaming",
+    "StreamingModelClient": "Windows.model.streaming",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    "AsyncModelClient",
+    "ActionStreamDetector",
+    "CascadeConfig",
+    "CancelToken",
+    "DeadlineExceeded",
+    "EndpointStats",
+    "ModelCascade",
+    "ModelRouter",
+    "PooledModelClient",
+    "RequestCancelled",
+    "close_http_clients",
+    "get_http_client",
+    "StreamingModelClient",
+    "split_response",
+]
@@ -0,0 +1,107 @@
+"""Asyncio model client for OpenAI-compatible endpoints."""
+
+import time
+from typing import Any
+
+from phone_agent.model import ModelConfig
+from phone_agent.model.client import ModelResponse
+
+from Windows.config.http import HttpClientConfig
+from Windows.model.pool import (
+    DeadlineExceeded,
+    acall_with_retry,
+    create_async_openai_client,
+)
+from Windows.model.response import split_response
+
+
+class AsyncModelClient:
+    """
+    Non-blocking counterpart of ``phone_agent.model.ModelClient``.
+
+    Requests are streamed so that many clients can share one event loop while
+    their responses are in flight. Clients on the same loop share a keep-alive
+    pool per endpoint, and retryable errors are retried with backoff.
+
+    Args:
+        config: Model configuration.
+        http_config: Pool and retry settings. Defaults to the global config.
+    """
+
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        http_config: HttpClientConfig | None = None,
+    ):
+        self.config = config or ModelConfig()
+        self.http_config = http_config
+        # The pooled client is bound to the event loop, so create it there.
+        self.client = None
+
+    async def request(
+        self, messages: list[dict[str, Any]], deadline: float | None = None
+    ) -> ModelResponse:
+        """
+        Send a chat completion request and collect the streamed response.
+
+        Args:
+            messages: Conversation context in OpenAI message format.
+            deadline: Optional ``time.monotonic()`` deadline for all attempts.
+
+        Returns:
+            ModelResponse with thinking and action split out.
+        """
+        if self.client is None:
+            self.client = create_async_openai_client(self.config, self.http_config)
+        return await acall_with_retry(
+            lambda timeout: self._request_once(messages, timeout, deadline),
+            self.http_config,
+            deadline,
+        )
+
+    async def _request_once(
+        self,
+        messages: list[dict[str, Any]],
+        timeout: float,
+        deadline: float | None = None,
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        stream = await self.client.chat.completions.create(
+            messages=messages,
+            model=self.config.model_name,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            top_p=self.config.top_p,
+            frequency_penalty=self.config.frequency_penalty,
+            extra_body=self.config.extra_body,
+            stream=True,
+            timeout=timeout,
+        )
+
+        parts: list[str] = []
+        time_to_first_token = None
+        async for chunk in stream:
+            # The read timeout only bounds each chunk, not the response.
+            if deadline is not None and time.monotonic() >= deadline:
+                await stream.close()
+                raise DeadlineExceeded("Request deadline exceeded")
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+                parts.append(content)
+
+        raw_content = "".join(parts)
+        thinking, action = split_response(raw_content)
+        response = ModelResponse(
+            thinking=thinking, action=action, raw_content=raw_content
+        )
+        response.time_to_first_token = time_to_first_token
+        response.total_time = time.perf_counter() - start
+        return response
+
+    async def close(self) -> None:
+        """Release the client; the pooled connections stay open for reuse."""
+        self.client = None
@@ -0,0 +1,264 @@
+"""Small/large model cascade with confidence-based escalation.
+
+Each step is first proposed by the smallest model. Its answer is accepted
+unless it fails to parse or names an unknown action or bad arguments,
+repeats the same action, closes a loop of recent actions, or comes with low
+confidence; in those cases the next larger tier is asked, up to the last
+tier whose answer is always taken. The action history is read from the
+assistant turns already in the conversation, so the cascade itself keeps no
+per-task state.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+from Windows.actions.handler import parse_action
+from Windows.actions.schema import InvalidAction, Plan
+
+if TYPE_CHECKING:
+    from phone_agent.model.client import ModelResponse
+
+_ANSWER_RE = re.compile(r"<answer>(.*?)</answer>", re.DOTALL)
+_CONFIDENCE_RE = re.compile(r"(?:置信度|confidence)\s*[:：=]\s*([01](?:\.\d+)?)", re.I)
+
+
+@dataclass
+class CascadeConfig:
+    """Escalation rules of the model cascade.
+
+    Attributes:
+        repeat_limit: Escalate when the proposed action would be the
+            ``repeat_limit``-th identical action in a row.
+        loop_period: Longest cycle of actions (e.g. A, B, A, B has period 2)
+            the loop detector looks for.
+        loop_repeats: Escalate when the proposed action completes this many
+            repetitions of a cycle.
+        min_confidence: Escalate when the response confidence (mean token
+            probability, or a "置信度: 0.x" note in the thinking) is lower.
+        logprobs: Request token log-probabilities from the smaller tiers.
+    """
+
+    repeat_limit: int = 3
+    loop_period: int = 4
+    loop_repeats: int = 2
+    min_confidence: float = 0.0
+    logprobs: bool = False
+
+
+class TierStats:
+    """Call counts and latency of one cascade tier."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.accepted = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.escalations: dict[str, int] = {}
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "accepted": self.accepted,
+            "errors": self.errors,
+            "escalations": dict(self.escalations),
+            "total_latency": round(self.total_latency, 3),
+            "mean_latency": (
+                round(self.total_latency / self.calls, 3) if self.calls else None
+            ),
+        }
+
+
+def _normalize(action: str) -> str:
+    return re.sub(r"\s+", "", action)
+
+
+def action_history(messages: list[dict[str, Any]]) -> list[str]:
+    """
+    Actions of the assistant turns in a conversation, oldest first.
+
+    Args:
+        messages: Conversation in OpenAI message format.
+
+    Returns:
+        The normalized action text of each assistant turn.
+    """
+    history = []
+    for message in messages:
+        content = message.get("content")
+        if message.get("role") != "assistant" or not isinstance(content, str):
+            continue
+        match = _ANSWER_RE.search(content)
+        history.append(_normalize(match.group(1) if match else content))
+    return history
+
+
+def detect_loop(history: list[str], max_period: int, repeats: int) -> int | None:
+    """
+    Find a cycle repeated at the end of an action history.
+
+    Args:
+        history: Actions, oldest first.
+        max_period: Longest cycle length checked.
+        repeats: Repetitions of the cycle required.
+
+    Returns:
+        The period of the shortest cycle of length 2 or more found, or None.
+    """
+    for period in range(2, max_period + 1):
+        span = period * repeats
+        if len(history) < span:
+            break
+        tail = history[-span:]
+        block = tail[:period]
+        if len(set(block)) > 1 and tail == block * repeats:
+            return period
+    return None
+
+
+def response_confidence(response: "ModelResponse") -> float | None:
+    """Confidence carried by a response: token probability or a stated value."""
+    confidence = getattr(response, "confidence", None)
+    if confidence is not None:
+        return confidence
+    match = _CONFIDENCE_RE.search(response.thinking or "")
+    return float(match.group(1)) if match else None
+
+
+class ModelCascade:
+    """
+    Model client asking increasingly large models until an answer is accepted.
+
+    ``request`` has the same signature as ``StreamingModelClient.request``.
+    Only the last tier receives ``on_action``, because answers of smaller
+    tiers must be checked before they may run. The returned response has
+    ``tier`` set to the name of the answering tier and ``escalations`` to
+    the reasons smaller tiers were skipped.
+
+    Args:
+        tiers: ``(name, client)`` pairs from smallest to largest.
+        config: Escalation rules.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[tuple[str, Any]],
+        config: CascadeConfig | None = None,
+    ):
+        if not tiers:
+            raise ValueError("ModelCascade needs at least one tier")
+        self.config = config or CascadeConfig()
+        self.tiers = list(tiers)
+        self._stats = [TierStats(name) for name, _ in self.tiers]
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-tier call counts, escalation reasons and latency."""
+        with self._lock:
+            return {s.name: s.snapshot() for s in self._stats}
+
+    def escalation_reason(
+        self, response: "ModelResponse", history: list[str]
+    ) -> str | None:
+        """
+        Check a smaller tier's answer.
+
+        Args:
+            response: The tier's response.
+            history: Actions of previous turns, oldest first.
+
+        Returns:
+            Why the answer should be escalated, or None to accept it.
+        """
+        try:
+            action = parse_action(response.action)
+        except ValueError:
+            return "parse"
+        actions = action.actions if isinstance(action, Plan) else [action]
+        if any(isinstance(a, InvalidAction) for a in actions):
+            # Unknown action or bad arguments: as unusable as a syntax error.
+            return "parse"
+
+        proposed = history + [_normalize(response.action)]
+        limit = self.config.repeat_limit
+        if limit > 1 and len(proposed) >= limit and len(set(proposed[-limit:])) == 1:
+            return "repeat"
+        if detect_loop(proposed, self.config.loop_period, self.config.loop_repeats):
+            return "loop"
+
+        confidence = response_confidence(response)
+        if confidence is not None and confidence < self.config.min_confidence:
+            return "confidence"
+        return None
+
+    def request(
+        self,
+        messages: list[dict[str, Any]],
+        on_action: Callable[[str], None] | None = None,
+        deadline: float | None = None,
+    ) -> "ModelResponse":
+        """
+        Query the tiers from smallest to largest until an answer is accepted.
+
+        Args:
+            messages: Conversation context in OpenAI message format.
+            on_action: Early dispatch callback, given to the last tier only.
+            deadline: Optional ``time.monotonic()`` deadline.
+
+        Returns:
+            The accepted ModelResponse.
+        """
+        history = action_history(messages)
+        escalations: list[str] = []
+        last = len(self.tiers) - 1
+
+        for index, (name, client) in enumerate(self.tiers):
+            kwargs: dict[str, Any] = {}
+            if deadline is not None:
+                kwargs["deadline"] = deadline
+            if index == last and on_action is not None:
+                kwargs["on_action"] = on_action
+
+            stats = self._stats[index]
+            start = time.perf_counter()
+            try:
+                response = client.request(messages, **kwargs)
+            except Exception:
+                with self._lock:
+                    stats.calls += 1
+                    stats.errors += 1
+                    stats.total_latency += time.perf_counter() - start
+                if index == last:
+                    raise
+                escalations.append(f"{name}:error")
+                continue
+
+            reason = None if index == last else self.escalation_reason(response, history)
+            with self._lock:
+                stats.calls += 1
+                stats.total_latency += time.perf_counter() - start
+                if reason is None:
+                    stats.accepted += 1
+                else:
+                    stats.escalations[reason] = stats.escalations.get(reason, 0) + 1
+
+            if reason is None:
+                response.tier = name
+                response.escalations = escalations
+                return response
+            escalations.append(f"{name}:{reason}")
+
+        raise RuntimeError("unreachable")
+
+
+__all__ = [
+    "CascadeConfig",
+    "ModelCascade",
+    "TierStats",
+    "action_history",
+    "detect_loop",
+    "response_confidence",
+]
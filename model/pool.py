@@ -0,0 +1,339 @@
+"""Pooled HTTP clients and retry policy for model requests.
+
+Model clients share one keep-alive connection pool per endpoint, so agents
+and tasks in the same process reuse TLS/HTTP connections instead of paying
+connection setup on every request. Requests are retried on retryable errors
+(429, 5xx, timeouts, connection failures) with jittered exponential backoff,
+bounded by an optional deadline: no attempt or backoff starts past it and
+each attempt's read timeout is clamped to it. Streaming clients also check
+it between chunks with ``check_deadline`` and drop the stream once it
+passes, so a slowly trickling response cannot run past the deadline.
+"""
+
+import asyncio
+import copy
+import random
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, TypeVar
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
+from phone_agent.model import ModelClient, ModelConfig
+from phone_agent.model.client import ModelResponse
+
+from Windows.config.http import HttpClientConfig, get_http_config
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({408, 409, 429})
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request cannot complete within its deadline."""
+
+
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+# Event loop -> {endpoint: AsyncClient}; entries go away with their loop.
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _endpoint(base_url: str) -> str:
+    """Pool key for a base URL: scheme, host and port."""
+    url = httpx.URL(base_url)
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+
+def _limits(config: HttpClientConfig) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+
+
+def _timeout(config: HttpClientConfig) -> httpx.Timeout:
+    return httpx.Timeout(config.read_timeout, connect=config.connect_timeout)
+
+
+def get_http_client(
+    base_url: str, config: HttpClientConfig | None = None
+) -> httpx.Client:
+    """
+    Get the shared keep-alive HTTP client for an endpoint.
+
+    Args:
+        base_url: Any URL of the endpoint.
+        config: Pool settings used when the client is first created.
+
+    Returns:
+        The process-wide httpx.Client for the endpoint.
+    """
+    key = _endpoint(base_url)
+    with _lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            config = config or get_http_config()
+            client = httpx.Client(limits=_limits(config), timeout=_timeout(config))
+            _clients[key] = client
+        return client
+
+
+def get_async_http_client(
+    base_url: str, config: HttpClientConfig | None = None
+) -> httpx.AsyncClient:
+    """
+    Get the shared keep-alive asyncio HTTP client for an endpoint.
+
+    Async connections are bound to an event loop, so there is one pool per
+    endpoint and running loop. Must be called from within the loop.
+
+    Args:
+        base_url: Any URL of the endpoint.
+        config: Pool settings used when the client is first created.
+
+    Returns:
+        The httpx.AsyncClient for the endpoint on the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    key = _endpoint(base_url)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            config = config or get_http_config()
+            client = httpx.AsyncClient(
+                limits=_limits(config), timeout=_timeout(config)
+            )
+            clients[key] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """Close all pooled synchronous clients and forget the async ones."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _async_clients.clear()
+    for client in clients:
+        client.close()
+
+
+def create_openai_client(
+    config: ModelConfig, http_config: HttpClientConfig | None = None
+) -> OpenAI:
+    """
+    Create an OpenAI client on the shared pool for the model endpoint.
+
+    SDK-level retries are disabled; use call_with_retry instead.
+    """
+    return OpenAI(
+        base_url=config.base_url,
+        api_key=config.api_key,
+        http_client=get_http_client(config.base_url, http_config),
+        max_retries=0,
+    )
+
+
+def create_async_openai_client(
+    config: ModelConfig, http_config: HttpClientConfig | None = None
+) -> AsyncOpenAI:
+    """Asyncio counterpart of create_openai_client; call from the event loop."""
+    return AsyncOpenAI(
+        base_url=config.base_url,
+        api_key=config.api_key,
+        http_client=get_async_http_client(config.base_url, http_config),
+        max_retries=0,
+    )
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed request is worth retrying.
+
+    Args:
+        error: Exception raised by the request.
+
+    Returns:
+        True for rate limits, server errors, timeouts and connection errors.
+    """
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return isinstance(
+        error, (openai.APIConnectionError, httpx.TransportError, ConnectionError)
+    )
+
+
+def retry_delay(
+    attempt: int, config: HttpClientConfig, error: BaseException | None = None
+) -> float:
+    """
+    Backoff before the next attempt.
+
+    Uses full jitter over an exponential window, or the server's
+    ``Retry-After`` header when present, capped at ``backoff_max``.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 0.
+        config: Backoff settings.
+        error: Exception of the failed attempt.
+
+    Returns:
+        Seconds to wait.
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), config.backoff_max)
+        except ValueError:
+            pass
+    window = min(config.backoff_max, config.backoff_base * 2**attempt)
+    return random.uniform(0, window)
+
+
+def check_deadline(deadline: float | None) -> None:
+    """
+    Fail once a request deadline has passed.
+
+    Args:
+        deadline: ``time.monotonic()`` deadline, or None for no deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed.
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+def _attempt_timeout(config: HttpClientConfig, deadline: float | None) -> float:
+    """Timeout for the next attempt, clamped to the remaining deadline."""
+    if deadline is None:
+        return config.read_timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(config.read_timeout, remaining)
+
+
+def call_with_retry(
+    func: Callable[[float], T],
+    config: HttpClientConfig | None = None,
+    deadline: float | None = None,
+    should_retry: Callable[[BaseException], bool] = is_retryable,
+) -> T:
+    """
+    Call a request function, retrying retryable failures with backoff.
+
+    Args:
+        func: Performs one attempt; receives the attempt timeout in seconds.
+        config: Retry settings. Defaults to the global HTTP config.
+        deadline: ``time.monotonic()`` value after which no attempt starts
+            and no backoff sleeps past.
+        should_retry: Decides whether an exception is retried.
+
+    Returns:
+        The result of the first successful attempt.
+
+    Raises:
+        DeadlineExceeded: If the deadline is reached before success.
+    """
+    config = config or get_http_config()
+    attempt = 0
+    while True:
+        timeout = _attempt_timeout(config, deadline)
+        try:
+            return func(timeout)
+        except Exception as e:
+            if attempt >= config.max_retries or not should_retry(e):
+                raise
+            delay = retry_delay(attempt, config, e)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise DeadlineExceeded("Request deadline exceeded") from e
+            time.sleep(delay)
+            attempt += 1
+
+
+async def acall_with_retry(
+    func: Callable[[float], Awaitable[T]],
+    config: HttpClientConfig | None = None,
+    deadline: float | None = None,
+    should_retry: Callable[[BaseException], bool] = is_retryable,
+) -> T:
+    """Asyncio counterpart of call_with_retry."""
+    config = config or get_http_config()
+    attempt = 0
+    while True:
+        timeout = _attempt_timeout(config, deadline)
+        try:
+            return await func(timeout)
+        except Exception as e:
+            if attempt >= config.max_retries or not should_retry(e):
+                raise
+            delay = retry_delay(attempt, config, e)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise DeadlineExceeded("Request deadline exceeded") from e
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class PooledModelClient(ModelClient):
+    """
+    ``phone_agent.model.ModelClient`` on the shared pool, with retries.
+
+    Args:
+        config: Model configuration.
+        http_config: Pool and retry settings. Defaults to the global config.
+    """
+
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        http_config: HttpClientConfig | None = None,
+    ):
+        # Not ModelClient.__init__: it would build an unpooled client.
+        self.config = config or ModelConfig()
+        self.http_config = http_config
+        self.client = create_openai_client(self.config, http_config)
+
+    def request(
+        self, messages: list[dict[str, Any]], deadline: float | None = None
+    ) -> ModelResponse:
+        """
+        Send a request, retrying retryable failures.
+
+        Args:
+            messages: Conversation context in OpenAI message format.
+            deadline: Optional ``time.monotonic()`` deadline.
+
+        Returns:
+            ModelResponse from the first successful attempt.
+        """
+
+        def attempt(timeout: float) -> ModelResponse:
+            # A per-attempt copy: concurrent requests must not see each
+            # other's timeout through the shared ``self.client``.
+            client = copy.copy(self)
+            client.client = self.client.with_options(timeout=timeout)
+            return ModelClient.request(client, messages)
+
+        return call_with_retry(attempt, self.http_config, deadline)
+
+
+__all__ = [
+    "DeadlineExceeded",
+    "PooledModelClient",
+    "acall_with_retry",
+    "call_with_retry",
+    "check_deadline",
+    "close_http_clients",
+    "create_async_openai_client",
+    "create_openai_client",
+    "get_async_http_client",
+    "get_http_client",
+    "is_retryable",
+    "retry_delay",
+]
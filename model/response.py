@@ -0,0 +1,28 @@
+"""Helpers for splitting raw model output into thinking and action parts."""
+
+
+def split_response(content: str) -> tuple[str, str]:
+    """
+    Split raw model output into thinking text and the action clause.
+
+    Follows the same rules as ``phone_agent.model.ModelClient``: the action
+    starts at the first ``finish(message=`` or ``do(action=`` marker, with a
+    fallback to ``<answer>`` tags and finally to the whole content.
+
+    Args:
+        content: Raw text returned by the model.
+
+    Returns:
+        Tuple of (thinking, action).
+    """
+    for marker in ("finish(message=", "do(action="):
+        if marker in content:
+            thinking, action = content.split(marker, 1)
+            return thinking.strip(), marker + action
+
+    if "<answer>" in content:
+        thinking, action = content.split("<answer>", 1)
+        thinking = thinking.replace("<think>", "").replace("</think>", "").strip()
+        return thinking, action.replace("</answer>", "").strip()
+
+    return "", content
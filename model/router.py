@@ -0,0 +1,361 @@
+"""Hedged request routing across interchangeable model endpoints.
+
+The router sends each request to one endpoint, picked at random weighted by
+its recent latency and error rate. If no response has arrived once that
+endpoint's p95 latency has passed, a duplicate request goes to the next
+best endpoint, and whichever finishes first wins while the other is
+cancelled. Failed requests fail over to the next endpoint immediately.
+Per-endpoint latency and error statistics feed back into the weighting.
+
+Usage:
+    python -m Windows.model.router
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from phone_agent.model import ModelConfig
+from phone_agent.model.client import ModelResponse
+
+from Windows.config.http import HttpClientConfig, RouterConfig
+from Windows.model.streaming import (
+    CancelToken,
+    RequestCancelled,
+    StreamingModelClient,
+)
+
+
+class EndpointStats:
+    """
+    Rolling latency and error statistics of one endpoint.
+
+    Args:
+        window: Number of recent outcomes kept.
+    """
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.wins = 0
+        self.hedges = 0
+        self.cancelled = 0
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(latency)
+            self._outcomes.append(True)
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self._outcomes.append(False)
+
+    def record_cancelled(self, elapsed: float) -> None:
+        # A cancelled request would have taken at least this long; keeping
+        # the lower bound stops slow endpoints from hiding their tail.
+        with self._lock:
+            self.requests += 1
+            self.cancelled += 1
+            self._latencies.append(elapsed)
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def percentile(self, q: float) -> float | None:
+        """Latency percentile (0-100) over the window, or None without samples."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(q / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            outcomes = list(self._outcomes)
+        if not outcomes:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Statistics as a plain dict for reporting."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "wins": self.wins,
+            "hedges": self.hedges,
+            "error_rate": round(self.error_rate, 3),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+        }
+
+
+@dataclass
+class Endpoint:
+    """A routed endpoint: its client and statistics."""
+
+    config: ModelConfig
+    client: StreamingModelClient
+    stats: EndpointStats
+
+    @property
+    def name(self) -> str:
+        return self.config.base_url
+
+
+class ModelRouter:
+    """
+    Model client routing and hedging requests across several endpoints.
+
+    ``request`` has the same signature as ``StreamingModelClient.request``,
+    so the router can be used wherever a single client is.
+
+    Args:
+        configs: Model configurations of the interchangeable endpoints.
+        config: Hedging settings.
+        http_config: Pool and retry settings for the endpoint clients.
+
+    Example:
+        >>> router = ModelRouter([
+        ...     ModelConfig(base_url="http://gpu-a:8000/v1"),
+        ...     ModelConfig(base_url="http://gpu-b:8000/v1"),
+        ... ])
+        >>> response = router.request(messages)
+        >>> router.stats()
+    """
+
+    def __init__(
+        self,
+        configs: Sequence[ModelConfig],
+        config: RouterConfig | None = None,
+        http_config: HttpClientConfig | None = None,
+    ):
+        if not configs:
+            raise ValueError("ModelRouter needs at least one endpoint")
+        self.config = config or RouterConfig()
+        self.endpoints = [
+            Endpoint(
+                c, StreamingModelClient(c, http_config), EndpointStats(self.config.window)
+            )
+            for c in configs
+        ]
+        # The first endpoint's config stands in for the router's.
+        self.model_config = configs[0]
+        # Cancelled losers can hold a worker until their server answers, so
+        # leave enough headroom that a hedge never queues behind them.
+        self._executor = ThreadPoolExecutor(
+            max_workers=8 * len(self.endpoints), thread_name_prefix="ModelRouter"
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-endpoint statistics keyed by base URL."""
+        return {e.name: e.stats.snapshot() for e in self.endpoints}
+
+    def close(self) -> None:
+        """Stop the worker threads; in-flight losers are abandoned."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cost(self, endpoint: Endpoint) -> float:
+        """Expected cost of an endpoint: median latency inflated by errors."""
+        p50 = endpoint.stats.percentile(50)
+        if p50 is None:
+            p50 = self.config.hedge_delay / 2
+        return max(p50, 1e-3) * (1 + 4 * endpoint.stats.error_rate)
+
+    def _order(self) -> list[Endpoint]:
+        """Primary endpoint by weighted random choice, then the rest by cost."""
+        weights = [1 / self._cost(e) for e in self.endpoints]
+        primary = random.choices(self.endpoints, weights=weights)[0]
+        rest = sorted((e for e in self.endpoints if e is not primary), key=self._cost)
+        return [primary, *rest]
+
+    def _hedge_delay(self, endpoint: Endpoint) -> float:
+        if endpoint.stats.samples < self.config.min_samples:
+            return self.config.hedge_delay
+        return endpoint.stats.percentile(95) or self.config.hedge_delay
+
+    def _call(
+        self,
+        endpoint: Endpoint,
+        messages: list[dict[str, Any]],
+        on_action: Callable[[str], None],
+        deadline: float | None,
+        token: CancelToken,
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        try:
+            response = endpoint.client.request(
+                messages, on_action=on_action, deadline=deadline, cancel=token
+            )
+        except RequestCancelled:
+            endpoint.stats.record_cancelled(time.perf_counter() - start)
+            raise
+        except Exception:
+            if token.cancelled:
+                endpoint.stats.record_cancelled(time.perf_counter() - start)
+            else:
+                endpoint.stats.record_error()
+            raise
+        endpoint.stats.record_success(time.perf_counter() - start)
+        return response
+
+    def request(
+        self,
+        messages: list[dict[str, Any]],
+        on_action: Callable[[str], None] | None = None,
+        deadline: float | None = None,
+    ) -> ModelResponse:
+        """
+        Send a request with hedging and failover.
+
+        Args:
+            messages: Conversation context in OpenAI message format.
+            on_action: Called once with the action clause of the request
+                that dispatches first; that request then wins and the
+                others are cancelled.
+            deadline: Optional ``time.monotonic()`` deadline.
+
+        Returns:
+            ModelResponse of the winning request.
+        """
+        queue = self._order()
+        pending: dict[Future, Endpoint] = {}
+        tokens: list[tuple[Endpoint, CancelToken]] = []
+        lock = threading.Lock()
+        committed: list[Endpoint] = []
+
+        def cancel_others(winner: Endpoint | None) -> None:
+            with lock:
+                others = [t for e, t in tokens if e is not winner]
+            for token in others:
+                token.cancel()
+
+        def launch() -> Endpoint:
+            endpoint = queue.pop(0)
+            token = CancelToken()
+            with lock:
+                tokens.append((endpoint, token))
+
+            def dispatch(clause: str) -> None:
+                with lock:
+                    if committed:
+                        return
+                    committed.append(endpoint)
+                cancel_others(endpoint)
+                if on_action is not None:
+                    on_action(clause)
+
+            future = self._executor.submit(
+                self._call, endpoint, messages, dispatch, deadline, token
+            )
+            pending[future] = endpoint
+            return endpoint
+
+        current = launch()
+        hedges = 0
+        hedge_at = time.monotonic() + self._hedge_delay(current)
+        last_error: BaseException | None = None
+
+        while pending:
+            can_hedge = (
+                self.config.hedge
+                and queue
+                and hedges < self.config.max_hedges
+                and not committed
+            )
+            timeout = max(0.0, hedge_at - time.monotonic()) if can_hedge else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                current = launch()
+                current.stats.hedges += 1
+                hedges += 1
+                hedge_at = time.monotonic() + self._hedge_delay(current)
+                continue
+
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    response = future.result()
+                except RequestCancelled:
+                    continue
+                except Exception as e:
+                    last_error = e
+                    if committed and committed[0] is endpoint:
+                        # Its action already ran; another answer would not match.
+                        cancel_others(None)
+                        raise
+                    continue
+
+                if committed and committed[0] is not endpoint:
+                    # Finished before its cancellation landed; the dispatched
+                    # request's answer is the one that counts.
+                    continue
+
+                endpoint.stats.wins += 1
+                cancel_others(endpoint)
+                return response
+
+            if not pending and queue and not committed:
+                # Everything in flight failed: fail over right away.
+                current = launch()
+                hedge_at = time.monotonic() + self._hedge_delay(current)
+
+        if last_error is not None:
+            raise last_error
+        raise RequestCancelled()
+
+
+__all__ = [
+    "Endpoint",
+    "EndpointStats",
+    "ModelRouter",
+]
+
+
+def main() -> None:
+    """Compare latency with and without hedging against a slow-tailed endpoint."""
+    from Windows.model.stub_server import StubModelServer
+
+    rng = random.Random(0)
+    fast = StubModelServer(latency=0.05).start()
+    tail = StubModelServer(latency=lambda: 1.0 if rng.random() < 0.03 else 0.05).start()
+    configs = [ModelConfig(base_url=tail.base_url), ModelConfig(base_url=fast.base_url)]
+
+    for hedge in (False, True):
+        router = ModelRouter(configs, RouterConfig(hedge=hedge, hedge_delay=0.2))
+        latencies = []
+        for _ in range(200):
+            start = time.perf_counter()
+            router.request([{"role": "user", "content": "ping"}])
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(
+            f"hedge={hedge}: p50 {latencies[len(latencies) // 2] * 1000:.0f}ms  "
+            f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f}ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.0f}ms  "
+            f"max {latencies[-1] * 1000:.0f}ms"
+        )
+        for name, stats in router.stats().items():
+            print(f"  {name} {stats}")
+        router.close()
+
+    fast.stop()
+    tail.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Streaming model requests with early action detection.
+
+The streaming client hands the ``do(...)``/``finish(...)`` clause to a
+callback as soon as it closes syntactically, while the rest of the response
+keeps streaming and is still recorded in full.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable
+
+from phone_agent.model import ModelConfig
+from phone_agent.model.client import ModelResponse
+
+from Windows.actions.parser import ACTION_MARKER, ActionParser
+from Windows.config.http import HttpClientConfig
+from Windows.model.pool import (
+    DeadlineExceeded,
+    call_with_retry,
+    check_deadline,
+    create_openai_client,
+    is_retryable,
+)
+from Windows.model.response import split_response
+
+
+class ActionStreamDetector:
+    """
+    Incrementally detects a complete action clause in streamed text.
+
+    Chunks go to an ``ActionParser``, which only re-parses the open clause
+    once a closing parenthesis arrives, so text such as
+    ``do(action="Type", text="a)b")`` is only reported once it really closes
+    and malformed clauses are skipped. Like ``parse_action``, only clauses
+    after the ``动作:`` marker count: a clause quoted in the thinking is
+    never reported, and a reply without the marker dispatches nothing early.
+    Nothing is reported after a malformed clause either, since
+    ``parse_action`` fails on it.
+    """
+
+    def __init__(self):
+        self.action: str | None = None
+        self.start: int | None = None
+        self._parser = ActionParser(marker=ACTION_MARKER)
+        self._stopped = False
+
+    @property
+    def buffer(self) -> str:
+        """All text received so far."""
+        return self._parser.text
+
+    def feed(self, text: str) -> str | None:
+        """
+        Add streamed text.
+
+        Args:
+            text: Newly received chunk of the response.
+
+        Returns:
+            The action clause the first time it closes, otherwise None.
+        """
+        if self.action is not None or self._stopped:
+            self._parser.text += text
+            return None
+
+        clauses = self._parser.feed(text)
+        errors = self._parser.errors
+        failed = errors[0].clause_start if errors else None
+        if errors and failed is None:
+            failed = errors[0].position
+        if failed is not None and (not clauses or failed < clauses[0].start):
+            # ``parse_action`` stops at the first malformed clause, so no
+            # later clause can be the action: stop looking.
+            self._stopped = True
+            self.start = None
+            return None
+        if not clauses:
+            self.start = self._parser.pending
+            return None
+        clause = clauses[0]
+        self.start = clause.start
+        self.action = self.buffer[clause.start : clause.end]
+        return self.action
+
+
+class RequestCancelled(Exception):
+    """Raised by a streamed request that was cancelled through its CancelToken."""
+
+
+class CancelToken:
+    """
+    Cancels an in-flight streamed request from another thread.
+
+    Cancelling closes the response stream, so the request stops reading at
+    once and its connection is released.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stream: Any = None
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Cancel the request."""
+        with self._lock:
+            self.cancelled = True
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def attach(self, stream: Any) -> None:
+        """Register the response stream to close on cancellation."""
+        with self._lock:
+            if not self.cancelled:
+                self._stream = stream
+                return
+        stream.close()
+        raise RequestCancelled()
+
+
+class StreamingModelClient:
+    """
+    Model client that streams responses and dispatches actions early.
+
+    ``request`` is a drop-in replacement for ``ModelClient.request`` with an
+    optional ``on_action`` callback invoked with the action clause as soon as
+    it is complete. Requests run on the shared connection pool and are
+    retried on retryable errors until the action has been dispatched.
+
+    Args:
+        config: Model configuration.
+        http_config: Pool and retry settings. Defaults to the global config.
+        logprobs: Request token log-probabilities and set the response's
+            ``confidence`` to the mean token probability.
+    """
+
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        http_config: HttpClientConfig | None = None,
+        logprobs: bool = False,
+    ):
+        self.config = config or ModelConfig()
+        self.http_config = http_config
+        self.logprobs = logprobs
+        self.client = create_openai_client(self.config, http_config)
+
+    def request(
+        self,
+        messages: list[dict[str, Any]],
+        on_action: Callable[[str], None] | None = None,
+        deadline: float | None = None,
+        cancel: CancelToken | None = None,
+    ) -> ModelResponse:
+        """
+        Send a streamed chat completion request.
+
+        Args:
+            messages: Conversation context in OpenAI message format.
+            on_action: Called once with the action clause when it closes.
+            deadline: Optional ``time.monotonic()`` deadline for all attempts;
+                a stream still running when it passes is closed.
+            cancel: Optional token to abort the request from another thread.
+
+        Returns:
+            ModelResponse for the full response, with ``time_to_action`` set
+            to the seconds until the action clause was complete.
+
+        Raises:
+            RequestCancelled: If the request was cancelled.
+            DeadlineExceeded: If the deadline passed before the response
+                was complete.
+        """
+        cancel = cancel or CancelToken()
+        dispatched = False
+
+        def notify(clause: str) -> None:
+            nonlocal dispatched
+            dispatched = True
+            if on_action is not None:
+                on_action(clause)
+
+        return call_with_retry(
+            lambda timeout: self._request_once(
+                messages, notify, timeout, cancel, deadline
+            ),
+            self.http_config,
+            deadline,
+            # A dispatched action must not run twice.
+            should_retry=lambda e: (
+                not dispatched and not cancel.cancelled and is_retryable(e)
+            ),
+        )
+
+    def _request_once(
+        self,
+        messages: list[dict[str, Any]],
+        on_action: Callable[[str], None],
+        timeout: float,
+        cancel: CancelToken,
+        deadline: float | None = None,
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        extra = {"logprobs": True} if self.logprobs else {}
+        stream = self.client.chat.completions.create(
+            messages=messages,
+            model=self.config.model_name,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            top_p=self.config.top_p,
+            frequency_penalty=self.config.frequency_penalty,
+            extra_body=self.config.extra_body,
+            stream=True,
+            timeout=timeout,
+            **extra,
+        )
+        cancel.attach(stream)
+
+        detector = ActionStreamDetector()
+        time_to_first_token = None
+        time_to_action = None
+        token_logprobs: list[float] = []
+        try:
+            for chunk in stream:
+                # The read timeout only bounds each chunk; a response that
+                # keeps trickling in must still stop at the deadline.
+                check_deadline(deadline)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if self.logprobs and choice.logprobs and choice.logprobs.content:
+                    token_logprobs.extend(t.logprob for t in choice.logprobs.content)
+                content = choice.delta.content
+                if not content:
+                    continue
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+
+                clause = detector.feed(content)
+                if clause is not None:
+                    time_to_action = time.perf_counter() - start
+                    on_action(clause)
+        except Exception as e:
+            if cancel.cancelled:
+                raise RequestCancelled() from e
+            if isinstance(e, DeadlineExceeded):
+                stream.close()
+            raise
+        if cancel.cancelled:
+            raise RequestCancelled()
+
+        thinking, action = split_response(detector.buffer)
+        response = ModelResponse(
+            thinking=thinking, action=action, raw_content=detector.buffer
+        )
+        response.time_to_first_token = time_to_first_token
+        response.time_to_action = time_to_action
+        response.total_time = time.perf_counter() - start
+        response.confidence = (
+            math.exp(sum(token_logprobs) / len(token_logprobs))
+            if token_logprobs
+            else None
+        )
+        return response
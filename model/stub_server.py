@@ -0,0 +1,235 @@
+"""Local OpenAI-compatible stub server for testing and benchmarks.
+
+Serves ``/v1/chat/completions`` (streamed or not) with a configurable reply,
+latency and error rate, so routers, retries and the agent loop can be
+exercised without a real model endpoint.
+
+Usage:
+    python -m Windows.model.stub_server --port 8000 --latency 0.5
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+DEFAULT_REPLY = 'Stub response.\nfinish(message="done")'
+
+Reply = str | Callable[[dict[str, Any]], str]
+Latency = float | Callable[[], float]
+
+
+class StubModelServer:
+    """
+    OpenAI-compatible chat completion server running in a background thread.
+
+    Args:
+        reply: Response text, or a callable mapping the request body to it.
+        latency: Seconds before the response starts, or a callable
+            returning them per request.
+        chunk_size: Characters per streamed chunk.
+        chunk_delay: Seconds between streamed chunks.
+        error_rate: Probability of answering with ``error_status`` instead.
+        error_status: HTTP status used for injected errors.
+        host: Interface to bind.
+        port: Port to bind; 0 picks a free port.
+        seed: Seed for the error injection, for reproducible runs.
+
+    Example:
+        >>> with StubModelServer(latency=0.2) as server:
+        ...     config = ModelConfig(base_url=server.base_url)
+    """
+
+    def __init__(
+        self,
+        reply: Reply = DEFAULT_REPLY,
+        latency: Latency = 0.0,
+        chunk_size: int = 16,
+        chunk_delay: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ):
+        self.reply = reply
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubModelServer":
+        """Start serving in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="StubModelServer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> "StubModelServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _next_request(self, size: int) -> tuple[float, bool]:
+        """Count a request of ``size`` bytes and draw its latency and outcome."""
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += size
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        latency = self.latency() if callable(self.latency) else self.latency
+        return latency, failed
+
+    def _reply_text(self, body: dict[str, Any]) -> str:
+        return self.reply(body) if callable(self.reply) else self.reply
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                body = json.loads(raw or b"{}")
+                latency, failed = stub._next_request(len(raw))
+                if latency > 0:
+                    time.sleep(latency)
+                try:
+                    if failed:
+                        self._send_json(
+                            stub.error_status,
+                            {"error": {"message": "injected error", "type": "stub"}},
+                        )
+                    elif body.get("stream"):
+                        self._send_stream(stub._reply_text(body))
+                    else:
+                        self._send_json(200, _completion(stub._reply_text(body)))
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client cancelled the request.
+                    pass
+
+            def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, text: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                size = max(1, stub.chunk_size)
+                for i in range(0, len(text), size):
+                    chunk = _chunk(text[i : i + size])
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if stub.chunk_delay > 0:
+                        time.sleep(stub.chunk_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def _chunk(content: str) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": "stub",
+        "choices": [
+            {"index": 0, "delta": {"content": content}, "finish_reason": None}
+        ],
+    }
+
+
+def _completion(content: str) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "stub",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+__all__ = ["StubModelServer"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    args = parser.parse_args()
+
+    server = StubModelServer(
+        reply=args.reply,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Stub model server on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+"""Differential fuzzing and speed comparison for the action parser.
+
+``parse_action`` used to be a handful of regular expressions feeding
+``ast.parse``; ``legacy_parse_action`` keeps that implementation as the
+reference the incremental parser in ``Windows.actions.parser`` is checked
+against:
+
+* Generated replies: random, well-formed actions (tricky text with quotes,
+  parentheses, backslashes, raw line breaks and stray ``do(``, plans,
+  ``</answer>`` tails, ...) whose expected action is known. The parser must
+  return exactly that action; the legacy parser's misses are counted.
+* Mutated replies: generated replies with characters deleted, inserted or
+  truncated. The parser must return an action or raise ``ActionParseError``
+  with a position inside the text, never anything else.
+* Chunked input: every reply is also fed to ``ActionParser`` in random
+  chunks, which must find the same clauses and errors as a single feed.
+* Streamed input: every reply is also fed in random chunks to the
+  ``ActionStreamDetector`` that dispatches actions early. Whatever clause it
+  reports must be the first action of the final parse, even when the
+  thinking quotes a complete ``do(...)`` clause.
+
+Usage:
+    python -m Windows.parsecheck
+    python -m Windows.parsecheck --cases 20000 --seed 7
+    python -m Windows.parsecheck --speed-only --iterations 5000
+"""
+
+import argparse
+import ast
+import random
+import re
+import sys
+import time
+import warnings
+from typing import Any, Callable
+
+from Windows.actions.handler import parse_action
+from Windows.actions.parser import (
+    ACTION_MARKER,
+    ActionParseError,
+    ActionParser,
+    parse_clauses,
+)
+from Windows.actions.schema import Action, Finish, Plan, create_action
+from Windows.benchmark import DEFAULT_SCRIPT, FINISH_REPLY
+from Windows.model.streaming import ActionStreamDetector
+
+_THINKING_RE = re.compile(r"思考:\s*(.+?)(?=动作:|$)", re.DOTALL)
+_ACTION_RE = re.compile(r"动作:\s*(.+?)$", re.DOTALL)
+_TRAILING_TAG_RE = re.compile(r"(?:</answer>|</think_tag>)\s*$")
+_DO_CALL_RE = re.compile(r"do\([^)]+\)")
+_FINISH_RE = re.compile(r'finish\(message="([^"]*)"\)')
+
+# Characters of generated text; quotes, brackets and backslashes on purpose.
+_TEXT = [*"abcxyz 01", *"记事本你好，。", *"()[]{}", '"', "'", "\\", ",", "=", "\n", "\t"]
+_TEXT_WORDS = ["do(", "finish(", 'action="Tap"', ")", "\\n", "</answer>"]
+_MUTATIONS = [*"()[]{}\"'\\,=: a1\n", "do(", "finish("]
+# Text models put after the action.
+_TAILS = ["\n完成后等待页面加载", " (然后确认)", "\n</think_tag>", "</think_tag></answer>"]
+_KEYS = ["win", "ctrl+c", "ctrl+shift+esc", "alt+f4", "enter"]
+
+
+def legacy_parse_action(response: str) -> Action:
+    """
+    The regex + ``ast`` parser ``parse_action`` replaced.
+
+    Raises:
+        ValueError: If the response cannot be parsed.
+    """
+    try:
+        response = response.strip()
+
+        thinking = None
+        thinking_match = _THINKING_RE.search(response)
+        if thinking_match:
+            thinking = thinking_match.group(1).strip()
+
+        action_match = _ACTION_RE.search(response)
+        if action_match:
+            response = action_match.group(1).strip()
+
+        response = _TRAILING_TAG_RE.sub("", _TRAILING_TAG_RE.sub("", response, 1), 1)
+
+        if response.count("do(") + response.count("finish(") > 1:
+            clauses = _legacy_split_clauses(response)
+            if len(clauses) > 1:
+                return Plan([_legacy_parse_single(c, None) for c in clauses], thinking)
+
+        return _legacy_parse_single(response, thinking)
+    except Exception as e:
+        raise ValueError(f"Failed to parse action: {e}")
+
+
+def _legacy_split_clauses(text: str) -> list[str]:
+    clauses = []
+    i = 0
+    n = len(text)
+    while i < n:
+        if not (text.startswith("do(", i) or text.startswith("finish(", i)) or (
+            i > 0 and (text[i - 1].isalnum() or text[i - 1] == "_")
+        ):
+            i += 1
+            continue
+
+        start = i
+        depth = 0
+        quote = None
+        escape = False
+        while i < n:
+            ch = text[i]
+            if quote is not None:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == quote:
+                    quote = None
+            elif ch in "\"'":
+                quote = ch
+            elif ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+
+        if depth != 0:
+            break
+        clauses.append(text[start : i + 1])
+        i += 1
+    return clauses
+
+
+def _legacy_parse_single(response: str, thinking: str | None) -> Action:
+    if response.startswith("do"):
+        response = response.replace("\n", "\\n")
+        response = response.replace("\r", "\\r")
+        response = response.replace("\t", "\\t")
+
+        if not response.endswith(")"):
+            match = _DO_CALL_RE.search(response)
+            if match:
+                response = match.group(0)
+
+        with warnings.catch_warnings():
+            # Fuzzed input trips "invalid decimal literal" and similar warnings.
+            warnings.simplefilter("ignore", SyntaxWarning)
+            tree = ast.parse(response, mode="eval")
+        if not isinstance(tree.body, ast.Call):
+            raise ValueError("Expected a function call")
+
+        params = {
+            keyword.arg: ast.literal_eval(keyword.value) for keyword in tree.body.keywords
+        }
+        return create_action(params.pop("action", None), params, thinking)
+
+    elif response.startswith("finish"):
+        match = _FINISH_RE.search(response)
+        if match:
+            message = match.group(1)
+        else:
+            message = response.replace("finish(message=", "")
+            if message.startswith('"') and message.endswith('"'):
+                message = message[1:-1]
+        return Finish(message, thinking)
+    raise ValueError(f"Failed to parse action: {response}")
+
+
+def _random_text(rng: random.Random, max_len: int = 24) -> str:
+    parts = []
+    for _ in range(rng.randint(0, max_len)):
+        if rng.random() < 0.08:
+            parts.append(rng.choice(_TEXT_WORDS))
+        else:
+            parts.append(rng.choice(_TEXT))
+    return "".join(parts)
+
+
+def _render(rng: random.Random, value: Any) -> str:
+    """Write ``value`` the way a model might."""
+    if isinstance(value, str):
+        if rng.random() < 0.5:
+            return repr(value)
+        # Double quotes with minimal escaping; line breaks stay raw.
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    if isinstance(value, list):
+        sep = rng.choice([",", ", ", " , "])
+        return "[" + sep.join(_render(rng, v) for v in value) + "]"
+    return repr(value)
+
+
+def _random_params(rng: random.Random) -> dict[str, Any]:
+    point = lambda: [rng.randint(0, 999), rng.randint(0, 999)]  # noqa: E731
+    name = rng.choice(
+        ["Tap", "Tap", "DoubleTap", "RightClick", "Type", "Type", "Hotkey",
+         "Swipe", "Scroll", "Wait", "Take_over", "Launch"]
+    )
+    params: dict[str, Any] = {"action": name}
+    if name in ("Tap", "DoubleTap", "RightClick"):
+        params["element"] = point()
+        if name == "Tap" and rng.random() < 0.2:
+            params["message"] = _random_text(rng)
+    elif name == "Type":
+        params["text"] = _random_text(rng, 40)
+    elif name == "Hotkey":
+        params["keys"] = rng.choice(_KEYS)
+    elif name == "Swipe":
+        params["start"] = point()
+        params["end"] = point()
+    elif name == "Scroll":
+        params["direction"] = rng.choice(["up", "down"])
+        params["amount"] = rng.randint(-10, 10)
+    elif name == "Wait":
+        params["duration"] = f"{rng.randint(1, 5)} seconds"
+    elif name in ("Take_over", "Launch"):
+        params["message" if name == "Take_over" else "app"] = _random_text(rng)
+    return params
+
+
+def _render_call(rng: random.Random, name: str, params: dict[str, Any]) -> str:
+    sep = rng.choices([", ", ",", " , ", ",\n"], weights=[8, 3, 1, 1])[0]
+    eq = rng.choices(["=", " = "], weights=[9, 1])[0]
+    args = sep.join(f"{key}{eq}{_render(rng, value)}" for key, value in params.items())
+    return f"{name}({args})"
+
+
+def generate_reply(rng: random.Random) -> tuple[str, dict[str, Any]]:
+    """
+    Generate a well-formed model reply.
+
+    Returns:
+        The reply and the expected action as a dictionary.
+    """
+    thinking = _random_text(rng).strip()
+    if rng.random() < 0.1:
+        # Models quote earlier actions while reasoning about them.
+        quoted = _render_call(rng, "do", _random_params(rng))
+        thinking = f"上一步的 {quoted} 没有生效，{thinking}".strip()
+    roll = rng.random()
+    if roll < 0.15:
+        message = _random_text(rng)
+        clause = _render_call(rng, "finish", {"message": message})
+        expected = Finish(message, thinking)
+    elif roll < 0.25:
+        steps = [_random_params(rng) for _ in range(rng.randint(2, 3))]
+        clause = "\n".join(_render_call(rng, "do", p) for p in steps)
+        actions = [create_action(p.pop("action"), p) for p in steps]
+        expected = Plan(actions, thinking)
+    else:
+        params = _random_params(rng)
+        clause = _render_call(rng, "do", params)
+        expected = create_action(params.pop("action"), params, thinking)
+
+    reply = f"思考: {thinking}\n动作: {clause}"
+    tail = rng.random()
+    if tail < 0.1:
+        reply += "</answer>"
+    elif tail < 0.15:
+        reply += rng.choice(_TAILS)
+    return reply, expected.to_dict()
+
+
+def mutate(rng: random.Random, text: str) -> str:
+    """Delete, insert, duplicate or truncate a few characters of ``text``."""
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randint(0, len(text))
+        op = rng.random()
+        if op < 0.35 and text:
+            i = min(i, len(text) - 1)
+            text = text[:i] + text[i + 1 :]
+        elif op < 0.75:
+            text = text[:i] + rng.choice(_MUTATIONS) + text[i:]
+        elif op < 0.9:
+            j = rng.randint(i, min(len(text), i + 8))
+            text = text[:j] + text[i:j] + text[j:]
+        else:
+            text = text[:i]
+    return text
+
+
+def _chunks(rng: random.Random, text: str) -> list[str]:
+    chunks = []
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, 8)
+        chunks.append(text[i : i + size])
+        i += size
+    return chunks
+
+
+def _clause_summary(parser: ActionParser) -> tuple:
+    return (
+        [(c.name, c.arguments, c.start, c.end) for c in parser.clauses],
+        [(e.message, e.position) for e in parser.errors],
+    )
+
+
+def _check_chunked(rng: random.Random, text: str) -> bool:
+    """Whether chunked and single-feed parsing find the same clauses."""
+    whole = ActionParser()
+    whole.feed(text)
+    whole.close()
+    chunked = ActionParser()
+    for chunk in _chunks(rng, text):
+        chunked.feed(chunk)
+    chunked.close()
+    return _clause_summary(whole) == _clause_summary(chunked)
+
+
+def _check_streamed(rng: random.Random, text: str) -> bool:
+    """Whether the clause streamed for early dispatch is the parsed action."""
+    detector = ActionStreamDetector()
+    for chunk in _chunks(rng, text):
+        if detector.feed(chunk) is not None:
+            break
+    if detector.action is None:
+        return True
+    marker = text.find(ACTION_MARKER)
+    if marker < 0 or detector.start < marker:
+        return False
+    try:
+        parse_clauses(text, marker + len(ACTION_MARKER))
+    except ActionParseError as e:
+        # A later clause is malformed and the final parse falls back to an
+        # error or a loose finish, which the agent reports as a mismatch;
+        # the streamed clause must still precede the failure.
+        start = e.clause_start if e.clause_start is not None else e.position
+        return detector.start + len(detector.action) <= start
+    final = parse_action(text)
+    first = final.actions[0] if isinstance(final, Plan) else final
+    streamed = parse_action(detector.action).to_dict()
+    expected = first.to_dict()
+    streamed.pop("thinking", None)
+    expected.pop("thinking", None)
+    return streamed == expected
+
+
+def _try(parse: Callable[[str], Action], text: str) -> tuple[Action | None, Exception | None]:
+    try:
+        return parse(text), None
+    except Exception as e:
+        return None, e
+
+
+def run_fuzz(cases: int = 5000, seed: int = 0, samples: int = 5) -> dict[str, Any]:
+    """
+    Fuzz ``parse_action`` against known actions and the legacy parser.
+
+    Args:
+        cases: Generated replies; each is also mutated twice.
+        seed: Random seed.
+        samples: Failing inputs kept per category.
+
+    Returns:
+        Counts per category and samples of the failures. ``failures`` counts
+        wrong actions, crashes, bad error positions, chunking mismatches and
+        wrongly streamed clauses of the new parser only.
+    """
+    rng = random.Random(seed)
+    result: dict[str, Any] = {
+        "cases": cases,
+        "mutations": 0,
+        "wrong": 0,
+        "legacy_wrong": 0,
+        "legacy_raised": 0,
+        "crashes": 0,
+        "bad_positions": 0,
+        "chunking": 0,
+        "stream": 0,
+        "disagreements": 0,
+        "samples": [],
+    }
+
+    def sample(kind: str, text: str, detail: Any) -> None:
+        if sum(1 for s in result["samples"] if s[0] == kind) < samples:
+            result["samples"].append((kind, text, detail))
+
+    # Deep nesting must fail cleanly instead of exhausting the stack.
+    edge_cases = ['do(action="Tap", element=' + "[" * 5000, "do(" * 5000]
+    for text in edge_cases:
+        _, error = _try(parse_action, text)
+        if not isinstance(error, ActionParseError):
+            result["crashes"] += 1
+            sample("crash", text[:40], repr(error))
+
+    for _ in range(cases):
+        reply, expected = generate_reply(rng)
+
+        action, error = _try(parse_action, reply)
+        if action is None or action.to_dict() != expected:
+            result["wrong"] += 1
+            sample("wrong", reply, error or action.to_dict())
+
+        legacy, legacy_error = _try(legacy_parse_action, reply)
+        if legacy is None:
+            result["legacy_raised"] += 1
+        if legacy is None or legacy.to_dict() != expected:
+            result["legacy_wrong"] += 1
+
+        for text in (reply, mutate(rng, reply), mutate(rng, reply)):
+            if text is not reply:
+                result["mutations"] += 1
+                action, error = _try(parse_action, text)
+                if error is not None and not isinstance(error, ActionParseError):
+                    result["crashes"] += 1
+                    sample("crash", text, repr(error))
+                elif error is not None and not 0 <= error.position <= len(text):
+                    result["bad_positions"] += 1
+                    sample("position", text, error.position)
+                legacy, _ = _try(legacy_parse_action, text)
+                if action is not None and legacy is not None:
+                    if action.to_dict() != legacy.to_dict():
+                        result["disagreements"] += 1
+            try:
+                chunked_ok = _check_chunked(rng, text)
+            except Exception as e:
+                chunked_ok = False
+                sample("chunking", text, repr(e))
+            if not chunked_ok:
+                result["chunking"] += 1
+                sample("chunking", text, None)
+            try:
+                streamed_ok = _check_streamed(rng, text)
+            except Exception as e:
+                streamed_ok = False
+                sample("stream", text, repr(e))
+            if not streamed_ok:
+                result["stream"] += 1
+                sample("stream", text, None)
+
+    result["failures"] = (
+        result["wrong"]
+        + result["crashes"]
+        + result["bad_positions"]
+        + result["chunking"]
+        + result["stream"]
+    )
+    return result
+
+
+def run_speed(iterations: int = 2000, seed: int = 0) -> dict[str, dict[str, float]]:
+    """
+    Time the legacy and new parsers.
+
+    Args:
+        iterations: Passes over each corpus.
+        seed: Seed of the generated corpus.
+
+    Returns:
+        Microseconds per parse for each corpus ("script": the benchmark's
+        scripted replies, "generated": 200 fuzz replies) and parser.
+    """
+    rng = random.Random(seed)
+    corpora = {
+        "script": [*DEFAULT_SCRIPT, FINISH_REPLY],
+        "generated": [generate_reply(rng)[0] for _ in range(200)],
+    }
+    timings = {}
+    for corpus, replies in corpora.items():
+        rounds = max(1, iterations * len([*DEFAULT_SCRIPT, FINISH_REPLY]) // len(replies))
+        timings[corpus] = {}
+        for label, parse in (("legacy", legacy_parse_action), ("parser", parse_action)):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for reply in replies:
+                    try:
+                        parse(reply)
+                    except ValueError:
+                        pass
+            elapsed = time.perf_counter() - start
+            timings[corpus][label] = round(elapsed / (rounds * len(replies)) * 1e6, 2)
+    return timings
+
+
+def format_fuzz(result: dict[str, Any]) -> str:
+    """Human-readable summary of a fuzz run."""
+    ok = result["failures"] == 0
+    lines = [
+        f"{'✅' if ok else '❌'} generated: {result['cases']} replies, "
+        f"wrong: {result['wrong']} "
+        f"(legacy wrong: {result['legacy_wrong']}, raised: {result['legacy_raised']})",
+        f"   mutated: {result['mutations']} replies, crashes: {result['crashes']}, "
+        f"bad error positions: {result['bad_positions']}, "
+        f"differs from legacy: {result['disagreements']}",
+        f"   chunked input mismatches: {result['chunking']}, "
+        f"wrongly streamed clauses: {result['stream']}",
+    ]
+    for kind, text, detail in result["samples"]:
+        lines.append(f"   [{kind}] {text!r}: {detail!r}")
+    return "\n".join(lines)
+
+
+def format_speed(timings: dict[str, dict[str, float]]) -> str:
+    """Human-readable parse timings."""
+    lines = []
+    for corpus, timing in timings.items():
+        speedup = timing["legacy"] / timing["parser"] if timing["parser"] else 0.0
+        lines.append(
+            f"{corpus}: legacy {timing['legacy']:.2f}us, "
+            f"parser {timing['parser']:.2f}us ({speedup:.1f}x)"
+        )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "format_fuzz",
+    "format_speed",
+    "generate_reply",
+    "legacy_parse_action",
+    "mutate",
+    "run_fuzz",
+    "run_speed",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fuzz and time the action parser")
+    parser.add_argument("--cases", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--speed-only", action="store_true")
+    args = parser.parse_args()
+
+    print(format_speed(run_speed(args.iterations, args.seed)))
+    if args.speed_only:
+        return
+
+    result = run_fuzz(args.cases, args.seed)
+    print(format_fuzz(result))
+    if result["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,733 @@
+"""Compact on-disk recording of agent sessions for replay and analysis.
+
+A session archive is a directory of append-only files:
+
+- ``chunk-00000.bin``, ``chunk-00001.bin``, ...: zlib-compressed blobs,
+  addressed by their BLAKE2b digest so identical content is stored once. A
+  new chunk is started when the current one reaches ``chunk_size``.
+- ``blobs.idx``: one fixed-size record per blob (digest, chunk, offset,
+  length) appended after the blob itself.
+- ``events.idx``: one fixed-size record per event (time, step, kind and the
+  digest of its JSON payload), so event ``n`` sits at a known offset.
+
+Frames are cut into tiles. A frame stores only the tiles that differ from
+the previous frame, with a full tile list every ``keyframe_interval``
+frames; tiles and whole frames are deduplicated by digest. Recorded model
+requests keep their text, with screenshots replaced by references to the
+recorded frames.
+
+``SessionReader`` memory-maps the index files and chunks, so any event or
+frame can be fetched without scanning the archive, and ``SessionReplay``
+feeds the recorded frames and model responses of a task back through the
+agent.
+
+Usage:
+    python -m Windows.session path/to/session
+"""
+
+import copy
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+from PIL import Image
+
+from Windows.actions.schema import Action, as_action
+from Windows.desktop.capture import BBox, CaptureBackend
+
+EVENT_KINDS = ("task", "frame", "request", "response", "action", "end")
+
+# digest, chunk, offset, stored length, raw length
+_BLOB = struct.Struct("<16sIQII")
+# time, step (0 = none), kind, digest
+_EVENT = struct.Struct("<dIB3x16s")
+
+_BLOB_INDEX = "blobs.idx"
+_EVENT_INDEX = "events.idx"
+
+
+def _digest(data: bytes | str) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _chunk_name(number: int) -> str:
+    return f"chunk-{number:05d}.bin"
+
+
+def _truncate_partial(path: Path, record_size: int) -> None:
+    """Drop a trailing partial record left by an interrupted write."""
+    if path.exists():
+        size = path.stat().st_size
+        if size % record_size:
+            with open(path, "r+b") as f:
+                f.truncate(size - size % record_size)
+
+
+class SessionRecorder:
+    """
+    Append-only writer of a session archive.
+
+    Encoding and writing happen on one background thread in call order, so
+    recording adds little to the agent loop. Calls on a closed or failed
+    recorder are ignored.
+
+    Args:
+        path: Archive directory; created if missing, appended to if present.
+        chunk_size: Bytes per chunk file before a new one is started.
+        tile_size: Edge length of frame tiles in pixels.
+        keyframe_interval: Frames between full tile lists.
+        compress_level: zlib compression level of blobs.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        chunk_size: int = 64 * 2**20,
+        tile_size: int = 64,
+        keyframe_interval: int = 30,
+        compress_level: int = 6,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.tile_size = tile_size
+        self.keyframe_interval = keyframe_interval
+        self.compress_level = compress_level
+
+        blob_index = self.path / _BLOB_INDEX
+        _truncate_partial(blob_index, _BLOB.size)
+        _truncate_partial(self.path / _EVENT_INDEX, _EVENT.size)
+
+        self._known: set[bytes] = set()
+        self._chunk_number = 0
+        if blob_index.exists():
+            data = blob_index.read_bytes()
+            for fields in _BLOB.iter_unpack(data):
+                self._known.add(fields[0])
+                self._chunk_number = max(self._chunk_number, fields[1])
+
+        chunk_path = self.path / _chunk_name(self._chunk_number)
+        self._chunk = open(chunk_path, "ab")
+        self._chunk_offset = self._chunk.tell()
+        self._blob_index = open(blob_index, "ab")
+        self._events = open(self.path / _EVENT_INDEX, "ab")
+
+        # Frame state, only touched by the writer thread.
+        self._previous: tuple[np.ndarray, list[str], str] | None = None
+        self._since_keyframe = 0
+        self._frames_by_pixels: dict[bytes, str] = {}
+        self._frames_by_url: dict[bytes, str] = {}
+
+        self.bytes_written = 0
+        self.bytes_raw = 0
+        self._error: BaseException | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="SessionRecorder"
+        )
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _submit(self, func: Any, *args: Any) -> None:
+        with self._lock:
+            if self._closed or self._error is not None:
+                return
+            self._executor.submit(self._guarded, func, *args)
+
+    def _guarded(self, func: Any, *args: Any) -> None:
+        if self._error is not None:
+            return
+        try:
+            func(*args)
+        except Exception as e:
+            self._error = e
+            print(f"Error recording session, recording stopped: {e}")
+
+    def start_task(self, task: str) -> None:
+        """Record the start of a task."""
+        self._submit(self._write_event, "task", None, time.time(), {"task": task})
+
+    def record_frame(self, screenshot: Any, window_title: str, step: int) -> None:
+        """Record the screenshot observed at a step."""
+        self._submit(self._write_frame, screenshot, window_title, step, time.time())
+
+    def record_request(self, messages: list[dict[str, Any]], step: int) -> None:
+        """Record the messages sent to the model at a step."""
+        # The context keeps changing after this call, so snapshot it now.
+        snapshot = [
+            {**m, "content": copy.copy(m["content"])} if "content" in m else dict(m)
+            for m in messages
+        ]
+        self._submit(self._write_request, snapshot, step, time.time())
+
+    def record_response(self, response: Any, step: int, cached: bool = False) -> None:
+        """Record the model response of a step."""
+        payload = {
+            "thinking": response.thinking,
+            "action": response.action,
+            "raw_content": response.raw_content,
+            "cached": cached,
+            "tier": getattr(response, "tier", None),
+            "time_to_first_token": getattr(response, "time_to_first_token", None),
+            "total_time": getattr(response, "total_time", None),
+        }
+        self._submit(self._write_event, "response", step, time.time(), payload)
+
+    def record_action(
+        self, action: Action | dict[str, Any], result: Any, step: int
+    ) -> None:
+        """Record the executed action of a step and its result."""
+        action = as_action(action).to_dict()
+        action.pop("thinking", None)
+        payload = {
+            "action": action,
+            "success": result.success,
+            "should_finish": result.should_finish,
+            "message": result.message,
+        }
+        self._submit(self._write_event, "action", step, time.time(), payload)
+
+    def end_task(self, message: str, steps: int) -> None:
+        """Record the end of a task and flush the archive."""
+        payload = {"message": message, "steps": steps}
+        self._submit(self._write_event, "end", None, time.time(), payload)
+        self.flush()
+
+    def flush(self) -> None:
+        """Wait for pending records and flush them to disk."""
+        with self._lock:
+            if self._closed:
+                return
+            future = self._executor.submit(self._flush_files)
+        future.result()
+
+    def close(self) -> None:
+        """Flush pending records and close the archive."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.submit(self._flush_files)
+        self._executor.shutdown(wait=True)
+        self._chunk.close()
+        self._blob_index.close()
+        self._events.close()
+
+    def _flush_files(self) -> None:
+        # Blobs before their index records, index records before events.
+        self._chunk.flush()
+        self._blob_index.flush()
+        self._events.flush()
+
+    def _put(self, data: bytes) -> bytes:
+        """Store a blob unless already present and return its digest."""
+        digest = _digest(data)
+        if digest in self._known:
+            return digest
+
+        packed = zlib.compress(data, self.compress_level)
+        if self._chunk_offset and self._chunk_offset + len(packed) > self.chunk_size:
+            self._chunk.close()
+            self._chunk_number += 1
+            self._chunk = open(self.path / _chunk_name(self._chunk_number), "ab")
+            self._chunk_offset = 0
+
+        self._chunk.write(packed)
+        self._blob_index.write(
+            _BLOB.pack(
+                digest, self._chunk_number, self._chunk_offset, len(packed), len(data)
+            )
+        )
+        self._chunk_offset += len(packed)
+        self._known.add(digest)
+        self.bytes_written += len(packed)
+        self.bytes_raw += len(data)
+        return digest
+
+    def _write_event(
+        self, kind: str, step: int | None, timestamp: float, payload: dict[str, Any]
+    ) -> None:
+        data = json.dumps(
+            payload, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+        digest = self._put(data)
+        self._events.write(
+            _EVENT.pack(timestamp, step or 0, EVENT_KINDS.index(kind), digest)
+        )
+
+    def _write_frame(
+        self, screenshot: Any, window_title: str, step: int, timestamp: float
+    ) -> None:
+        manifest = self._encode_frame(screenshot.image)
+        self._frames_by_url[_digest(screenshot.data_url)] = manifest
+        payload = {
+            "frame": manifest,
+            "window": window_title,
+            "width": screenshot.width,
+            "height": screenshot.height,
+            "offset": [screenshot.offset_x, screenshot.offset_y],
+            "mime_type": screenshot.mime_type,
+            "encoded_bytes": screenshot.byte_size,
+        }
+        self._write_event("frame", step, timestamp, payload)
+
+    def _encode_frame(self, image: Image.Image) -> str:
+        """Store a frame as tiles and return the digest of its manifest."""
+        pixels = np.asarray(image.convert("RGB"))
+        pixel_digest = _digest(pixels.tobytes())
+        known = self._frames_by_pixels.get(pixel_digest)
+        if known is not None:
+            self._previous = (pixels, self._tile_list(known, pixels), known)
+            return known
+
+        height, width = pixels.shape[:2]
+        size = self.tile_size
+        rows, cols = -(-height // size), -(-width // size)
+
+        previous = self._previous
+        delta = (
+            previous is not None
+            and previous[0].shape == pixels.shape
+            and self._since_keyframe < self.keyframe_interval
+        )
+        if delta:
+            changed = np.zeros((rows * size, cols * size), dtype=bool)
+            changed[:height, :width] = (pixels != previous[0]).any(axis=2)
+            dirty = changed.reshape(rows, size, cols, size).any(axis=(1, 3)).ravel()
+            tiles = list(previous[1])
+        else:
+            dirty = np.ones(rows * cols, dtype=bool)
+            tiles = [""] * (rows * cols)
+
+        updates = []
+        for index in np.flatnonzero(dirty):
+            row, col = divmod(int(index), cols)
+            tile = pixels[row * size : (row + 1) * size, col * size : (col + 1) * size]
+            tiles[index] = self._put(np.ascontiguousarray(tile).tobytes()).hex()
+            updates.append([int(index), tiles[index]])
+
+        manifest: dict[str, Any] = {"size": [width, height], "tile": size}
+        if delta:
+            manifest["base"] = previous[2]
+            manifest["tiles"] = updates
+            self._since_keyframe += 1
+        else:
+            manifest["tiles"] = tiles
+            self._since_keyframe = 0
+
+        digest = self._put(json.dumps(manifest, separators=(",", ":")).encode()).hex()
+        self._frames_by_pixels[pixel_digest] = digest
+        self._previous = (pixels, tiles, digest)
+        return digest
+
+    def _tile_list(self, manifest: str, pixels: np.ndarray) -> list[str]:
+        """Tile digests of an already stored frame."""
+        if self._previous is not None and self._previous[2] == manifest:
+            return self._previous[1]
+        # Rare: a frame seen earlier but not just before. Re-tile it.
+        height, width = pixels.shape[:2]
+        size = self.tile_size
+        return [
+            _digest(
+                np.ascontiguousarray(pixels[y : y + size, x : x + size]).tobytes()
+            ).hex()
+            for y in range(0, height, size)
+            for x in range(0, width, size)
+        ]
+
+    def _write_request(
+        self, messages: list[dict[str, Any]], step: int, timestamp: float
+    ) -> None:
+        stripped = []
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, list):
+                content = [self._strip_image(part) for part in content]
+                message = {**message, "content": content}
+            stripped.append(message)
+        self._write_event("request", step, timestamp, {"messages": stripped})
+
+    def _strip_image(self, part: Any) -> Any:
+        """Replace an inline image by a reference to its frame or blob."""
+        if not isinstance(part, dict) or part.get("type") != "image_url":
+            return part
+        url = part.get("image_url", {}).get("url", "")
+        frame = self._frames_by_url.get(_digest(url))
+        if frame is not None:
+            ref = f"frame:{frame}"
+        else:
+            ref = f"blob:{self._put(url.encode('utf-8')).hex()}"
+        return {"type": "image_url", "image_url": {"url": ref}}
+
+
+@dataclass
+class SessionEvent:
+    """An event read from a session archive."""
+
+    seq: int
+    kind: str
+    step: int | None
+    time: float
+    payload: dict[str, Any]
+
+
+def _map_file(path: Path) -> mmap.mmap | bytes:
+    if not path.exists() or path.stat().st_size == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class SessionReader:
+    """
+    Random-access reader of a session archive.
+
+    Index files and chunks are memory-mapped, so opening an archive only
+    reads the blob index, and each event or frame is decoded on demand.
+
+    Args:
+        path: Archive directory.
+        cache_size: Decoded frames kept for fast scrubbing.
+    """
+
+    def __init__(self, path: str | Path, cache_size: int = 32):
+        self.path = Path(path)
+        self._events = _map_file(self.path / _EVENT_INDEX)
+        self._count = len(self._events) // _EVENT.size
+        self._chunks: dict[int, mmap.mmap | bytes] = {}
+
+        self._blobs: dict[bytes, tuple[int, int, int]] = {}
+        self.bytes_stored = 0
+        self.bytes_raw = 0
+        chunk_sizes: dict[int, int] = {}
+        blob_index = _map_file(self.path / _BLOB_INDEX)
+        usable = len(blob_index) - len(blob_index) % _BLOB.size
+        records = _BLOB.iter_unpack(blob_index[:usable])
+        for digest, chunk, offset, length, raw in records:
+            if chunk not in chunk_sizes:
+                chunk_path = self.path / _chunk_name(chunk)
+                chunk_sizes[chunk] = (
+                    chunk_path.stat().st_size if chunk_path.exists() else 0
+                )
+            # Skip records whose data never reached the disk.
+            if offset + length <= chunk_sizes[chunk]:
+                self._blobs[digest] = (chunk, offset, length)
+                self.bytes_stored += length
+                self.bytes_raw += raw
+
+        self._cache_size = cache_size
+        self._frames: OrderedDict[str, tuple[list[str], list[int], int]] = OrderedDict()
+
+    def __enter__(self) -> "SessionReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        for mapped in [self._events, *self._chunks.values()]:
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._chunks.clear()
+
+    def blob(self, digest: str | bytes) -> bytes:
+        """
+        Decompressed content of a blob.
+
+        Raises:
+            KeyError: If the archive has no such blob.
+        """
+        if isinstance(digest, str):
+            digest = bytes.fromhex(digest)
+        chunk, offset, length = self._blobs[digest]
+        mapped = self._chunks.get(chunk)
+        if mapped is None:
+            mapped = self._chunks[chunk] = _map_file(self.path / _chunk_name(chunk))
+        return zlib.decompress(mapped[offset : offset + length])
+
+    def event(self, seq: int) -> SessionEvent:
+        """The event with sequence number ``seq`` (negative counts from the end)."""
+        if seq < 0:
+            seq += self._count
+        if not 0 <= seq < self._count:
+            raise IndexError(seq)
+        timestamp, step, kind, digest = _EVENT.unpack_from(
+            self._events, seq * _EVENT.size
+        )
+        return SessionEvent(
+            seq=seq,
+            kind=EVENT_KINDS[kind],
+            step=step or None,
+            time=timestamp,
+            payload=json.loads(self.blob(digest)),
+        )
+
+    def kinds(self) -> list[str]:
+        """Kind of every event, read from the index without decoding payloads."""
+        return [
+            EVENT_KINDS[self._events[i * _EVENT.size + 12]] for i in range(self._count)
+        ]
+
+    def events(
+        self, kind: str | None = None, start: int = 0
+    ) -> Iterator[SessionEvent]:
+        """Iterate over events from ``start``, optionally of one kind only."""
+        for seq, event_kind in enumerate(self.kinds()[start:], start):
+            if kind is None or event_kind == kind:
+                yield self.event(seq)
+
+    def tasks(self) -> list[SessionEvent]:
+        """The task start events, in recording order."""
+        return list(self.events("task"))
+
+    def frame(self, ref: SessionEvent | str) -> Image.Image:
+        """
+        Reconstruct a recorded frame.
+
+        Args:
+            ref: A frame event, or a frame manifest digest as found in
+                events and ``frame:`` references of recorded requests.
+
+        Returns:
+            The frame as an RGB image.
+        """
+        if isinstance(ref, SessionEvent):
+            ref = ref.payload["frame"]
+        ref = ref.removeprefix("frame:")
+        tiles, size, tile = self._resolve(ref)
+
+        width, height = size
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        cols = -(-width // tile)
+        for index, digest in enumerate(tiles):
+            row, col = divmod(index, cols)
+            y, x = row * tile, col * tile
+            h, w = min(tile, height - y), min(tile, width - x)
+            pixels[y : y + h, x : x + w] = np.frombuffer(
+                self.blob(digest), dtype=np.uint8
+            ).reshape(h, w, 3)
+        return Image.fromarray(pixels, "RGB")
+
+    def _resolve(self, digest: str) -> tuple[list[str], list[int], int]:
+        """Full tile list, size and tile size of a frame, following delta bases."""
+        chain = []
+        current = digest
+        while current not in self._frames:
+            manifest = json.loads(self.blob(current))
+            chain.append((current, manifest))
+            if "base" not in manifest:
+                break
+            current = manifest["base"]
+
+        # None when the chain ends at a keyframe that was not cached.
+        resolved = self._frames.get(current)
+        for key, manifest in reversed(chain):
+            if "base" in manifest:
+                tiles = list(resolved[0])
+                for index, tile in manifest["tiles"]:
+                    tiles[index] = tile
+            else:
+                tiles = manifest["tiles"]
+            resolved = (tiles, manifest["size"], manifest["tile"])
+            self._frames[key] = resolved
+            if len(self._frames) > self._cache_size:
+                self._frames.popitem(last=False)
+
+        if digest in self._frames:
+            self._frames.move_to_end(digest)
+        return resolved
+
+    def summary(self) -> dict[str, Any]:
+        """Counts and sizes of the archive."""
+        kinds = self.kinds()
+        return {
+            "events": len(kinds),
+            "by_kind": {k: kinds.count(k) for k in EVENT_KINDS if k in kinds},
+            "blobs": len(self._blobs),
+            "bytes_stored": self.bytes_stored,
+            "bytes_raw": self.bytes_raw,
+        }
+
+
+class _ReplayCaptureBackend(CaptureBackend):
+    """Capture backend showing the current frame of a SessionReplay."""
+
+    name = "session"
+
+    def __init__(self, replay: "SessionReplay"):
+        self._replay = replay
+
+    def grab(self, bbox: BBox | None = None) -> Image.Image:
+        frame = self._replay.current_frame()
+        return frame.crop(bbox) if bbox else frame.copy()
+
+    def window_title(self) -> str:
+        return self._replay.current_window()
+
+    def window_rect(self) -> BBox | None:
+        return None
+
+
+class SessionReplay:
+    """
+    Replays one recorded task through the agent.
+
+    The replay acts as the agent's model client, answering with the recorded
+    responses in order, and provides a capture backend showing the recorded
+    frame of the current step, advancing when a response is returned so the
+    settle detector sees the screen change. Input goes to the recording input
+    backend by default, so the desktop is never touched.
+
+    Args:
+        path: Archive directory.
+        task: Index of the recorded task to replay.
+
+    Example:
+        >>> replay = SessionReplay("sessions/run-1")
+        >>> replay.run(AgentConfig(verbose=False))
+    """
+
+    def __init__(self, path: str | Path, task: int = 0):
+        self.reader = SessionReader(path)
+        tasks = self.reader.tasks()
+        if not tasks:
+            raise ValueError(f"No tasks recorded in {path}")
+        start = tasks[task]
+        end = tasks[task + 1].seq if task + 1 < len(tasks) else len(self.reader)
+        self.task: str = start.payload["task"]
+
+        self._frames: list[SessionEvent] = []
+        self._responses: list[SessionEvent] = []
+        for seq, kind in enumerate(self.reader.kinds()[start.seq : end], start.seq):
+            if kind == "frame":
+                self._frames.append(self.reader.event(seq))
+            elif kind == "response":
+                self._responses.append(self.reader.event(seq))
+        if not self._frames:
+            raise ValueError(f"Task {task} in {path} has no recorded frames")
+
+        self._frame_index = 0
+        self._response_index = 0
+        self._image: tuple[int, Image.Image] | None = None
+        self.capture_backend = _ReplayCaptureBackend(self)
+
+    def current_frame(self) -> Image.Image:
+        """The recorded frame of the current step."""
+        if self._image is None or self._image[0] != self._frame_index:
+            self._image = (
+                self._frame_index,
+                self.reader.frame(self._frames[self._frame_index]),
+            )
+        return self._image[1]
+
+    def current_window(self) -> str:
+        """The recorded window title of the current step."""
+        return self._frames[self._frame_index].payload["window"]
+
+    def request(
+        self,
+        messages: list[dict[str, Any]],
+        on_action: Any = None,
+        deadline: float | None = None,
+    ) -> Any:
+        """
+        Return the next recorded response, as ``StreamingModelClient.request``.
+
+        Raises:
+            RuntimeError: If the recorded responses are exhausted.
+        """
+        from phone_agent.model.client import ModelResponse
+
+        if self._response_index >= len(self._responses):
+            raise RuntimeError("No more recorded responses in the session")
+        payload = self._responses[self._response_index].payload
+        self._response_index += 1
+        self._frame_index = min(self._frame_index + 1, len(self._frames) - 1)
+
+        response = ModelResponse(
+            thinking=payload["thinking"],
+            action=payload["action"],
+            raw_content=payload["raw_content"],
+        )
+        response.time_to_first_token = payload.get("time_to_first_token")
+        response.total_time = payload.get("total_time")
+        return response
+
+    def run(self, agent_config: Any = None, input_backend: Any = "recording") -> str:
+        """
+        Run the recorded task through a new agent.
+
+        The global capture and input backends are replaced and stay installed.
+
+        Args:
+            agent_config: Agent configuration; ``frame_cache`` in reuse mode
+                would skip recorded responses and should be left off.
+            input_backend: Input backend or registered name to install.
+
+        Returns:
+            The agent's final message.
+        """
+        from Windows.agent import WindowsAgent
+        from Windows.desktop.capture import set_capture_backend
+        from Windows.desktop.input import set_input_backend
+
+        set_capture_backend(self.capture_backend)
+        set_input_backend(input_backend)
+        agent = WindowsAgent(agent_config=agent_config)
+        agent.model_client = self
+        return agent.run(self.task)
+
+
+__all__ = [
+    "EVENT_KINDS",
+    "SessionEvent",
+    "SessionReader",
+    "SessionRecorder",
+    "SessionReplay",
+]
+
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        print("Usage: python -m Windows.session <session-dir>")
+        sys.exit(2)
+
+    with SessionReader(sys.argv[1]) as reader:
+        summary = reader.summary()
+        ratio = summary["bytes_raw"] / max(summary["bytes_stored"], 1)
+        print(f"{os.path.abspath(sys.argv[1])}")
+        print(f"events: {summary['events']} {summary['by_kind']}")
+        print(
+            f"blobs: {summary['blobs']}, "
+            f"stored {summary['bytes_stored'] / 2**20:.2f} MiB "
+            f"(raw {summary['bytes_raw'] / 2**20:.2f} MiB, {ratio:.1f}x)"
+        )
+        for task in reader.tasks():
+            print(f"- task @{task.seq}: {task.payload['task']}")
+
+
+if __name__ == "__main__":
+    main()
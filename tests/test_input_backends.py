@@ -0,0 +1,188 @@
+"""Event counts of the input backends, runnable without a desktop.
+
+The ``SendInput`` call is replaced through the backend's ``send`` hook and
+pyautogui by a module recording its calls, so these tests run on Linux.
+
+Usage (from the directory containing the ``Windows`` package):
+    python -m pytest Windows/tests
+"""
+
+import sys
+import types
+
+import pytest
+
+from Windows.desktop.input import (
+    PyAutoGUIInputBackend,
+    RecordingInputBackend,
+    split_hotkey,
+)
+from Windows.desktop.sendinput import SendInputBackend
+
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+_KEYEVENTF_KEYUP = 0x0002
+_MOUSEEVENTF_LEFTDOWN = 0x0002
+_MOUSEEVENTF_LEFTUP = 0x0004
+
+
+class _SendRecorder:
+    """Stands in for ``user32.SendInput``, keeping every batch."""
+
+    def __init__(self):
+        self.batches: list[list] = []
+
+    def __call__(self, count, array, size):
+        self.batches.append([array[i] for i in range(count)])
+        return count
+
+
+@pytest.fixture
+def sendinput():
+    recorder = _SendRecorder()
+    backend = SendInputBackend(send=recorder, virtual_screen=(0, 0, 1920, 1080))
+    return backend, recorder
+
+
+def _keys(batch) -> list[tuple[int, bool]]:
+    return [
+        (event.u.ki.wVk, bool(event.u.ki.dwFlags & _KEYEVENTF_KEYUP))
+        for event in batch
+        if event.type == _INPUT_KEYBOARD
+    ]
+
+
+def test_sendinput_click_is_one_batch(sendinput):
+    backend, recorder = sendinput
+    backend.click(100, 200)
+    assert len(recorder.batches) == 1
+    batch = recorder.batches[0]
+    # Move, button down, button up.
+    assert len(batch) == 3
+    assert [e.type for e in batch] == [_INPUT_MOUSE] * 3
+    assert batch[1].u.mi.dwFlags == _MOUSEEVENTF_LEFTDOWN
+    assert batch[2].u.mi.dwFlags == _MOUSEEVENTF_LEFTUP
+    assert (backend.batches, backend.events) == (1, 3)
+
+
+def test_sendinput_double_click_is_one_batch(sendinput):
+    backend, recorder = sendinput
+    backend.click(100, 200, clicks=2)
+    assert [len(b) for b in recorder.batches] == [5]
+
+
+def test_sendinput_instant_drag_is_one_batch(sendinput):
+    backend, recorder = sendinput
+    backend.drag((0, 0), (100, 100), duration=0)
+    assert len(recorder.batches) == 1
+    # Move to start, down, one step per drag_rate tick (at least one), up.
+    assert len(recorder.batches[0]) == 4
+
+
+def test_sendinput_timed_drag_paces_moves_and_releases(sendinput):
+    backend, recorder = sendinput
+    backend.drag_rate = 20
+    backend.drag((0, 0), (100, 0), duration=0.1)
+    # Start batch, one batch per step; the last one carries the release.
+    assert [len(b) for b in recorder.batches] == [2, 1, 2]
+    assert recorder.batches[-1][-1].u.mi.dwFlags == _MOUSEEVENTF_LEFTUP
+
+
+def test_sendinput_hotkey_is_one_batch(sendinput):
+    backend, recorder = sendinput
+    backend.hotkey("ctrl+c")
+    assert len(recorder.batches) == 1
+    assert _keys(recorder.batches[0]) == [
+        (0x11, False),
+        (ord("C"), False),
+        (ord("C"), True),
+        (0x11, True),
+    ]
+
+
+def test_sendinput_plus_key_is_pressed(sendinput):
+    backend, recorder = sendinput
+    backend.press("+")
+    backend.hotkey("ctrl++")
+    # Without a keyboard layout the plus sign is typed as a character.
+    assert [len(b) for b in recorder.batches] == [2, 4]
+
+
+def test_sendinput_short_send_raises(sendinput):
+    backend, _ = sendinput
+    backend._send = lambda count, array, size: count - 1
+    with pytest.raises(OSError):
+        backend.click(1, 1)
+
+
+def test_split_hotkey():
+    assert split_hotkey("ctrl+c") == ["ctrl", "c"]
+    assert split_hotkey("ctrl", "shift", "s") == ["ctrl", "shift", "s"]
+    assert split_hotkey("+") == ["+"]
+    assert split_hotkey("ctrl++") == ["ctrl", "+"]
+
+
+def test_recording_backend_counts_calls():
+    backend = RecordingInputBackend()
+    backend.click(1, 2)
+    backend.click(3, 4, button="right")
+    backend.drag((0, 0), (5, 5), 0.5)
+    backend.hotkey("ctrl", "v")
+    backend.paste_text("hi")
+    assert backend.counts() == {"click": 2, "drag": 1, "hotkey": 1, "paste_text": 1}
+    assert backend.events[0].args == (1, 2, "left", 1)
+    assert backend.events[3].args == ("ctrl", "v")
+
+    backend.clear()
+    assert backend.counts() == {}
+
+
+def test_recording_backend_latency():
+    backend = RecordingInputBackend(latency=0.01)
+    backend.press("enter")
+    backend.press("enter")
+    first, second = backend.events
+    assert second.timestamp - first.timestamp >= 0.01
+
+
+@pytest.fixture
+def pyautogui_calls(monkeypatch):
+    calls: list[tuple[str, tuple, dict]] = []
+
+    def recorder(name):
+        return lambda *args, **kwargs: calls.append((name, args, kwargs))
+
+    module = types.ModuleType("pyautogui")
+    module.PAUSE = 0.1
+    for name in (
+        "click",
+        "rightClick",
+        "doubleClick",
+        "moveTo",
+        "drag",
+        "scroll",
+        "hotkey",
+        "press",
+    ):
+        setattr(module, name, recorder(name))
+    clipboard = types.ModuleType("pyperclip")
+    clipboard.copy = recorder("copy")
+    monkeypatch.setitem(sys.modules, "pyautogui", module)
+    monkeypatch.setitem(sys.modules, "pyperclip", clipboard)
+    return calls
+
+
+def test_pyautogui_calls_skip_pause(pyautogui_calls):
+    backend = PyAutoGUIInputBackend()
+    backend.click(1, 2)
+    backend.click(1, 2, clicks=2)
+    backend.click(1, 2, button="right")
+    backend.drag((0, 0), (10, 10), 0.1)
+    backend.scroll(3)
+    backend.hotkey("ctrl", "c")
+    backend.press("enter")
+    backend.paste_text("hi")
+
+    pyautogui = [(name, kwargs) for name, _, kwargs in pyautogui_calls if name != "copy"]
+    assert len(pyautogui) == 9
+    assert all(kwargs.get("_pause") is False for _, kwargs in pyautogui)
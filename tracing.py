@@ -0,0 +1,300 @@
+"""Per-phase tracing of the agent loop.
+
+Spans are recorded for capture, resize, encode, base64, window-title lookup,
+context build, model request, parse, action execution and sleeps, tagged
+with the step number (and, once parsed, the step's action type). Traces
+export as JSONL or as Chrome trace-event JSON for chrome://tracing or
+Perfetto.
+
+Tracing is off by default: the global tracer is a NullTracer whose spans
+are a shared no-op object, so instrumented code pays only a method call.
+Enable it with ``enable_tracing()`` or by setting ``WINDOWS_TRACE`` to an
+output path (``.jsonl`` for JSONL, anything else for Chrome JSON), in which
+case the trace is written when the process exits.
+
+Example:
+    >>> from Windows.tracing import enable_tracing
+    >>> tracer = enable_tracing()
+    >>> agent.run("Open Notepad")
+    >>> tracer.export_chrome("trace.json")
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+_current_step: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "windows_trace_step", default=None
+)
+
+
+def set_step(step: int | None) -> None:
+    """Set the step number attached to spans recorded in this context."""
+    _current_step.set(step)
+
+
+def current_step() -> int | None:
+    """Step number attached to spans recorded in this context."""
+    return _current_step.get()
+
+
+def call_in_step(step: int | None, func: Callable[..., T], *args: Any) -> T:
+    """Call ``func`` with spans tagged with ``step``, e.g. on a worker thread."""
+    _current_step.set(step)
+    return func(*args)
+
+
+@dataclass
+class SpanRecord:
+    """A finished span. Times are ``time.perf_counter()`` seconds."""
+
+    name: str
+    start: float
+    duration: float
+    thread: int
+    step: int | None
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Span:
+    """Context manager timing one span; ``set`` adds arguments before exit."""
+
+    __slots__ = ("_tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._tracer.record(
+            self.name, self.start, time.perf_counter() - self.start, **self.args
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **args: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects spans in memory.
+
+    Args:
+        max_events: Spans kept before new ones are dropped.
+    """
+
+    enabled = True
+
+    def __init__(self, max_events: int = 1_000_000):
+        self.max_events = max_events
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._records: list[SpanRecord] = []
+        self._step_args: dict[int, dict[str, Any]] = {}
+        self._origin = time.perf_counter()
+
+    def span(self, name: str, **args: Any) -> Span:
+        """
+        Time a block.
+
+        Args:
+            name: Phase name, e.g. "capture" or "model".
+            **args: Extra values stored with the span.
+        """
+        return Span(self, name, args)
+
+    def record(self, name: str, start: float, duration: float, **args: Any) -> None:
+        """Record a span measured elsewhere (``perf_counter`` seconds)."""
+        record = SpanRecord(
+            name, start, duration, threading.get_ident(), _current_step.get(), args
+        )
+        with self._lock:
+            if len(self._records) >= self.max_events:
+                self.dropped += 1
+                return
+            self._records.append(record)
+
+    def annotate_step(self, step: int | None, **args: Any) -> None:
+        """Attach values (e.g. the action type) to every span of a step."""
+        if step is None:
+            return
+        with self._lock:
+            self._step_args.setdefault(step, {}).update(args)
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self._records.clear()
+            self._step_args.clear()
+            self.dropped = 0
+
+    def records(self) -> list[SpanRecord]:
+        """A copy of the recorded spans."""
+        with self._lock:
+            return list(self._records)
+
+    def events(self) -> list[dict[str, Any]]:
+        """Recorded spans as JSON-ready dicts, times in seconds from start."""
+        with self._lock:
+            records = list(self._records)
+            step_args = {k: dict(v) for k, v in self._step_args.items()}
+        events = []
+        for r in records:
+            args = r.args
+            if r.step in step_args:
+                args = {**step_args[r.step], **r.args}
+            events.append(
+                {
+                    "name": r.name,
+                    "ts": r.start - self._origin,
+                    "dur": r.duration,
+                    "tid": r.thread,
+                    "step": r.step,
+                    "args": args,
+                }
+            )
+        return events
+
+    def export_jsonl(self, path: str) -> None:
+        """Write one JSON object per span."""
+        with open(path, "w", encoding="utf-8") as f:
+            for event in self.events():
+                f.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+    def export_chrome(self, path: str) -> None:
+        """Write Chrome trace-event JSON (complete "X" events, microseconds)."""
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events():
+            args = dict(event["args"])
+            if event["step"] is not None:
+                args["step"] = event["step"]
+            trace_events.append(
+                {
+                    "name": event["name"],
+                    "cat": "agent",
+                    "ph": "X",
+                    "ts": round(event["ts"] * 1e6, 3),
+                    "dur": round(event["dur"] * 1e6, 3),
+                    "pid": pid,
+                    "tid": event["tid"],
+                    "args": args,
+                }
+            )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": trace_events, "displayTimeUnit": "ms"},
+                f,
+                ensure_ascii=False,
+                default=str,
+            )
+
+    def export(self, path: str) -> None:
+        """Export by file extension: ``.jsonl`` as JSONL, otherwise Chrome JSON."""
+        if path.endswith(".jsonl"):
+            self.export_jsonl(path)
+        else:
+            self.export_chrome(path)
+
+
+class NullTracer(Tracer):
+    """Tracer used when tracing is off; records nothing."""
+
+    enabled = False
+
+    def span(self, name: str, **args: Any) -> _NullSpan:  # type: ignore[override]
+        return _NULL_SPAN
+
+    def record(self, name: str, start: float, duration: float, **args: Any) -> None:
+        pass
+
+    def annotate_step(self, step: int | None, **args: Any) -> None:
+        pass
+
+
+_tracer: Tracer = NullTracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer (a NullTracer while tracing is off)."""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """
+    Install a global tracer.
+
+    Args:
+        tracer: Tracer to use, or None to turn tracing off.
+    """
+    global _tracer
+    _tracer = tracer if tracer is not None else NullTracer()
+
+
+def enable_tracing() -> Tracer:
+    """Turn tracing on with a fresh Tracer and return it."""
+    tracer = Tracer()
+    set_tracer(tracer)
+    return tracer
+
+
+def traced_sleep(seconds: float, name: str = "sleep", **args: Any) -> None:
+    """``time.sleep`` recorded as a span; non-positive durations are skipped."""
+    if seconds <= 0:
+        return
+    with _tracer.span(name, seconds=seconds, **args):
+        time.sleep(seconds)
+
+
+def _enable_from_env() -> None:
+    path = os.getenv("WINDOWS_TRACE")
+    if not path:
+        return
+    tracer = enable_tracing()
+    atexit.register(tracer.export, path)
+
+
+_enable_from_env()
+
+
+__all__ = [
+    "NullTracer",
+    "Span",
+    "SpanRecord",
+    "Tracer",
+    "call_in_step",
+    "current_step",
+    "enable_tracing",
+    "get_tracer",
+    "set_step",
+    "set_tracer",
+    "traced_sleep",
+]
@@ -0,0 +1,118 @@
+"""Trajectory record-and-replay cache for recurring tasks.
+
+Successful runs are stored keyed by the normalized task text. Each step keeps
+the executed action (with the model's relative 0-999 coordinates) and a
+perceptual hash of the frame the action was chosen on. Replaying a task
+re-executes the cached actions as long as every live frame hashes within a
+tolerance of the recorded one, and hands control back to the model on the
+first divergence.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+def normalize_task(task: str) -> str:
+    """
+    Normalize task text so trivially different phrasings share a cache key.
+
+    Applies NFKC normalization, lowercases, collapses whitespace and strips
+    trailing punctuation.
+
+    Args:
+        task: Natural language task.
+
+    Returns:
+        Normalized task text.
+    """
+    text = unicodedata.normalize("NFKC", task).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip("。.!！?？ ")
+
+
+@dataclass
+class TrajectoryStep:
+    """One recorded step: the action and the hash of its pre-action frame."""
+
+    action: dict[str, Any]
+    frame_hash: int
+    window_title: str = ""
+
+
+@dataclass
+class Trajectory:
+    """A recorded successful run of a task.
+
+    ``replays`` counts the runs that replayed it to the end; a run that
+    diverged and finished through the model records a new trajectory.
+    """
+
+    task: str
+    steps: list[TrajectoryStep] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    replays: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Trajectory":
+        return cls(
+            task=data["task"],
+            steps=[TrajectoryStep(**step) for step in data.get("steps", [])],
+            created_at=data.get("created_at", 0.0),
+            replays=data.get("replays", 0),
+        )
+
+
+class TrajectoryStore:
+    """
+    File-backed trajectory cache, one JSON file per normalized task.
+
+    Args:
+        directory: Directory holding the trajectory files.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, task: str) -> Path:
+        key = hashlib.sha1(normalize_task(task).encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def get(self, task: str) -> Trajectory | None:
+        """Load the trajectory recorded for a task, if any."""
+        path = self._path(task)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return Trajectory.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable trajectory {path}: {e}")
+            return None
+
+    def put(self, trajectory: Trajectory) -> None:
+        """Store a trajectory, replacing any previous one for the task."""
+        path = self._path(trajectory.task)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(trajectory), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def delete(self, task: str) -> None:
+        """Remove the trajectory recorded for a task."""
+        self._path(task).unlink(missing_ok=True)
+
+
+__all__ = [
+    "Trajectory",
+    "TrajectoryStep",
+    "TrajectoryStore",
+    "normalize_task",
+]
@@ -0,0 +1,297 @@
+"""Persistent agent worker process for interactive front ends.
+
+Starting a process per task pays for interpreter start-up, imports and model
+client construction before the first screenshot, and on Windows every
+``multiprocessing`` child is spawned from scratch. ``AgentWorker`` starts one
+child ahead of time, builds the ``WindowsAgent`` and warms the capture and
+input backends there, then runs tasks one after another in that same process.
+``WindowsAgent.run`` resets the agent between tasks, so each task starts from
+a clean context.
+
+Tasks are cancelled cooperatively through ``WindowsAgent.cancel`` (the agent
+stops before its next step); ``restart`` kills the child and starts a fresh
+warm one when a step does not return.
+
+Example:
+    >>> worker = AgentWorker(model_config, AgentConfig(verbose=False))
+    >>> worker.start()
+    >>> task_id = worker.submit("Open Notepad")
+    >>> message = worker.poll(timeout=60)
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from phone_agent.model import ModelConfig
+
+    from Windows.agent import AgentConfig
+
+# Message kinds sent by the worker process.
+READY = "ready"
+STARTED = "started"
+SUCCESS = "success"
+ERROR = "error"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class WorkerMessage:
+    """
+    A message from the worker process.
+
+    Attributes:
+        kind: One of "ready", "started", "success", "error" or "cancelled".
+        task_id: Task the message refers to, or None for "ready".
+        payload: Result message or error text.
+        elapsed: Seconds since the task was submitted ("started"), the task
+            duration ("success"/"error"/"cancelled"), or the warm-up time
+            ("ready").
+    """
+
+    kind: str
+    task_id: int | None = None
+    payload: str | None = None
+    elapsed: float = 0.0
+
+
+def _warm_up() -> None:
+    """Create the process-wide desktop backends before the first task."""
+    from Windows.desktop import get_capture_backend, get_dpi_scale, get_input_backend
+    from Windows.desktop.screenshot import get_screenshot
+
+    get_dpi_scale()
+    get_capture_backend()
+    get_input_backend()
+    try:
+        # Loads the image plugins and encoder on the grab path.
+        get_screenshot()
+    except Exception:
+        pass
+
+
+def _worker_main(
+    model_config: "ModelConfig | None",
+    agent_config: "AgentConfig | None",
+    tasks: Any,
+    messages: Any,
+    cancel: Any,
+) -> None:
+    """Entry point of the worker process."""
+    from Windows.agent import WindowsAgent
+
+    start = time.perf_counter()
+    agent = WindowsAgent(model_config=model_config, agent_config=agent_config)
+    _warm_up()
+    messages.put(WorkerMessage(READY, elapsed=time.perf_counter() - start))
+
+    def watch_cancel() -> None:
+        while True:
+            cancel.wait()
+            cancel.clear()
+            agent.cancel()
+
+    threading.Thread(target=watch_cancel, daemon=True).start()
+
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        task_id, task, submitted = item
+
+        # A cancel requested while the task was queued has nothing to stop.
+        cancel.clear()
+        messages.put(WorkerMessage(STARTED, task_id, task, time.time() - submitted))
+        start = time.perf_counter()
+        try:
+            result = agent.run(task)
+            kind = CANCELLED if agent.cancelled else SUCCESS
+            messages.put(WorkerMessage(kind, task_id, result, time.perf_counter() - start))
+        except Exception as e:
+            messages.put(WorkerMessage(ERROR, task_id, str(e), time.perf_counter() - start))
+
+
+class AgentWorker:
+    """
+    A warm agent process that runs submitted tasks one at a time.
+
+    Args:
+        model_config: Model configuration for the worker's agent.
+        agent_config: Agent configuration for the worker's agent.
+        start_method: multiprocessing start method; the platform default
+            when None.
+    """
+
+    def __init__(
+        self,
+        model_config: "ModelConfig | None" = None,
+        agent_config: "AgentConfig | None" = None,
+        start_method: str | None = None,
+    ):
+        self.model_config = model_config
+        self.agent_config = agent_config
+        self._ctx = multiprocessing.get_context(start_method)
+        self._process: Any = None
+        self._tasks: Any = None
+        self._messages: Any = None
+        self._cancel: Any = None
+        self._next_id = 0
+        self._pending: set[int] = set()
+        self._current: int | None = None
+        self._ready = False
+
+    def start(self) -> None:
+        """Start the worker process; it reports "ready" once warmed up."""
+        if self.alive:
+            return
+        self._tasks = self._ctx.Queue()
+        self._messages = self._ctx.Queue()
+        self._cancel = self._ctx.Event()
+        self._ready = False
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                self.model_config,
+                self.agent_config,
+                self._tasks,
+                self._messages,
+                self._cancel,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is running."""
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the worker has finished warming up."""
+        return self._ready
+
+    @property
+    def busy(self) -> bool:
+        """Whether a submitted task has not finished yet."""
+        return bool(self._pending)
+
+    @property
+    def current_task(self) -> int | None:
+        """Id of the task being executed, if any."""
+        return self._current
+
+    def submit(self, task: str) -> int:
+        """
+        Queue a task for the worker.
+
+        Args:
+            task: Natural language description of the task.
+
+        Returns:
+            The task id used in the worker's messages.
+        """
+        self.start()
+        self._next_id += 1
+        self._pending.add(self._next_id)
+        self._tasks.put((self._next_id, task, time.time()))
+        return self._next_id
+
+    def cancel(self) -> None:
+        """Ask the current task to stop before its next step."""
+        if self._current is not None and self._cancel is not None:
+            self._cancel.set()
+
+    def poll(self, timeout: float = 0.0) -> WorkerMessage | None:
+        """
+        Get the next message from the worker.
+
+        If the worker process died, an "error" message is returned for every
+        unfinished task and the process must be restarted.
+
+        Args:
+            timeout: Seconds to wait; 0 returns immediately.
+
+        Returns:
+            The next WorkerMessage, or None if nothing arrived in time.
+        """
+        if self._messages is None:
+            return None
+        try:
+            if timeout > 0:
+                message = self._messages.get(timeout=timeout)
+            else:
+                message = self._messages.get_nowait()
+        except queue.Empty:
+            if self._pending and not self.alive:
+                task_id = self._current or min(self._pending)
+                self._finish(task_id)
+                code = self._process.exitcode if self._process is not None else None
+                return WorkerMessage(ERROR, task_id, f"worker exited ({code})")
+            return None
+
+        if message.kind == READY:
+            self._ready = True
+        elif message.kind == STARTED:
+            self._current = message.task_id
+        else:
+            self._finish(message.task_id)
+        return message
+
+    def _finish(self, task_id: int | None) -> None:
+        self._pending.discard(task_id)
+        if self._current == task_id:
+            self._current = None
+
+    def restart(self) -> list[int]:
+        """
+        Kill the worker and start a fresh one.
+
+        Returns:
+            Ids of the tasks that were dropped without finishing.
+        """
+        dropped = sorted(self._pending)
+        self._stop_process(graceful=False)
+        self._pending.clear()
+        self._current = None
+        self.start()
+        return dropped
+
+    def _stop_process(self, graceful: bool) -> None:
+        if self._process is None:
+            return
+        if graceful and self._process.is_alive():
+            self._tasks.put(None)
+            self._process.join(timeout=2)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        self._process.close()
+        self._process = None
+        for q in (self._tasks, self._messages):
+            q.cancel_join_thread()
+            q.close()
+        self._ready = False
+
+    def close(self) -> None:
+        """Stop the worker, terminating it if a task is still running."""
+        self._stop_process(graceful=True)
+        self._pending.clear()
+        self._current = None
+
+    def __enter__(self) -> "AgentWorker":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["AgentWorker", "WorkerMessage"]